@@ -0,0 +1,94 @@
+"""
+Deterministic generator of realistic synthetic time-tracking histories.
+"""
+
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, List
+
+from models.time_entry import TimeEntry
+
+DESCRIPTIONS = [
+    "Code review", "Feature work", "Bug fixing", "Standup", "Planning",
+    "Customer call", "Documentation", "Ops on-call", "1:1", "Research",
+    "Release", "Hiring interview", "Support ticket", "Design review",
+]
+ABSENCE_DESCRIPTIONS = ["Vacation", "Doctor", "Sick leave", "Public holiday", ""]
+
+
+def _entry_id(rng: random.Random) -> str:
+    return f"{rng.getrandbits(128):032x}"
+
+
+def generate_history(
+    num_entries: int,
+    seed: int = 0,
+    start: date = date(2015, 1, 5),
+    fragments_per_day: int = 8,
+) -> Iterator[TimeEntry]:
+    """Yield ``num_entries`` entries in chronological order, identical for a given seed.
+
+    Work days are split into ``fragments_per_day`` (on average) short blocks
+    with gaps between them; weekends are mostly skipped. About one day in
+    twelve carries an absence overlapping part of the work, and roughly every
+    ten weeks a multi-day vacation spans whole days.
+    """
+    rng = random.Random(seed)
+    day = start
+    produced = 0
+    vacation_until = None
+
+    while produced < num_entries:
+        weekend = day.weekday() >= 5
+        if weekend and rng.random() > 0.05:
+            day += timedelta(days=1)
+            continue
+
+        if vacation_until is None and not weekend and rng.random() < 0.014:
+            length = rng.randint(2, 10)
+            vacation_until = day + timedelta(days=length)
+            yield TimeEntry(
+                start_time=datetime.combine(day, time()),
+                end_time=datetime.combine(vacation_until, time()),
+                description="Vacation",
+                is_absence=True,
+                id=_entry_id(rng),
+            )
+            produced += 1
+        if vacation_until is not None:
+            if day < vacation_until:
+                day += timedelta(days=1)
+                continue
+            vacation_until = None
+
+        moment = datetime.combine(day, time(7, 30)) + timedelta(minutes=rng.randint(0, 120))
+        fragments = max(1, int(rng.gauss(fragments_per_day, 2)))
+        day_entries: List[TimeEntry] = []
+        for _ in range(fragments):
+            length = timedelta(minutes=rng.choice((10, 15, 25, 30, 45, 60, 90, 120)))
+            day_entries.append(TimeEntry(
+                start_time=moment,
+                end_time=moment + length,
+                description=rng.choice(DESCRIPTIONS),
+                id=_entry_id(rng),
+            ))
+            moment += length + timedelta(minutes=rng.choice((0, 0, 5, 10, 30, 60)))
+
+        if rng.random() < 0.08:
+            # Absence overlapping some of the day's work, e.g. a doctor's visit
+            absence_start = day_entries[rng.randrange(len(day_entries))].start_time
+            day_entries.append(TimeEntry(
+                start_time=absence_start,
+                end_time=absence_start + timedelta(hours=rng.choice((1, 2, 4))),
+                description=rng.choice(ABSENCE_DESCRIPTIONS),
+                is_absence=True,
+                id=_entry_id(rng),
+            ))
+            day_entries.sort(key=lambda entry: entry.start_time)
+
+        for entry in day_entries:
+            if produced >= num_entries:
+                return
+            yield entry
+            produced += 1
+        day += timedelta(days=1)
@@ -0,0 +1,362 @@
+"""
+Run the benchmark suite and compare against stored baseline results.
+
+Usage (from the project root):
+
+    python -m benchmarks.run --sizes 1000,10000
+    python -m benchmarks.run --sizes 1000,10000 --output benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json
+
+Every benchmark is timed (best of ``--repeat`` runs) and, unless
+``--no-memory`` is given, run once more under tracemalloc to record its peak
+allocation. With ``--compare`` the exit status is 1 when any benchmark is
+slower than the baseline by more than ``--tolerance``.
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+if str(SRC) not in sys.path:
+    sys.path.insert(0, str(SRC))
+
+from benchmarks.generator import generate_history  # noqa: E402
+from models.entry_manager import TimeEntryManager  # noqa: E402
+from models.time_entry import TimeEntry  # noqa: E402
+from utils.remote_client import remote_entry_payload  # noqa: E402
+
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_TOLERANCE = 1.5
+# Users saving at the same time in the concurrent save benchmark
+SAVE_CONCURRENCY = 8
+
+
+class BenchContext:
+    """Data shared by all benchmarks of one history size."""
+
+    def __init__(self, size: int, workdir: Path, seed: int = 0):
+        self.size = size
+        self.workdir = workdir
+        self.entries: List[TimeEntry] = list(generate_history(size, seed=seed))
+        self.store_path = workdir / f"timedata-{size}.json"
+        self.manager = TimeEntryManager(self.store_path)
+        self.manager.replace_entries(self.entries)
+        self.first_day = self.entries[0].date
+        self.last_day = self.entries[-1].date
+        self._webapp = None
+        self._webapp_clients = []
+        self._payload = None
+        self._binary_manager = None
+
+    def sample_days(self, count: int, seed: int = 1) -> List[date]:
+        rng = random.Random(seed)
+        span = (self.last_day - self.first_day).days
+        return [self.first_day + timedelta(days=rng.randint(0, span)) for _ in range(count)]
+
+    def binary_manager(self) -> TimeEntryManager:
+        """Manager over the same history stored in the binary format."""
+        if self._binary_manager is None:
+            self._binary_manager = TimeEntryManager(self.store_path.with_suffix(".ttb"))
+            self._binary_manager.replace_entries(self.entries)
+        return self._binary_manager
+
+    def webapp_client(self):
+        """Return a logged-in Flask test client with server persistence on, or None."""
+        if self._webapp is None:
+            self._webapp = _load_webapp_client(self.workdir / f"web-{self.size}.db")
+        return self._webapp
+
+    def webapp_clients(self, count: int):
+        """Return ``count`` test clients logged in as different users, or None."""
+        client = self.webapp_client()
+        if client is None:
+            return None
+        while len(self._webapp_clients) < count:
+            extra = client.application.test_client()
+            extra.post("/api/auth/register", json={"username": f"bench{len(self._webapp_clients)}", "pin": "1234"})
+            self._webapp_clients.append(extra)
+        return self._webapp_clients[:count]
+
+    def payload(self) -> Dict[str, Any]:
+        if self._payload is None:
+            self._payload = {"entries": [remote_entry_payload(e) for e in self.entries]}
+        return self._payload
+
+
+def _load_webapp_client(db_path: Path):
+    spec = importlib.util.spec_from_file_location("timetracker_webapp", ROOT / "webapp" / "app.py")
+    try:
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except ImportError:
+        return None
+
+    module.get_db_path = lambda: db_path
+    # The benchmarks save far more often than the per-user limit allows
+    module.SAVE_RATE_LIMITER = module.RateLimiter(0, module.SAVE_RATE_WINDOW_SECONDS)
+    module.init_db()
+    os.environ["USE_SERVER_DB"] = "1"
+    module.app.config["TESTING"] = True
+    client = module.app.test_client()
+    client.post("/api/auth/register", json={"username": "bench", "pin": "1234"})
+    return client
+
+
+# Each setup function receives the context and returns the operation to time,
+# or None if the benchmark cannot run in this environment.
+Setup = Callable[[BenchContext], Optional[Callable[[], Any]]]
+
+
+def bench_manager_load(ctx: BenchContext):
+    return lambda: TimeEntryManager(ctx.store_path)
+
+
+def bench_manager_load_all(ctx: BenchContext):
+    return lambda: list(TimeEntryManager(ctx.store_path).iter_range(date.min, date.max))
+
+
+def bench_day_lookup_cold(ctx: BenchContext):
+    day = ctx.sample_days(1)[0]
+    return lambda: TimeEntryManager(ctx.store_path).get_entries_for_date(day)
+
+
+def bench_manager_save(ctx: BenchContext):
+    return ctx.manager.save_entries
+
+
+def bench_manager_load_binary(ctx: BenchContext):
+    path = ctx.binary_manager().storage_path
+    return lambda: TimeEntryManager(path)
+
+
+def bench_manager_save_binary(ctx: BenchContext):
+    return ctx.binary_manager().save_entries
+
+
+def bench_total_for_date(ctx: BenchContext):
+    days = ctx.sample_days(200)
+    return lambda: [ctx.manager.get_total_time_for_date(d) for d in days]
+
+
+def _uncached_report(manager: TimeEntryManager, start: date, end: date):
+    manager.clear_report_cache()
+    return manager.generate_report(start, end)
+
+
+def bench_report_month(ctx: BenchContext):
+    end = ctx.last_day
+    return lambda: _uncached_report(ctx.manager, end - timedelta(days=30), end)
+
+
+def bench_report_year(ctx: BenchContext):
+    end = ctx.last_day
+    return lambda: _uncached_report(ctx.manager, end - timedelta(days=364), end)
+
+
+def bench_report_cached(ctx: BenchContext):
+    end = ctx.last_day
+    start = end - timedelta(days=364)
+    ctx.manager.generate_report(start, end)
+    return lambda: ctx.manager.generate_report(start, end)
+
+
+def bench_api_save_entries(ctx: BenchContext):
+    client = ctx.webapp_client()
+    if client is None:
+        return None
+    payload = ctx.payload()
+
+    def run():
+        resp = client.post("/api/save_entries", json=payload)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    return run
+
+
+def bench_api_save_entries_concurrent(ctx: BenchContext):
+    clients = ctx.webapp_clients(SAVE_CONCURRENCY)
+    if clients is None:
+        return None
+    payload = ctx.payload()
+    pool = ThreadPoolExecutor(len(clients))
+
+    def save(client):
+        resp = client.post("/api/save_entries", json=payload)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    return lambda: list(pool.map(save, clients))
+
+
+def bench_api_load_entries(ctx: BenchContext):
+    client = ctx.webapp_client()
+    if client is None:
+        return None
+    resp = client.post("/api/save_entries", json=ctx.payload())
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    def run():
+        resp = client.get("/api/load_entries")
+        assert resp.status_code == 200
+        resp.get_json()
+
+    return run
+
+
+BENCHMARKS: Dict[str, Setup] = {
+    "manager_load": bench_manager_load,
+    "manager_load_all": bench_manager_load_all,
+    "day_lookup_cold": bench_day_lookup_cold,
+    "manager_save": bench_manager_save,
+    "manager_load_binary": bench_manager_load_binary,
+    "manager_save_binary": bench_manager_save_binary,
+    "total_for_date_x200": bench_total_for_date,
+    "generate_report_month": bench_report_month,
+    "generate_report_year": bench_report_year,
+    "generate_report_cached": bench_report_cached,
+    "api_save_entries": bench_api_save_entries,
+    "api_save_entries_x8_concurrent": bench_api_save_entries_concurrent,
+    "api_load_entries": bench_api_load_entries,
+}
+
+
+def measure(operation: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, float]:
+    """Time ``operation`` (best of ``repeat``) and optionally record its peak allocation."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - start)
+    result = {"seconds": round(best, 6)}
+
+    if memory:
+        tracemalloc.start()
+        try:
+            operation()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["peak_kib"] = round(peak / 1024, 1)
+    return result
+
+
+def run_suite(
+    sizes: List[int],
+    names: Optional[List[str]] = None,
+    repeat: Optional[int] = None,
+    memory: bool = True,
+    log: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks for each size and return the results document."""
+    selected = names or list(BENCHMARKS)
+    unknown = [n for n in selected if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    results: Dict[str, Dict[str, float]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            ctx = BenchContext(size, Path(tmp))
+            runs = repeat or (5 if size <= 10_000 else 1)
+            for name in selected:
+                operation = BENCHMARKS[name](ctx)
+                if operation is None:
+                    log(f"{name}@{size}: skipped (dependencies missing)")
+                    continue
+                result = measure(operation, runs, memory)
+                results[f"{name}@{size}"] = result
+                peak = f", peak {result['peak_kib']:.0f} KiB" if "peak_kib" in result else ""
+                log(f"{name}@{size}: {result['seconds'] * 1000:.2f} ms{peak}")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a description of every benchmark slower than ``tolerance`` x its baseline.
+
+    Benchmarks the baseline has no timing for are listed as well, so a
+    stale baseline does not pass silently.
+    """
+    regressions = []
+    base_results = baseline.get("results", {})
+    for key, result in current["results"].items():
+        base = base_results.get(key)
+        if not base or not base.get("seconds"):
+            regressions.append(f"{key}: not in baseline")
+            continue
+        ratio = result["seconds"] / base["seconds"]
+        if ratio > tolerance:
+            regressions.append(
+                f"{key}: {result['seconds'] * 1000:.2f} ms vs baseline "
+                f"{base['seconds'] * 1000:.2f} ms ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Run the TimeTracker benchmark suite.")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Comma-separated history sizes in entries (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--only",
+        help=f"Comma-separated benchmark names ({', '.join(BENCHMARKS)}).",
+    )
+    parser.add_argument("--repeat", type=int, help="Timed runs per benchmark (best is kept).")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc peak measurement.")
+    parser.add_argument("--output", type=Path, help="Write results as JSON (e.g. a new baseline).")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to compare against.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Slowdown factor counted as a regression (default: %(default)s).",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    names = args.only.split(",") if args.only else None
+
+    current = run_suite(sizes, names, args.repeat, memory=not args.no_memory)
+
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        regressions = compare(current, json.loads(args.compare.read_text()), args.tolerance)
+        if regressions:
+            print("Regressions:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.tolerance}x of {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
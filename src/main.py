@@ -1,35 +1,56 @@
 #!/usr/bin/env python3
 """CLI entry point for the TimeTracking data model."""
 
+import time
+
+# Taken before the remaining imports so --timings can report import cost
+_IMPORT_START = time.perf_counter()
+
 import argparse
+import io
+import json
 import os
+import signal
 import sys
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
 from datetime import date, datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from appdirs import user_data_dir
 
-from models.entry_manager import TimeEntryManager
+from models.binary_store import BINARY_SUFFIX
+from models.entry_manager import ARCHIVE_FORMATS, TimeEntryManager
+from models.settings import Settings
 from models.time_entry import TimeEntry
+from utils.daemon import TimerDaemon, daemon_supported, default_socket_path, run_remote, send_request
+from utils.import_utils import DEFAULT_BATCH_SIZE, IMPORT_FORMATS, ImportReport, detect_format, import_entries, iter_raw_rows
+from utils.profiling import PROFILE_MODES, RunProfiler
 from utils.remote_client import RemoteTimeTrackerClient
 from utils.time_utils import format_duration
 
 APP_NAME = "TimeTracker"
 APP_AUTHOR = "dennyschwender"
 DEFAULT_FILENAME = "timedata.json"
+# Suffix per storage format; a --storage path picks its format by suffix
+STORAGE_SUFFIXES = {"json": ".json", "binary": BINARY_SUFFIX}
 
 
-def find_storage_path(custom_path: Optional[Path]) -> Path:
-    """Return the storage file path, honoring an explicit override if provided."""
+def find_storage_path(custom_path: Optional[Path], storage_format: str = "json") -> Path:
+    """Return the storage file path, honoring an explicit override if provided.
+
+    Without an override, ``storage_format`` ("json" or "binary") picks the
+    default file name.
+    """
     if custom_path:
         custom_path.parent.mkdir(parents=True, exist_ok=True)
         return custom_path
 
+    filename = Path(DEFAULT_FILENAME).with_suffix(STORAGE_SUFFIXES[storage_format]).name
     candidates = [
-        Path(user_data_dir(APP_NAME, APP_AUTHOR)) / DEFAULT_FILENAME,
-        Path.home() / ".timetracker" / "timedata.json",
-        Path.home() / ".timetracker" / "data" / "timedata.json",
+        Path(user_data_dir(APP_NAME, APP_AUTHOR)) / filename,
+        Path.home() / ".timetracker" / filename,
+        Path.home() / ".timetracker" / "data" / filename,
     ]
 
     for candidate in candidates:
@@ -59,16 +80,13 @@ def parse_iso_datetime(value: str) -> datetime:
         )
 
 
-def sorted_entries(entries: List[TimeEntry]) -> List[TimeEntry]:
-    return sorted(entries, key=lambda entry: entry.start_time)
-
-
 def format_entry(entry: TimeEntry, index: Optional[int] = None) -> str:
     label = f"[{index}] " if index is not None else ""
     duration = format_duration(entry.duration)
     flags = " [ABSENCE]" if entry.is_absence else ""
     lines = [
         f"{label}{entry.start_time.isoformat()} -> {entry.end_time.isoformat()} ({duration}){flags}"
+        f"  id={entry.id}"
     ]
     if entry.description:
         lines.append(f"    {entry.description}")
@@ -76,7 +94,7 @@ def format_entry(entry: TimeEntry, index: Optional[int] = None) -> str:
 
 
 def print_entries_for_date(manager: TimeEntryManager, target: date) -> None:
-    entries = sorted_entries(manager.get_entries_for_date(target))
+    entries = manager.get_entries_for_date(target)
     print(f"Entries for {target.isoformat()}: {len(entries)}")
     if not entries:
         print("  (none)")
@@ -145,17 +163,23 @@ def command_add(manager: TimeEntryManager, args: argparse.Namespace) -> None:
 
 
 def command_resume(manager: TimeEntryManager, args: argparse.Namespace) -> None:
-    target = args.date or date.today()
-    entries = sorted_entries(manager.get_entries_for_date(target))
-    if not entries:
-        print(f"No entries found for {target.isoformat()}.", file=sys.stderr)
-        sys.exit(1)
+    if args.id:
+        entry = manager.get_entry(args.id)
+        if entry is None:
+            print(f"No entry with id {args.id}.", file=sys.stderr)
+            sys.exit(1)
+    else:
+        target = args.date or date.today()
+        entries = manager.get_entries_for_date(target)
+        if not entries:
+            print(f"No entries found for {target.isoformat()}.", file=sys.stderr)
+            sys.exit(1)
 
-    if args.index < 1 or args.index > len(entries):
-        print("Index out of range.", file=sys.stderr)
-        sys.exit(1)
+        if args.index < 1 or args.index > len(entries):
+            print("Index out of range.", file=sys.stderr)
+            sys.exit(1)
 
-    entry = entries[args.index - 1]
+        entry = entries[args.index - 1]
     if entry.is_absence:
         print("Cannot resume an absence entry.", file=sys.stderr)
         sys.exit(1)
@@ -196,10 +220,7 @@ def command_report(manager: TimeEntryManager, args: argparse.Namespace) -> None:
 
 
 def _all_saved_entries(manager: TimeEntryManager) -> List[TimeEntry]:
-    entries: List[TimeEntry] = []
-    for daily_entries in manager.entries.values():
-        entries.extend(daily_entries)
-    return entries
+    return list(manager.iter_range(date.min, date.max))
 
 
 def command_sync(manager: TimeEntryManager, args: argparse.Namespace) -> None:
@@ -241,6 +262,87 @@ def command_sync(manager: TimeEntryManager, args: argparse.Namespace) -> None:
         client.close()
 
 
+# Progress is printed every this many processed rows
+IMPORT_PROGRESS_EVERY = 10_000
+
+
+def command_import(manager: TimeEntryManager, args: argparse.Namespace) -> None:
+    fmt = args.format or detect_format(args.file)
+    next_progress = [IMPORT_PROGRESS_EVERY]
+
+    def add_batch(batch: List[TimeEntry]) -> None:
+        if not args.dry_run:
+            manager.add_entries(batch, save=False)
+
+    def on_progress(report: ImportReport) -> None:
+        if report.processed >= next_progress[0]:
+            print(f"... {report.processed} rows ({report.rejected} rejected)", file=sys.stderr)
+            while next_progress[0] <= report.processed:
+                next_progress[0] += IMPORT_PROGRESS_EVERY
+
+    rejects = open(args.rejects, "w", encoding="utf-8") if args.rejects else None
+
+    def on_reject(line: int, record, error: str) -> None:
+        if rejects:
+            rejects.write(json.dumps({"line": line, "error": error, "record": record}) + "\n")
+
+    try:
+        with open(args.file, newline="", encoding="utf-8") as f:
+            report = import_entries(
+                iter_raw_rows(f, fmt), add_batch, args.batch_size, on_progress, on_reject
+            )
+    except OSError as exc:
+        print(f"Cannot read {args.file}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if rejects:
+            rejects.close()
+
+    if report.imported and not args.dry_run:
+        manager.save_entries()
+
+    verb = "Validated" if args.dry_run else "Imported"
+    print(f"{verb} {report.imported} entries, rejected {report.rejected}.")
+    for line, error in report.errors:
+        print(f"  line {line}: {error}", file=sys.stderr)
+    if report.rejected > len(report.errors):
+        print(f"  ... and {report.rejected - len(report.errors)} more", file=sys.stderr)
+    if report.rejected and args.strict:
+        sys.exit(1)
+
+
+def command_archive(manager: TimeEntryManager, args: argparse.Namespace) -> None:
+    before = args.before or date.today().year
+    try:
+        years = manager.archive_years(before, args.compression)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if not years:
+        print(f"No unarchived entries before {before}.")
+        return
+    print(f"Archived {', '.join(map(str, years))} to {manager.archive_dir}")
+
+
+def command_convert(manager: TimeEntryManager, args: argparse.Namespace) -> None:
+    target = args.output or manager.storage_path.with_suffix(STORAGE_SUFFIXES[args.to])
+    if target.resolve() == manager.storage_path.resolve():
+        print(f"{target} is the current storage file.", file=sys.stderr)
+        sys.exit(1)
+    if target.exists() and not args.force:
+        print(f"{target} already exists; pass --force to overwrite it.", file=sys.stderr)
+        sys.exit(1)
+    try:
+        written = manager.convert_storage(target)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Wrote {written} entries to {target}")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Manage TimeTracker entries from the command line."
@@ -250,6 +352,31 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         help="Explicit path to the timedata.json file.",
     )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Daemon socket path (defaults to the storage path plus '.sock').",
+    )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Run the command in-process even if a daemon is running.",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print phase and method timings to stderr (runs in-process).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=PROFILE_MODES,
+        help="Also collect a cProfile or tracemalloc profile (runs in-process).",
+    )
+    parser.add_argument(
+        "--profile-output",
+        type=Path,
+        help="Write the profile to this file instead of stderr.",
+    )
 
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -292,6 +419,10 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="1-based index from the list command.",
     )
+    resume.add_argument(
+        "--id",
+        help="ID of the entry to resume (shown by the list command); overrides --date/--index.",
+    )
 
     report = subparsers.add_parser("report", help="Show a tabular report.")
     report.add_argument(
@@ -325,33 +456,265 @@ def build_parser() -> argparse.ArgumentParser:
         help="Remote PIN (can also be set via TIMETRACKER_REMOTE_PIN).",
     )
 
+    cmd_import = subparsers.add_parser(
+        "import", help="Bulk-import entries from a CSV or JSON-lines file."
+    )
+    cmd_import.add_argument("file", help="File to import.")
+    cmd_import.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        help="Input format (default: from the file extension, CSV otherwise).",
+    )
+    cmd_import.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rows validated and added per batch (default: %(default)s).",
+    )
+    cmd_import.add_argument("--rejects", help="Write rejected rows as JSON lines to this file.")
+    cmd_import.add_argument("--dry-run", action="store_true", help="Validate only; store nothing.")
+    cmd_import.add_argument("--strict", action="store_true", help="Exit with status 1 if any row is rejected.")
+
+    archive = subparsers.add_parser(
+        "archive", help="Move completed years into compressed archive files."
+    )
+    archive.add_argument(
+        "--before",
+        type=int,
+        help="Archive all years before this one (default: the current year).",
+    )
+    archive.add_argument(
+        "--compression",
+        choices=sorted(ARCHIVE_FORMATS),
+        default="gz",
+        help="Compression for new archive files (default: %(default)s).",
+    )
+
+    convert = subparsers.add_parser(
+        "convert", help="Copy the store to the JSON or binary format."
+    )
+    convert.add_argument(
+        "--to",
+        choices=sorted(STORAGE_SUFFIXES),
+        required=True,
+        help="Target format.",
+    )
+    convert.add_argument(
+        "--output",
+        type=Path,
+        help="Target file (default: the storage path with the target format's suffix).",
+    )
+    convert.add_argument("--force", action="store_true", help="Overwrite an existing target file.")
+
+    daemon = subparsers.add_parser(
+        "daemon", help="Run or control the resident timer daemon."
+    )
+    daemon.add_argument(
+        "action",
+        nargs="?",
+        choices=["run", "stop", "status"],
+        default="run",
+        help="Serve in the foreground (default), stop, or query the daemon.",
+    )
+
     return parser
 
 
-def main() -> None:
-    parser = build_parser()
-    args = parser.parse_args()
+COMMANDS = {
+    "start": command_start,
+    "stop": command_stop,
+    "status": command_status,
+    "list": command_list,
+    "add": command_add,
+    "resume": command_resume,
+    "report": command_report,
+    "sync": command_sync,
+    "import": command_import,
+    "archive": command_archive,
+    "convert": command_convert,
+}
+
+
+def run_command(manager: TimeEntryManager, argv: List[str]) -> Tuple[int, str, str]:
+    """Run a CLI command line against ``manager`` and capture its output.
+
+    This is what the daemon executes for each client request. Returns
+    ``(exit_code, stdout, stderr)``.
+    """
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        try:
+            # Pick up writes made by --no-daemon runs or other tools
+            manager.reload_if_changed()
+            args = build_parser().parse_args(argv)
+            handler = COMMANDS.get(args.command)
+            if handler is None:
+                print(f"'{args.command}' cannot be run through the daemon.", file=sys.stderr)
+                exit_code = 2
+            else:
+                handler(manager, args)
+        except RuntimeError as exc:
+            # e.g. an unreadable archive
+            print(f"Error: {exc}", file=sys.stderr)
+            exit_code = 1
+        except SystemExit as exc:
+            if isinstance(exc.code, int):
+                exit_code = exc.code
+            elif exc.code is not None:
+                print(exc.code, file=sys.stderr)
+                exit_code = 1
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def _raise_keyboard_interrupt(signum, frame) -> None:
+    raise KeyboardInterrupt
+
+
+def command_daemon(storage_path: Path, args: argparse.Namespace) -> None:
+    if not daemon_supported():
+        print("The daemon requires Unix domain sockets.", file=sys.stderr)
+        sys.exit(1)
+
+    socket_path = args.socket or default_socket_path(storage_path)
+
+    if args.action in ("stop", "status"):
+        action = "shutdown" if args.action == "stop" else "ping"
+        response = send_request(socket_path, {"action": action})
+        if response is None:
+            print(f"No daemon listening on {socket_path}.", file=sys.stderr)
+            sys.exit(1)
+        print(response.get("stdout", ""), end="")
+        return
 
-    storage_path = find_storage_path(getattr(args, "storage", None))
     manager = TimeEntryManager(storage_path)
+    try:
+        server = TimerDaemon(socket_path, lambda argv: run_command(manager, argv))
+    except RuntimeError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if manager.restore_timer():
+        print("Resumed the timer left running by the previous daemon.")
+
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    print(f"Daemon serving {storage_path} on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if manager.suspend_timer():
+            print(f"Timer still running; kept in {manager.timer_path} for the next run.", file=sys.stderr)
+
+
+def _daemon_argv(args: argparse.Namespace, argv: List[str]) -> List[str]:
+    """Make file arguments absolute, since the daemon has its own working directory."""
+    if args.command == "import":
+        paths = {args.file: str(Path(args.file).resolve())}
+        if args.rejects:
+            paths[args.rejects] = str(Path(args.rejects).resolve())
+    elif args.command == "convert" and args.output:
+        output = str(args.output.resolve())
+        resolved = []
+        for arg in argv:
+            if resolved and resolved[-1] == "--output":
+                arg = output
+            elif arg.startswith("--output="):
+                arg = f"--output={output}"
+            resolved.append(arg)
+        return resolved
+    else:
+        return argv
+    return [paths.get(arg, arg) for arg in argv]
+
+
+def _configured_storage_format() -> str:
+    """The ``storage_format`` setting, or "json" (with a warning) if the config file is unreadable."""
+    try:
+        return Settings.read_value("storage_format", "json")
+    except (OSError, ValueError) as exc:
+        print(f"Warning: ignoring unreadable settings ({exc}); using JSON storage.", file=sys.stderr)
+        return "json"
+
+
+def _phase(profiler: Optional[RunProfiler], name: str):
+    return profiler.phase(name) if profiler else nullcontext()
+
 
-    commands = {
-        "start": command_start,
-        "stop": command_stop,
-        "status": command_status,
-        "list": command_list,
-        "add": command_add,
-        "resume": command_resume,
-        "report": command_report,
-        "sync": command_sync,
-    }
-
-    handler = commands.get(args.command)
+def main(argv: Optional[List[str]] = None) -> None:
+    imported_at = time.perf_counter()
+    argv = sys.argv[1:] if argv is None else argv
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    profiler = None
+    if args.timings or args.profile:
+        profiler = RunProfiler(args.profile, args.profile_output)
+        profiler.record_phase("import", imported_at - _IMPORT_START)
+        profiler.instrument(TimeEntryManager, RemoteTimeTrackerClient)
+        profiler.start()
+
+    try:
+        _run(parser, args, argv, profiler)
+    finally:
+        if profiler:
+            profiler.stop()
+            profiler.report(sys.stderr)
+
+
+def _run(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    argv: List[str],
+    profiler: Optional[RunProfiler],
+) -> None:
+    with _phase(profiler, "storage resolution"):
+        custom_path = getattr(args, "storage", None)
+        storage_format = "json" if custom_path else _configured_storage_format()
+        if storage_format not in STORAGE_SUFFIXES:
+            print(f"Unknown storage_format '{storage_format}' in settings; use json or binary.", file=sys.stderr)
+            sys.exit(1)
+        storage_path = find_storage_path(custom_path, storage_format)
+
+    if args.command == "daemon":
+        command_daemon(storage_path, args)
+        return
+
+    # Profiling measures this process, so it never hands off to the daemon
+    if not args.no_daemon and profiler is None:
+        socket_path = args.socket or default_socket_path(storage_path)
+        result = run_remote(socket_path, _daemon_argv(args, argv))
+        if result is not None:
+            exit_code, stdout, stderr = result
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            if exit_code:
+                sys.exit(exit_code)
+            return
+
+    with _phase(profiler, "load"):
+        manager = TimeEntryManager(storage_path)
+        # A timer kept by a stopped daemon (or an earlier in-process run)
+        manager.restore_timer()
+
+    handler = COMMANDS.get(args.command)
     if handler is None:
         parser.print_help()
         sys.exit(1)
 
-    handler(manager, args)
+    try:
+        with _phase(profiler, "command"):
+            handler(manager, args)
+    except RuntimeError as exc:
+        # e.g. an unreadable archive
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        manager.suspend_timer()
+        if profiler:
+            profiler.record_phase("save (in command)", profiler.calls.total("TimeEntryManager.save_entries"))
 
 
 if __name__ == "__main__":
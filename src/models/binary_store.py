@@ -0,0 +1,140 @@
+"""
+Compact binary storage format for time entries.
+
+Layout (little-endian):
+
+* header: magic ``TTBN``, format version (u16), reserved (u16), record
+  count (u32) and string count (u32);
+* one fixed-width record per entry, in storage order: start and end as
+  microseconds since 1970-01-01 (i64 each), a flags byte, and the string
+  table indexes (u32 each) of the description and the ID;
+* the string table: the UTF-8 end offset of every string (u32 each), then
+  the strings' UTF-8 bytes back to back, so any one string can be read
+  without the others. Descriptions repeat a lot and are stored once.
+
+Timestamps are the naive local times the tracker records; timezone-aware
+timestamps are rejected rather than silently converted.
+"""
+
+import struct
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .time_entry import TimeEntry
+
+BINARY_SUFFIX = ".ttb"
+MAGIC = b"TTBN"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHII")
+RECORD = struct.Struct("<qqBII")
+OFFSET = struct.Struct("<I")
+
+FLAG_ABSENCE = 0x01
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def is_binary_path(path: Path) -> bool:
+    """Whether ``path`` selects the binary format (by its suffix)."""
+    return path.suffix == BINARY_SUFFIX
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        raise ValueError(f"Binary storage holds local times only, not {value.isoformat()}")
+    return (value - EPOCH) // ONE_MICROSECOND
+
+
+def encode_entries(entries: Iterable[TimeEntry]) -> bytes:
+    """Serialize entries (kept in the given order) to the binary format."""
+    strings: Dict[str, int] = {}
+    records = []
+
+    def intern(text: str) -> int:
+        index = strings.get(text)
+        if index is None:
+            index = strings[text] = len(strings)
+        return index
+
+    for entry in entries:
+        records.append(RECORD.pack(
+            _to_micros(entry.start_time),
+            _to_micros(entry.end_time),
+            FLAG_ABSENCE if entry.is_absence else 0,
+            intern(entry.description or ""),
+            intern(entry.id),
+        ))
+
+    encoded = [text.encode("utf-8") for text in strings]
+    ends = struct.pack(f"<{len(encoded)}I", *accumulate(map(len, encoded)))
+    parts = [HEADER.pack(MAGIC, VERSION, 0, len(records), len(strings))]
+    parts.extend(records)
+    parts.append(ends)
+    parts.extend(encoded)
+    return b"".join(parts)
+
+
+def records_span(first: int, count: int) -> Tuple[int, int]:
+    """Byte (offset, length) of ``count`` records starting at record ``first``."""
+    return HEADER.size + first * RECORD.size, count * RECORD.size
+
+
+def decode_strings(buffer, offset: int, count: int) -> List[str]:
+    """Read the string table of ``count`` strings starting at ``offset``."""
+    ends = struct.unpack_from(f"<{count}I", buffer, offset)
+    data = memoryview(buffer)[offset + 4 * count:]
+    return [str(data[start:end], "utf-8") for start, end in zip((0, *ends), ends)]
+
+
+def string_at(buffer, offset: int, count: int, index: int) -> str:
+    """Read one string of the table starting at ``offset``."""
+    start = OFFSET.unpack_from(buffer, offset + 4 * (index - 1))[0] if index else 0
+    end = OFFSET.unpack_from(buffer, offset + 4 * index)[0]
+    base = offset + 4 * count
+    return str(buffer[base + start:base + end], "utf-8")
+
+
+def read_header(buffer) -> Tuple[int, int]:
+    """Validate the header and return (record count, string count)."""
+    if len(buffer) < HEADER.size:
+        raise ValueError("Binary store is truncated")
+    magic, version, _, record_count, string_count = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a binary time entry store")
+    if version != VERSION:
+        raise ValueError(f"Unsupported binary store version {version}")
+    return record_count, string_count
+
+
+def decode_records(records, string: Callable[[int], str]) -> List[TimeEntry]:
+    """Build entries from a buffer of packed records, resolving strings with ``string``."""
+    return [
+        TimeEntry(
+            start_time=EPOCH + timedelta(microseconds=start),
+            end_time=EPOCH + timedelta(microseconds=end),
+            description=string(description),
+            is_absence=bool(flags & FLAG_ABSENCE),
+            id=string(entry_id),
+        )
+        for start, end, flags, description, entry_id in RECORD.iter_unpack(records)
+    ]
+
+
+def decode_entries(buffer) -> List[TimeEntry]:
+    """Parse a buffer written by encode_entries."""
+    record_count, string_count = read_header(buffer)
+    strings_offset = records_span(record_count, 0)[0]
+    strings = decode_strings(buffer, strings_offset, string_count)
+    return decode_records(memoryview(buffer)[HEADER.size:strings_offset], strings.__getitem__)
+
+
+def write_entries(path: Path, entries: Iterable[TimeEntry]) -> None:
+    path.write_bytes(encode_entries(entries))
+
+
+def read_entries(path: Path) -> List[TimeEntry]:
+    return decode_entries(path.read_bytes())
@@ -0,0 +1,148 @@
+"""
+Sidecar date index for reading single days of a store without parsing it.
+
+Next to ``timedata.json`` (or ``.ttb``) the manager writes
+``timedata.json.idx``:
+
+* header: magic ``TTIX``, format version (u16), reserved (u16), day count
+  (u32), the store's size and mtime in nanoseconds when the index was
+  written (u64 each), and the longest entry duration in microseconds (i64);
+* one record per stored day in date order: the date's proleptic ordinal
+  (i32) and the byte offset (u64) and length (u32) of that day's entries in
+  the store. For JSON stores that is the day's array; for binary stores,
+  the day's fixed-width records.
+
+The store and the index are memory-mapped; a lookup is a binary search over
+the mapped day records, and only the matching slices are decoded. An index
+whose recorded size or mtime no longer matches the store is ignored.
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from datetime import date, timedelta
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from . import binary_store
+from .time_entry import TimeEntry
+
+INDEX_SUFFIX = ".idx"
+MAGIC = b"TTIX"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIQQq")
+DAY = struct.Struct("<iQI")
+
+# (date, byte offset, byte length) of one day in the store
+DaySpan = Tuple[date, int, int]
+
+
+def index_path(storage_path: Path) -> Path:
+    return storage_path.with_name(storage_path.name + INDEX_SUFFIX)
+
+
+def write_index(storage_path: Path, days: Sequence[DaySpan], max_span: timedelta) -> None:
+    """Write the index for a store that has just been written."""
+    stat = storage_path.stat()
+    parts = [HEADER.pack(
+        MAGIC, VERSION, 0, len(days), stat.st_size, stat.st_mtime_ns, max_span // timedelta(microseconds=1)
+    )]
+    parts.extend(DAY.pack(day.toordinal(), offset, length) for day, offset, length in days)
+    path = index_path(storage_path)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(b"".join(parts))
+    os.replace(tmp, path)
+
+
+def _map(path: Path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class _Ordinals:
+    """Date ordinals of the mapped day records, as a sequence for bisect."""
+
+    def __init__(self, buffer, count: int):
+        self._buffer = buffer
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> int:
+        return DAY.unpack_from(self._buffer, HEADER.size + position * DAY.size)[0]
+
+
+class DateIndex:
+    """Read-only, day-by-day view of a store through its sidecar index."""
+
+    def __init__(self, storage_path: Path, store: mmap.mmap, index: mmap.mmap):
+        self.storage_path = storage_path
+        self._store = store
+        self._index = index
+        _, _, _, self.day_count, _, _, max_span = HEADER.unpack_from(index, 0)
+        self.max_span = timedelta(microseconds=max_span)
+        self._ordinals = _Ordinals(index, self.day_count)
+        self._binary = binary_store.is_binary_path(storage_path)
+        if self._binary:
+            record_count, self._string_count = binary_store.read_header(store)
+            self._strings_offset = binary_store.records_span(record_count, 0)[0]
+
+    @classmethod
+    def open(cls, storage_path: Path) -> Optional["DateIndex"]:
+        """Map ``storage_path`` and its index, or return None if the index is missing or stale."""
+        path = index_path(storage_path)
+        try:
+            stat = storage_path.stat()
+            if not stat.st_size or not path.exists():
+                return None
+            index = _map(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, version, _, count, size, mtime_ns, _ = HEADER.unpack_from(index, 0)
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or len(index) != HEADER.size + count * DAY.size
+                or (size, mtime_ns) != (stat.st_size, stat.st_mtime_ns)
+            ):
+                raise ValueError("stale index")
+            store = _map(storage_path)
+        except (OSError, ValueError, struct.error):
+            index.close()
+            return None
+        try:
+            return cls(storage_path, store, index)
+        except ValueError:
+            # e.g. a binary store with an unreadable header
+            store.close()
+            index.close()
+            return None
+
+    def close(self) -> None:
+        self._store.close()
+        self._index.close()
+
+    def positions(self, start_date: date, end_date: date) -> range:
+        """Positions of the indexed days from start_date to end_date (inclusive)."""
+        lo = bisect.bisect_left(self._ordinals, start_date.toordinal())
+        hi = bisect.bisect_right(self._ordinals, end_date.toordinal())
+        return range(lo, hi)
+
+    def entries_at(self, position: int) -> List[TimeEntry]:
+        """Decode the entries of the day at ``position``."""
+        _, offset, length = DAY.unpack_from(self._index, HEADER.size + position * DAY.size)
+        if self._binary:
+            records = memoryview(self._store)[offset:offset + length]
+            try:
+                return binary_store.decode_records(records, self._string)
+            finally:
+                records.release()
+        return [TimeEntry.from_dict(data) for data in json.loads(self._store[offset:offset + length])]
+
+    def _string(self, index: int) -> str:
+        return binary_store.string_at(self._store, self._strings_offset, self._string_count, index)
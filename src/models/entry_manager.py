@@ -2,20 +2,172 @@
 Manager for time entries storage and retrieval.
 """
 
+import bisect
+import gzip
+from collections import OrderedDict
 import json
+import lzma
+import os
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
-from .time_entry import TimeEntry
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from . import binary_store
+from .date_index import DateIndex, write_index
+from .interval_index import IntervalIndex
+from .time_entry import TimeEntry, derived_entry_id
+
+# Completed years can be moved out of the main file into compressed,
+# read-only year files that are only read when a query reaches them
+ARCHIVE_FORMATS = {"gz": gzip, "xz": lzma}
+ARCHIVE_MANIFEST = "manifest.json"
+
+# generate_report results kept per manager, least recently used evicted first
+REPORT_CACHE_SIZE = 32
+
+
+def _start_key(entry: TimeEntry) -> datetime:
+    return entry.start_time
+
+
+def _day_start(date_: date) -> datetime:
+    return datetime.combine(date_, datetime.min.time())
+
+
+def _overlap(start1: datetime, end1: datetime, start2: datetime, end2: datetime) -> timedelta:
+    overlap_start = max(start1, start2)
+    overlap_end = min(end1, end2)
+    if overlap_start < overlap_end:
+        return overlap_end - overlap_start
+    return timedelta()
 
 
 class TimeEntryManager:
+    # Wrapped with timing hooks only while CLI profiling is enabled
+    TIMED_METHODS = (
+        "_load_entries",
+        "save_entries",
+        "replace_entries",
+        "add_entries",
+        "archive_years",
+        "convert_storage",
+        "_load_archive",
+        "entries_between",
+        "get_total_time_for_date",
+        "generate_report",
+        "_build_report",
+    )
+
     def __init__(self, storage_path: Path):
         self.storage_path = storage_path
+        # Each day's list is kept sorted by start time
         self.entries: Dict[date, List[TimeEntry]] = {}
+        # Sorted keys of self.entries
+        self._dates: List[date] = []
         self.current_entry: Optional[TimeEntry] = None
+        # Whether current_entry was taken out of the store by resume_entry
+        self._timer_resumed = False
         self.last_deleted: Optional[TimeEntry] = None
+        # entry ID -> (date, position in self.entries[date])
+        self._index: Dict[str, Tuple[date, int]] = {}
+        # Start/end index for window queries, including entries spanning days
+        self._intervals = IntervalIndex()
+        # Archived year -> {"file", "entries", "last_end"}, from the manifest
+        self._archives: Dict[int, Dict] = {}
+        # Archived years not loaded yet, and loaded ones changed since the last save
+        self._cold_years: Set[int] = set()
+        self._dirty_years: Set[int] = set()
+        # While the store is read through its date index, days are decoded on
+        # first use; positions of the days already loaded
+        self._lazy: Optional[DateIndex] = None
+        self._lazy_loaded: Set[int] = set()
+        # (start, end) -> (generation when built, report); see generate_report
+        self._report_cache: "OrderedDict[Tuple[date, date], Tuple[int, tuple]]" = OrderedDict()
+        # Bumped on every change; each date remembers the generation it last changed in
+        self._generation = 0
+        self._date_generations: Dict[date, int] = {}
+        self.report_cache_hits = 0
+        self.report_cache_misses = 0
+        # (mtime_ns, size) of the store as last loaded or saved here
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._read_manifest()
+        self._load_entries()
+
+    @property
+    def archive_dir(self) -> Path:
+        """Directory holding the compressed year files, next to the storage file."""
+        return self.storage_path.with_name(self.storage_path.stem + ".archive")
+
+    @property
+    def timer_path(self) -> Path:
+        """File holding a running timer while no process keeps it in memory."""
+        return self.storage_path.with_name(self.storage_path.name + ".timer")
+
+    def _store_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.storage_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload_if_changed(self) -> bool:
+        """Reload the store if another process rewrote it since it was loaded or saved here.
+
+        The running timer and the undo entry are kept. A resumed entry is
+        taken out of the reloaded data again, as resume_entry did; only its
+        day is decoded for that.
+        """
+        if self._store_stamp() == self._stamp:
+            return False
+        if self._lazy is not None:
+            self._lazy.close()
+            self._lazy = None
+            self._lazy_loaded = set()
+        self.entries = {}
+        self._dates = []
+        self._index = {}
+        self._intervals.clear()
+        self._archives = {}
+        self._cold_years = set()
+        self._dirty_years = set()
+        self._report_cache.clear()
+        self._read_manifest()
         self._load_entries()
+        if self.current_entry is not None and self._timer_resumed:
+            self._remove_resumed(self.current_entry)
+        return True
+
+    def suspend_timer(self) -> bool:
+        """Write the running timer to timer_path, for restore_timer in a later process."""
+        if self.current_entry is None:
+            return False
+        tmp = self.timer_path.with_name(self.timer_path.name + ".tmp")
+        tmp.write_text(json.dumps({**self.current_entry.to_dict(), "resumed": self._timer_resumed}))
+        os.replace(tmp, self.timer_path)
+        return True
+
+    def restore_timer(self) -> bool:
+        """Take over the timer left by suspend_timer, if there is one."""
+        if self.current_entry is not None:
+            return False
+        try:
+            data = json.loads(self.timer_path.read_text())
+        except FileNotFoundError:
+            return False
+        entry = TimeEntry.from_dict(data)
+        # A resumed entry is still in the store until its timer stops; a new
+        # timer was never saved, so the store is not searched for it
+        self._timer_resumed = bool(data.get("resumed"))
+        if self._timer_resumed:
+            self._remove_resumed(entry)
+        self.current_entry = entry
+        self.timer_path.unlink()
+        return True
+
+    def _remove_resumed(self, entry: TimeEntry) -> None:
+        """Remove the stored copy of a resumed entry, decoding only its day."""
+        self._hydrate_dates(entry.date, entry.date)
+        if entry.id in self._index:
+            self._remove_entry(entry.id)
     
     def start_timer(self, description: str = "") -> None:
         """Start a new time entry."""
@@ -26,6 +178,7 @@ class TimeEntryManager:
             end_time=datetime.now(),  # Will be updated when stopped
             description=description
         )
+        self._timer_resumed = False
     
     def stop_timer(self) -> None:
         """Stop the current time entry and save it."""
@@ -34,6 +187,7 @@ class TimeEntryManager:
         self.current_entry.end_time = datetime.now()
         self._add_entry(self.current_entry)
         self.current_entry = None
+        self._timer_resumed = False
         self.save_entries()
 
     def resume_entry(self, entry: TimeEntry) -> None:
@@ -45,12 +199,8 @@ class TimeEntryManager:
         if self.current_entry is not None:
             raise RuntimeError("Timer already running")
 
-        entry_date = entry.date
         # Remove from existing storage so stop_timer re-adds the updated entry
-        if entry_date in self.entries and entry in self.entries[entry_date]:
-            self.entries[entry_date].remove(entry)
-            if not self.entries[entry_date]:
-                del self.entries[entry_date]
+        self._timer_resumed = self._remove_entry(entry.id) is not None
 
         self.current_entry = entry
 
@@ -59,64 +209,110 @@ class TimeEntryManager:
         """Add a manually created entry."""
         self._add_entry(entry)
         self.save_entries()
+
+    def add_entries(self, entries: Iterable[TimeEntry], save: bool = True) -> None:
+        """Add many entries at once, writing the file once (or not at all if ``save`` is False)."""
+        for entry in entries:
+            self._add_entry(entry)
+        if save:
+            self.save_entries()
     
+    def get_entry(self, entry_id: str) -> Optional[TimeEntry]:
+        """Get a stored entry by its ID."""
+        location = self._index.get(entry_id)
+        if location is None and self._lazy is not None:
+            self._load_all()
+            location = self._index.get(entry_id)
+        if location is None and self._cold_years:
+            # Unknown IDs may belong to an archived year
+            for year in sorted(self._cold_years):
+                self._load_archive(year)
+            location = self._index.get(entry_id)
+        if location is None:
+            return None
+        entry_date, position = location
+        return self.entries[entry_date][position]
+
     def get_entries_for_date(self, date_: date) -> List[TimeEntry]:
-        """Get all entries for a specific date."""
+        """Get all entries for a specific date, ordered by start time."""
+        self._hydrate_dates(date_, date_)
         return self.entries.get(date_, [])
+
+    def iter_range(self, start_date: date, end_date: date) -> Iterator[TimeEntry]:
+        """Yield entries dated from start_date to end_date (inclusive) in chronological order.
+
+        The manager must not be modified while the iterator is consumed.
+        """
+        self._hydrate_dates(start_date, end_date)
+        lo = bisect.bisect_left(self._dates, start_date)
+        hi = bisect.bisect_right(self._dates, end_date)
+        for i in range(lo, hi):
+            yield from self.entries[self._dates[i]]
     
-    def get_total_time_for_date(self, date_: date) -> timedelta:
-        """Calculate total time worked for a date (excluding absences)."""
-        entries = self.get_entries_for_date(date_)
-        
-        # Separate work entries and absences
-        work_entries = [e for e in entries if not e.is_absence]
+    def entries_between(self, start: datetime, end: datetime) -> List[TimeEntry]:
+        """Get all entries overlapping the window [start, end), ordered by start time.
+
+        Unlike get_entries_for_date this also finds entries that started
+        before the window, e.g. on the previous day.
+        """
+        if self._lazy is not None:
+            self._hydrate_days((start - self._lazy.max_span).date(), end.date())
+        if self._cold_years:
+            for year in sorted(self._cold_years):
+                meta = self._archives[year]
+                if datetime(year, 1, 1) < end and datetime.fromisoformat(meta["last_end"]) > start:
+                    self._load_archive(year)
+        return self._intervals.overlapping(start, end)
+
+    def get_total_time_between(self, start: datetime, end: datetime) -> timedelta:
+        """Calculate time worked within [start, end), excluding overlapping absences.
+
+        Entries reaching outside the window only count the part inside it.
+        """
+        entries = self.entries_between(start, end)
         absence_entries = [e for e in entries if e.is_absence]
-        
-        # Calculate total work time
+
         total = timedelta()
-        for work_entry in work_entries:
-            work_duration = work_entry.duration
-            
+        for work_entry in entries:
+            if work_entry.is_absence:
+                continue
+            work_start = max(work_entry.start_time, start)
+            work_end = min(work_entry.end_time, end)
+            work_duration = work_end - work_start
+
             # Subtract any overlapping absence time
             for absence in absence_entries:
-                overlap = self._calculate_overlap(work_entry, absence)
-                work_duration -= overlap
-            
+                work_duration -= _overlap(work_start, work_end, absence.start_time, absence.end_time)
+
             total += work_duration
-        
+
         return total
+
+    def get_total_time_for_date(self, date_: date) -> timedelta:
+        """Calculate total time worked on a date (excluding absences).
+
+        Entries spanning midnight contribute only their share of this day.
+        """
+        day_start = _day_start(date_)
+        return self.get_total_time_between(day_start, day_start + timedelta(days=1))
     
     def _calculate_overlap(self, entry1: TimeEntry, entry2: TimeEntry) -> timedelta:
         """Calculate the time overlap between two entries."""
-        # Find the overlap period
-        overlap_start = max(entry1.start_time, entry2.start_time)
-        overlap_end = min(entry1.end_time, entry2.end_time)
-        
-        # If there's an overlap, return the duration
-        if overlap_start < overlap_end:
-            return overlap_end - overlap_start
-        
-        return timedelta()
+        return _overlap(entry1.start_time, entry1.end_time, entry2.start_time, entry2.end_time)
     
     def update_entry(self, old_entry: TimeEntry, new_entry: TimeEntry) -> None:
-        """Update an existing entry with new data."""
-        old_date = old_entry.date
-        new_date = new_entry.date
-        
-        # Remove from old date if dates differ
-        if old_date != new_date:
-            if old_date in self.entries:
-                self.entries[old_date].remove(old_entry)
-                if not self.entries[old_date]:
-                    del self.entries[old_date]
-            self._add_entry(new_entry)
-        else:
-            # Update in place if same date
-            entries = self.entries.get(old_date, [])
-            if old_entry in entries:
-                idx = entries.index(old_entry)
-                entries[idx] = new_entry
-        
+        """Update an existing entry with new data.
+
+        The entry is looked up by ID and the new entry takes over that ID.
+        """
+        if self.get_entry(old_entry.id) is None:
+            return
+        new_entry.id = old_entry.id
+
+        # Re-inserting keeps the day's start-time order and the date index intact
+        self._remove_entry(old_entry.id)
+        self._add_entry(new_entry)
+
         self.save_entries()
     
     def delete_entry(self, entry: TimeEntry) -> Optional[TimeEntry]:
@@ -124,19 +320,13 @@ class TimeEntryManager:
 
         Returns the deleted entry on success or None if not found.
         """
-        entry_date = entry.date
-        if entry_date in self.entries:
-            try:
-                self.entries[entry_date].remove(entry)
-                if not self.entries[entry_date]:
-                    del self.entries[entry_date]
-                # store last deleted for undo
-                self.last_deleted = entry
-                self.save_entries()
-                return entry
-            except ValueError:
-                return None  # Entry not found
-        return None
+        deleted = self._remove_entry(entry.id)
+        if deleted is None:
+            return None  # Entry not found
+        # store last deleted for undo
+        self.last_deleted = deleted
+        self.save_entries()
+        return deleted
 
     def undo_delete(self) -> bool:
         """Restore the last deleted entry if available."""
@@ -159,15 +349,9 @@ class TimeEntryManager:
         """
         # Find Monday of the week
         days_since_monday = (week_date.weekday() + 7) % 7
-        monday = week_date - timedelta(days=days_since_monday)
-        
-        # Calculate total for each day of the week
-        total = timedelta()
-        for i in range(7):  # Monday to Sunday
-            day = monday + timedelta(days=i)
-            total += self.get_total_time_for_date(day)
+        monday = _day_start(week_date - timedelta(days=days_since_monday))
         
-        return total
+        return self.get_total_time_between(monday, monday + timedelta(days=7))
 
     def generate_report(self, start_date: date, end_date: date):
         """Generate a report data structure for a date range.
@@ -177,37 +361,95 @@ class TimeEntryManager:
           - descriptions is a list of distinct descriptions (work entries + absences)
           - matrix is a dict mapping description -> list of floats (hours per day)
             Absences are shown as negative values
+
+        Reports are cached per range and reused until an entry touching one
+        of its days changes.
         """
         # Normalize dates
         if end_date < start_date:
             start_date, end_date = end_date, start_date
 
+        key = (start_date, end_date)
+        cached = self._report_cache.get(key)
+        if cached is not None and self._unchanged_since(cached[0], start_date, end_date):
+            self._report_cache.move_to_end(key)
+            self.report_cache_hits += 1
+            report = cached[1]
+        else:
+            self.report_cache_misses += 1
+            report = self._build_report(start_date, end_date)
+            self._report_cache[key] = (self._generation, report)
+            self._report_cache.move_to_end(key)
+            if len(self._report_cache) > REPORT_CACHE_SIZE:
+                self._report_cache.popitem(last=False)
+        # Callers get their own lists, so they cannot alter the cached report
+        dates, descriptions, matrix = report
+        return list(dates), list(descriptions), {desc: list(row) for desc, row in matrix.items()}
+
+    def clear_report_cache(self) -> None:
+        """Forget all cached reports; the next generate_report call rebuilds."""
+        self._report_cache.clear()
+
+    def report_cache_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.report_cache_hits,
+            "misses": self.report_cache_misses,
+            "cached": len(self._report_cache),
+        }
+
+    def _unchanged_since(self, generation: int, start_date: date, end_date: date) -> bool:
+        """Whether no entry touching start_date..end_date changed after ``generation``."""
+        if generation == self._generation:
+            return True
+        day = start_date
+        while day <= end_date:
+            if self._date_generations.get(day, 0) > generation:
+                return False
+            day += timedelta(days=1)
+        return True
+
+    def _mark_changed(self, entry: TimeEntry) -> None:
+        """Record a change on every day ``entry`` covers, for report cache validation."""
+        if not self._report_cache:
+            # Nothing cached can be affected, and later reports start from here
+            return
+        self._generation += 1
+        day = entry.date
+        last_day = max(day, (entry.end_time - timedelta(microseconds=1)).date())
+        while day <= last_day:
+            self._date_generations[day] = self._generation
+            day += timedelta(days=1)
+
+    def _build_report(self, start_date: date, end_date: date):
+
         num_days = (end_date - start_date).days + 1
         dates = [start_date + timedelta(days=i) for i in range(num_days)]
 
-        # Collect entries in range
+        range_start = _day_start(start_date)
+        range_end = _day_start(end_date) + timedelta(days=1)
+
+        # Collect entries overlapping the range, attributing each day its share
         # Map (date, description, is_absence) -> seconds
         buckets = {}
-        for d in dates:
-            for e in self.get_entries_for_date(d):
-                # use description or label based on entry type
-                trimmed = e.description.strip() if e.description else ""
-                if e.is_absence:
-                    if trimmed:
-                        desc = f"🏖 Absence: {trimmed}"
-                    else:
-                        desc = "🏖 Absence"
+        for e in self.entries_between(range_start, range_end):
+            # use description or label based on entry type
+            trimmed = e.description.strip() if e.description else ""
+            if e.is_absence:
+                if trimmed:
+                    desc = f"🏖 Absence: {trimmed}"
                 else:
-                    desc = trimmed
-                
-                seconds = 0
-                try:
-                    seconds = int(e.duration.total_seconds())
-                except Exception:
-                    seconds = 0
-                
+                    desc = "🏖 Absence"
+            else:
+                desc = trimmed
+            
+            d = max(e.date, start_date)
+            last_day = min((e.end_time - timedelta(microseconds=1)).date(), end_date)
+            while d <= last_day:
+                day_start = _day_start(d)
+                share = _overlap(e.start_time, e.end_time, day_start, day_start + timedelta(days=1))
                 key = (d, desc, e.is_absence)
-                buckets[key] = buckets.get(key, 0) + seconds
+                buckets[key] = buckets.get(key, 0) + int(share.total_seconds())
+                d += timedelta(days=1)
 
         # Gather unique descriptions (preserving absence flag)
         desc_keys = sorted({(desc, is_abs) for (_, desc, is_abs) in buckets.keys()})
@@ -230,43 +472,306 @@ class TimeEntryManager:
         return dates, descriptions, matrix
     
     def _add_entry(self, entry: TimeEntry) -> None:
-        """Add an entry to the entries dictionary."""
+        """Add an entry to the entries dictionary and the ID index."""
+        if self._lazy is not None:
+            self._load_all()
+        self._touch_year(entry.date.year)
+        self._insert_entry(entry)
+        self._mark_changed(entry)
+
+    def _insert_entry(self, entry: TimeEntry) -> None:
+        while entry.id in self._index:
+            # IDs must stay unique; duplicates (e.g. identical legacy entries)
+            # get one derived from theirs, which is the same on every load
+            entry.id = derived_entry_id(entry.id)
         entry_date = entry.date
-        if entry_date not in self.entries:
-            self.entries[entry_date] = []
-        self.entries[entry_date].append(entry)
+        day = self.entries.get(entry_date)
+        if day is None:
+            day = self.entries[entry_date] = []
+            bisect.insort(self._dates, entry_date)
+        position = bisect.bisect_right(day, entry.start_time, key=_start_key)
+        day.insert(position, entry)
+        self._reindex_day(entry_date, position)
+        self._intervals.add(entry)
+
+    def _remove_entry(self, entry_id: str) -> Optional[TimeEntry]:
+        """Remove an entry by ID and return it, or None if it is not stored."""
+        # get_entry decodes the rest of a lazy store, then archived years,
+        # only if the ID is not among the days already loaded
+        if self.get_entry(entry_id) is None:
+            return None
+        entry_date, position = self._index.pop(entry_id)
+        self._touch_year(entry_date.year)
+        day = self.entries[entry_date]
+        entry = day.pop(position)
+        self._intervals.remove(entry_id)
+        self._mark_changed(entry)
+        if day:
+            self._reindex_day(entry_date, position)
+        else:
+            del self.entries[entry_date]
+            del self._dates[bisect.bisect_left(self._dates, entry_date)]
+        return entry
+
+    def _reindex_day(self, entry_date: date, start: int = 0) -> None:
+        """Refresh index positions of a day's entries from ``start`` onwards."""
+        day = self.entries[entry_date]
+        for position in range(start, len(day)):
+            self._index[day[position].id] = (entry_date, position)
     
     def save_entries(self) -> None:
-        """Save entries to storage file."""
+        """Save entries to storage file.
+
+        Archived years are left out; those changed since they were loaded
+        are rewritten to their archive files. The archives and manifest are
+        written first: if the main store is not rewritten after them, its
+        copies of archived years are ignored on load, so no year is lost.
+        """
+        self._load_all()
+        if self._dirty_years:
+            for year in sorted(self._dirty_years):
+                self._write_archive(year)
+            self._dirty_years.clear()
+            self._write_manifest()
+        self._write_store(self.storage_path)
+        self._stamp = self._store_stamp()
+
+    def _write_store(self, path: Path) -> None:
+        """Write the non-archived entries to ``path``, as binary if its suffix selects that.
+
+        The file is replaced atomically (a reader that has it mapped keeps the
+        old contents) and its date index is rewritten next to it.
+        """
+        dates = [date_ for date_ in self._dates if date_.year not in self._archives]
+        max_span = max(
+            (entry.end_time - entry.start_time for date_ in dates for entry in self.entries[date_]),
+            default=timedelta(),
+        )
+        days = []
+        if binary_store.is_binary_path(path):
+            data = binary_store.encode_entries(entry for date_ in dates for entry in self.entries[date_])
+            first = 0
+            for date_ in dates:
+                count = len(self.entries[date_])
+                days.append((date_, *binary_store.records_span(first, count)))
+                first += count
+        else:
+            # Same text as json.dumps(data, indent=2), built day by day to
+            # record where each day's array starts (the text is ASCII)
+            parts = []
+            offset = len("{\n")
+            for date_ in dates:
+                key = f'  "{date_.isoformat()}": '
+                array = json.dumps([entry.to_dict() for entry in self.entries[date_]], indent=2).replace("\n", "\n  ")
+                days.append((date_, offset + len(key), len(array)))
+                parts.append(key + array)
+                offset += len(key) + len(array) + len(",\n")
+            data = ("{\n" + ",\n".join(parts) + "\n}" if parts else "{}").encode("ascii")
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        write_index(path, days, max_span)
+
+    def convert_storage(self, target: Path) -> int:
+        """Write the stored entries to ``target`` in the format its suffix selects.
+
+        Archived years are not copied; they stay in archive_dir. Returns the
+        number of entries written.
+        """
+        self._load_all()
+        self._write_store(target)
+        return sum(len(self.entries[date_]) for date_ in self._dates if date_.year not in self._archives)
+
+    def archive_years(self, before_year: int, fmt: str = "gz") -> List[int]:
+        """Move every year before ``before_year`` into a compressed archive file.
+
+        Only completed years can be archived. The archived years are dropped
+        from memory and read back only when a query reaches them. Returns the
+        newly archived years.
+        """
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{fmt}'; choose from {', '.join(ARCHIVE_FORMATS)}")
+        if before_year > date.today().year:
+            raise ValueError("Only completed years can be archived")
+        self._load_all()
+        years = sorted({d.year for d in self._dates if d.year < before_year and d.year not in self._archives})
+        for year in years:
+            self._archives[year] = {"file": f"{year}.json.{fmt}"}
+            self._dirty_years.add(year)
+        self.save_entries()
+        self._evict_archived()
+        return years
+
+    def _touch_year(self, year: int) -> None:
+        """Load an archived year before it is changed and mark it for rewriting."""
+        if year in self._archives:
+            self._load_archive(year)
+            self._dirty_years.add(year)
+
+    def _year_dates(self, year: int) -> Tuple[int, int]:
+        """Slice of self._dates falling in ``year``."""
+        lo = bisect.bisect_left(self._dates, date(year, 1, 1))
+        hi = bisect.bisect_right(self._dates, date(year, 12, 31))
+        return lo, hi
+
+    def _hydrate_dates(self, start_date: date, end_date: date) -> None:
+        if self._lazy is not None:
+            self._hydrate_days(start_date, end_date)
+        if self._cold_years:
+            for year in sorted(self._cold_years):
+                if start_date.year <= year <= end_date.year:
+                    self._load_archive(year)
+
+    def _hydrate_days(self, start_date: date, end_date: date) -> None:
+        """Decode the indexed days from start_date to end_date that are not loaded yet."""
+        for position in self._lazy.positions(start_date, end_date):
+            if position not in self._lazy_loaded:
+                self._lazy_loaded.add(position)
+                for entry in self._lazy.entries_at(position):
+                    if entry.date.year not in self._archives:
+                        self._insert_entry(entry)
+
+    def _load_all(self) -> None:
+        """Decode every remaining indexed day and stop reading through the index."""
+        if self._lazy is None:
+            return
+        lazy, self._lazy = self._lazy, None
+        for position in range(lazy.day_count):
+            if position not in self._lazy_loaded:
+                for entry in lazy.entries_at(position):
+                    if entry.date.year not in self._archives:
+                        self._insert_entry(entry)
+        lazy.close()
+        self._lazy_loaded = set()
+
+    def _read_manifest(self) -> None:
+        path = self.archive_dir / ARCHIVE_MANIFEST
+        if not path.exists():
+            return
+        try:
+            manifest = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            print(f"Error loading archive manifest: {e}")
+            return
+        self._archives = {int(year): meta for year, meta in manifest.items()}
+        self._cold_years = set(self._archives)
+
+    def _write_manifest(self) -> None:
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {str(year): self._archives[year] for year in sorted(self._archives)}
+        path = self.archive_dir / ARCHIVE_MANIFEST
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=2))
+        os.replace(tmp, path)
+
+    def _load_archive(self, year: int) -> None:
+        """Read one archived year into memory, if it is not loaded yet.
+
+        Raises RuntimeError if the archive cannot be read. The year then stays
+        cold, so nothing is saved over the archive file.
+        """
+        if year not in self._cold_years:
+            return
+        path = self.archive_dir / self._archives[year]["file"]
+        opener = ARCHIVE_FORMATS[path.suffix.lstrip(".")]
+        try:
+            with opener.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, EOFError, ValueError, lzma.LZMAError) as e:
+            raise RuntimeError(f"Cannot read archive {path}: {e}") from e
+        self._cold_years.discard(year)
+        for entries_data in data.values():
+            for entry_data in entries_data:
+                self._insert_entry(TimeEntry.from_dict(entry_data))
+
+    def _write_archive(self, year: int) -> None:
+        """Rewrite (or remove, if now empty) one archived year's file."""
+        meta = self._archives[year]
+        path = self.archive_dir / meta["file"]
+        lo, hi = self._year_dates(year)
+        if lo == hi:
+            path.unlink(missing_ok=True)
+            del self._archives[year]
+            return
         data = {}
-        for date_, entries in self.entries.items():
-            data[date_.isoformat()] = [
-                entry.to_dict() for entry in entries
-            ]
-        self.storage_path.write_text(json.dumps(data, indent=2))
+        last_end = datetime.min
+        for date_ in self._dates[lo:hi]:
+            entries = self.entries[date_]
+            data[date_.isoformat()] = [entry.to_dict() for entry in entries]
+            last_end = max(last_end, max(entry.end_time for entry in entries))
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        # Written aside and swapped in, so an interrupted save keeps the old year
+        tmp = path.with_name(path.name + ".tmp")
+        opener = ARCHIVE_FORMATS[path.suffix.lstrip(".")]
+        with opener.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        meta["entries"] = sum(len(entries) for entries in data.values())
+        meta["last_end"] = last_end.isoformat()
+
+    def _evict_archived(self) -> None:
+        """Drop loaded archived years from memory; they are read again on demand."""
+        for year in self._archives:
+            if year in self._cold_years:
+                continue
+            lo, hi = self._year_dates(year)
+            for date_ in self._dates[lo:hi]:
+                for entry in self.entries.pop(date_):
+                    del self._index[entry.id]
+                    self._intervals.remove(entry.id)
+            del self._dates[lo:hi]
+            self._cold_years.add(year)
     
     def _load_entries(self) -> None:
-        """Load entries from storage file."""
-        if not self.storage_path.exists():
+        """Load entries from storage file.
+
+        If the store has an up-to-date date index, nothing is parsed yet:
+        days are decoded from the mapped file as queries reach them.
+        """
+        self._stamp = self._store_stamp()
+        if self._stamp is None:
+            return
+        self._lazy = DateIndex.open(self.storage_path)
+        if self._lazy is not None:
             return
         
         try:
-            data = json.loads(self.storage_path.read_text())
-            for date_str, entries_data in data.items():
-                entry_date = date.fromisoformat(date_str)
-                self.entries[entry_date] = [
-                    TimeEntry.from_dict(entry_data)
-                    for entry_data in entries_data
-                ]
+            if binary_store.is_binary_path(self.storage_path):
+                entries = binary_store.read_entries(self.storage_path)
+            else:
+                data = json.loads(self.storage_path.read_text())
+                entries = (TimeEntry.from_dict(entry_data) for entries_data in data.values() for entry_data in entries_data)
+            for entry in entries:
+                # Archived years come from their archives; a copy in the store
+                # is left over from a save interrupted before the store was rewritten
+                if entry.date.year not in self._archives:
+                    self._add_entry(entry)
         except Exception as e:
             print(f"Error loading entries: {e}")
             self.entries = {}
+            self._dates = []
+            self._index = {}
+            self._intervals.clear()
+            self._cold_years = set(self._archives)
 
     def replace_entries(self, entries: List[TimeEntry]) -> None:
         """Replace all stored entries with the provided list."""
         self.entries = {}
+        self._dates = []
+        self._index = {}
+        self._intervals.clear()
         self.current_entry = None
+        self._timer_resumed = False
         self.last_deleted = None
+        if self._lazy is not None:
+            self._lazy.close()
+            self._lazy = None
+            self._lazy_loaded = set()
+        self._report_cache.clear()
+        # Every archived year is rewritten from the new list (or removed)
+        self._cold_years = set()
+        self._dirty_years = set(self._archives)
         for entry in entries:
             self._add_entry(entry)
-        self.save_entries()
\ No newline at end of file
+        self.save_entries()
+        self._evict_archived()
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Sorted-endpoint index for time-window queries over time entries.
+"""
+
+import bisect
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from .time_entry import TimeEntry
+
+DEFAULT_SPAN_LIMIT = timedelta(days=1)
+
+
+def _start_key(entry: TimeEntry) -> datetime:
+    return entry.start_time
+
+
+class IntervalIndex:
+    """Answer "which entries overlap [start, end)" without scanning everything.
+
+    Entries no longer than ``span_limit`` are kept in a list sorted by start
+    time. Any such entry overlapping a window must start within
+    ``(start - span_limit, end)``, so a query is two bisections plus a scan of
+    the matches: O(log n + k). Longer entries (multi-day absences) are rare
+    and live in a small side table that every query checks.
+    """
+
+    def __init__(self, span_limit: timedelta = DEFAULT_SPAN_LIMIT):
+        self.span_limit = span_limit
+        # Parallel lists sorted by start time
+        self._starts: List[datetime] = []
+        self._entries: List[TimeEntry] = []
+        self._long: Dict[str, TimeEntry] = {}
+        # entry ID -> (start, end) as indexed, so removal does not depend on
+        # the entry object being unchanged since it was added
+        self._bounds: Dict[str, Tuple[datetime, datetime]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def clear(self) -> None:
+        self._starts = []
+        self._entries = []
+        self._long = {}
+        self._bounds = {}
+
+    def add(self, entry: TimeEntry) -> None:
+        """Index an entry. Its ID must not already be indexed."""
+        start, end = entry.start_time, entry.end_time
+        self._bounds[entry.id] = (start, end)
+        if end - start > self.span_limit:
+            self._long[entry.id] = entry
+            return
+        position = bisect.bisect_right(self._starts, start)
+        self._starts.insert(position, start)
+        self._entries.insert(position, entry)
+
+    def remove(self, entry_id: str) -> bool:
+        """Drop an entry from the index. Returns False if it was not indexed."""
+        bounds = self._bounds.pop(entry_id, None)
+        if bounds is None:
+            return False
+        if self._long.pop(entry_id, None) is not None:
+            return True
+        start = bounds[0]
+        position = bisect.bisect_left(self._starts, start)
+        while self._entries[position].id != entry_id:
+            position += 1
+        del self._starts[position]
+        del self._entries[position]
+        return True
+
+    def overlapping(self, start: datetime, end: datetime) -> List[TimeEntry]:
+        """Return entries overlapping [start, end), ordered by start time."""
+        if end <= start:
+            return []
+        lo = bisect.bisect_right(self._starts, start - self.span_limit)
+        hi = bisect.bisect_left(self._starts, end)
+        short = [e for e in self._entries[lo:hi] if self._bounds[e.id][1] > start]
+        if not self._long:
+            return short
+        long_ = sorted(
+            (e for e in self._long.values()
+             if self._bounds[e.id][0] < end and self._bounds[e.id][1] > start),
+            key=_start_key,
+        )
+        return list(heapq.merge(short, long_, key=_start_key))
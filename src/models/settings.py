@@ -2,34 +2,179 @@
 Application settings model.
 """
 
+import copy
 import json
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+# callback(key, old_value, new_value)
+SettingsCallback = Callable[[str, Any, Any], None]
 
 
 class Settings:
-    """Manages application settings."""
-    
+    """Manages application settings.
+
+    Use Settings.instance() to share one cached object per config file across
+    the process. The file is re-read only when its mtime changes, writes made
+    inside batch() are flushed once, and subscribers are told about every
+    changed key, whether it was set here or edited on disk.
+    """
+
+    _instances: Dict[Path, 'Settings'] = {}
+    _instances_lock = threading.Lock()
+
     def __init__(self, config_file: Optional[Path] = None):
         self.config_file = config_file or Path.home() / '.timetracker' / 'config.json'
         self.config: Dict[str, Any] = {}
+        # (mtime_ns, size) of the file as last read or written
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._batch_depth = 0
+        self._dirty = False
+        self._pending: List[Tuple[str, Any, Any]] = []
+        self._subscribers: List[Tuple[Optional[str], SettingsCallback]] = []
+        self._lock = threading.RLock()
         self.load()
-    
+
+    @classmethod
+    def instance(cls, config_file: Optional[Path] = None) -> 'Settings':
+        """Return the process-wide Settings for ``config_file`` (default location if omitted)."""
+        key = (config_file or Path.home() / '.timetracker' / 'config.json').resolve()
+        with cls._instances_lock:
+            settings = cls._instances.get(key)
+            if settings is None:
+                settings = cls._instances[key] = cls(config_file)
+            return settings
+
+    @staticmethod
+    def read_value(key: str, default: Any = None, config_file: Optional[Path] = None) -> Any:
+        """Read one setting straight from the file, without creating it or caching an instance.
+
+        Raises OSError or ValueError if the file exists but cannot be read.
+        """
+        path = config_file or Path.home() / '.timetracker' / 'config.json'
+        try:
+            with open(path, 'r') as f:
+                config = json.load(f)
+        except FileNotFoundError:
+            return default
+        if not isinstance(config, dict):
+            raise ValueError(f"{path} does not hold a JSON object")
+        return config.get(key, default)
+
+    @classmethod
+    def reset_instances(cls) -> None:
+        """Drop all cached instances (mainly for tests)."""
+        with cls._instances_lock:
+            cls._instances.clear()
+
     def load(self):
         """Load settings from file."""
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                self.config = json.load(f)
-        else:
-            self.config = self._default_settings()
-            self.save()
-    
+        with self._lock:
+            previous = self.config
+            if self.config_file.exists():
+                with open(self.config_file, 'r') as f:
+                    self.config = json.load(f)
+                self._file_stamp = self._current_stamp()
+            else:
+                self.config = self._default_settings()
+                self.save()
+            if previous:
+                self._notify_diff(previous, self.config)
+
+    def reload_if_changed(self) -> bool:
+        """Reload the file if it changed on disk since it was last read or written."""
+        with self._lock:
+            if self._batch_depth or self._current_stamp() == self._file_stamp:
+                return False
+            self.load()
+            return True
+
+    def _current_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.config_file.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
     def save(self):
-        """Save settings to file."""
-        self.config_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
-    
+        """Save settings to file (deferred until the end of an active batch)."""
+        with self._lock:
+            if self._batch_depth:
+                self._dirty = True
+                return
+            self.config_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so other processes never read a partial file
+            tmp_file = self.config_file.with_name(self.config_file.name + '.tmp')
+            with open(tmp_file, 'w') as f:
+                json.dump(self.config, f, indent=2)
+            os.replace(tmp_file, self.config_file)
+            self._file_stamp = self._current_stamp()
+            self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator['Settings']:
+        """Group several set() calls into one write.
+
+        Subscribers are notified after the write. If the block raises, the
+        changes made inside it are rolled back and nothing is written.
+        """
+        with self._lock:
+            if self._batch_depth == 0:
+                snapshot = copy.deepcopy(self.config)
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.config = snapshot
+                    self._dirty = False
+                    self._pending = []
+                raise
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                if self._dirty:
+                    self.save()
+                pending, self._pending = self._pending, []
+                for change in pending:
+                    self._dispatch(*change)
+
+    def subscribe(self, callback: SettingsCallback, key: Optional[str] = None) -> Callable[[], None]:
+        """Call ``callback(key, old, new)`` when ``key`` (or any key if None) changes.
+
+        Returns a function that removes the subscription.
+        """
+        subscription = (key, callback)
+        with self._lock:
+            self._subscribers.append(subscription)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if subscription in self._subscribers:
+                    self._subscribers.remove(subscription)
+
+        return unsubscribe
+
+    def _notify(self, key: str, old: Any, new: Any) -> None:
+        if self._batch_depth:
+            self._pending.append((key, old, new))
+        else:
+            self._dispatch(key, old, new)
+
+    def _notify_diff(self, old_config: Dict[str, Any], new_config: Dict[str, Any]) -> None:
+        for key in old_config.keys() | new_config.keys():
+            old, new = old_config.get(key), new_config.get(key)
+            if old != new:
+                self._notify(key, old, new)
+
+    def _dispatch(self, key: str, old: Any, new: Any) -> None:
+        for subscribed_key, callback in list(self._subscribers):
+            if subscribed_key is None or subscribed_key == key:
+                callback(key, old, new)
+
     def _default_settings(self) -> Dict[str, Any]:
         """Return default settings."""
         return {
@@ -41,12 +186,18 @@ class Settings:
             'break_duration': 60,  # minutes
             'data_directory': str(Path.home() / '.timetracker' / 'data'),
         }
-    
+
     def get(self, key: str, default: Any = None) -> Any:
-        """Get a setting value."""
+        """Get a setting value, picking up changes made to the file on disk."""
+        self.reload_if_changed()
         return self.config.get(key, default)
-    
+
     def set(self, key: str, value: Any):
         """Set a setting value."""
-        self.config[key] = value
-        self.save()
\ No newline at end of file
+        with self._lock:
+            old = self.config.get(key)
+            if key in self.config and old == value:
+                return
+            self.config[key] = value
+            self.save()
+            self._notify(key, old, value)
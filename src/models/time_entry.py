@@ -2,11 +2,23 @@
 Time entry data model.
 """
 
-from dataclasses import dataclass
+import hashlib
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta, date
 from typing import Optional
 
 
+def new_entry_id() -> str:
+    """Return a new unique entry ID."""
+    return uuid.uuid4().hex
+
+
+def derived_entry_id(key: str) -> str:
+    """Return an ID that is the same on every call for the same ``key``."""
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:32]
+
+
 @dataclass
 class TimeEntry:
     """Represents a single time entry."""
@@ -14,6 +26,7 @@ class TimeEntry:
     end_time: datetime
     description: str = ""
     is_absence: bool = False
+    id: str = field(default_factory=new_entry_id)
     
     @property
     def date(self) -> date:
@@ -27,12 +40,19 @@ class TimeEntry:
     
     @classmethod
     def from_dict(cls, data: dict) -> 'TimeEntry':
-        """Create a TimeEntry from a dictionary."""
+        """Create a TimeEntry from a dictionary.
+
+        Entries stored before IDs existed get one derived from their fields,
+        so they keep it across loads until they are saved with it.
+        """
         return cls(
             start_time=datetime.fromisoformat(data['start_time']),
             end_time=datetime.fromisoformat(data['end_time']),
             description=data.get('description', ''),
-            is_absence=data.get('is_absence', False)
+            is_absence=data.get('is_absence', False),
+            id=data.get('id') or derived_entry_id(
+                f"{data['start_time']}|{data['end_time']}|{data.get('description', '')}|{data.get('is_absence', False)}"
+            )
         )
     
     def to_dict(self) -> dict:
@@ -41,5 +61,6 @@ class TimeEntry:
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat(),
             'description': self.description,
-            'is_absence': self.is_absence
+            'is_absence': self.is_absence,
+            'id': self.id
         }
\ No newline at end of file
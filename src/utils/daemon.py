@@ -0,0 +1,167 @@
+"""
+Resident timer daemon and the Unix domain socket protocol used by the CLI.
+
+The daemon keeps one TimeEntryManager alive between CLI invocations so the
+running timer survives and the store is parsed only once. Each connection
+carries exactly one request and one response, both encoded as a single line
+of JSON:
+
+    -> {"action": "run", "argv": ["status"]}
+    <- {"exit_code": 0, "stdout": "...", "stderr": ""}
+
+Supported actions are ``run`` (execute a CLI command line), ``ping`` and
+``shutdown``.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SOCKET_ENV_VAR = "TIMETRACKER_SOCKET"
+SOCKET_SUFFIX = ".sock"
+CONNECT_TIMEOUT = 1.0
+MAX_REQUEST_BYTES = 1024 * 1024
+
+CommandRunner = Callable[[List[str]], Tuple[int, str, str]]
+
+
+def daemon_supported() -> bool:
+    """Return True when the platform offers Unix domain sockets."""
+    return hasattr(socket, "AF_UNIX")
+
+
+def default_socket_path(storage_path: Path) -> Path:
+    """Return the socket path for the daemon serving ``storage_path``.
+
+    Each storage file gets its own socket next to it, so a daemon never
+    answers for a store it did not load. ``TIMETRACKER_SOCKET`` overrides it.
+    """
+    override = os.getenv(SOCKET_ENV_VAR)
+    if override:
+        return Path(override)
+    return storage_path.with_name(storage_path.name + SOCKET_SUFFIX)
+
+
+def _response(exit_code: int, stdout: str = "", stderr: str = "") -> Dict[str, Any]:
+    return {"exit_code": exit_code, "stdout": stdout, "stderr": stderr}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "TimerDaemon"
+
+    def handle(self) -> None:
+        response = self._dispatch(self.rfile.readline(MAX_REQUEST_BYTES))
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+    def _dispatch(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _response(2, stderr="Malformed daemon request.\n")
+        if not isinstance(request, dict):
+            return _response(2, stderr="Malformed daemon request.\n")
+
+        action = request.get("action", "run")
+        if action == "ping":
+            return _response(0, stdout=f"Daemon running (pid {os.getpid()}).\n")
+        if action == "shutdown":
+            # shutdown() blocks until serve_forever() returns, so it must not
+            # run on the thread that is serving this request.
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+            return _response(0, stdout="Daemon stopping.\n")
+        if action != "run":
+            return _response(2, stderr=f"Unknown daemon action '{action}'.\n")
+
+        argv = request.get("argv")
+        if not isinstance(argv, list) or not all(isinstance(a, str) for a in argv):
+            return _response(2, stderr="Daemon request is missing 'argv'.\n")
+
+        exit_code, stdout, stderr = self.server.runner(argv)
+        return _response(exit_code, stdout, stderr)
+
+
+class TimerDaemon(socketserver.UnixStreamServer):
+    """Serve CLI commands against a resident manager over a Unix socket.
+
+    Requests are handled one at a time on the serving thread, which keeps
+    the manager free of locking and lets the runner redirect stdout safely.
+    """
+
+    def __init__(self, socket_path: Path, runner: CommandRunner):
+        self.socket_path = socket_path
+        self.runner = runner
+        self._claim_socket_path()
+        super().__init__(str(socket_path), _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def _claim_socket_path(self) -> None:
+        if not self.socket_path.exists():
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            return
+        if send_request(self.socket_path, {"action": "ping"}) is not None:
+            raise RuntimeError(f"A daemon is already listening on {self.socket_path}")
+        # Left behind by a daemon that did not shut down cleanly
+        self.socket_path.unlink()
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def send_request(
+    socket_path: Path, request: Dict[str, Any], timeout: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon and return its decoded response.
+
+    Returns None when no daemon is listening on ``socket_path``. ``timeout``
+    bounds the wait for the response; by default it is unlimited because
+    commands such as ``sync`` may legitimately take a while.
+    """
+    if not daemon_supported() or not socket_path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError, socket.timeout):
+            return None
+        sock.settimeout(timeout)
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+
+    if not chunks:
+        return None
+    return json.loads(b"".join(chunks))
+
+
+def run_remote(socket_path: Path, argv: List[str]) -> Optional[Tuple[int, str, str]]:
+    """Run a CLI command line on the daemon.
+
+    Returns ``(exit_code, stdout, stderr)``, or None if no daemon is running.
+    """
+    response = send_request(socket_path, {"action": "run", "argv": argv})
+    if response is None:
+        return None
+    return (
+        int(response.get("exit_code", 1)),
+        response.get("stdout", ""),
+        response.get("stderr", ""),
+    )
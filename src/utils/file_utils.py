@@ -1,47 +1,161 @@
 """
 File operation utilities.
+
+Time entries are stored as monthly JSON shards (``YYYY-MM.json``), each a
+JSON array of entry dicts. Parsed shards are cached by path and keyed on the
+file's mtime and size, so unchanged months are never read twice.
 """
 
 import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+MAX_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+
+# path -> (st_mtime_ns, st_size, parsed entries)
+_shard_cache: Dict[Path, Tuple[int, int, List[Dict]]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cached_shard(path: Path, stat: os.stat_result) -> Optional[List[Dict]]:
+    with _cache_lock:
+        cached = _shard_cache.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    return None
+
+
+def _read_shard(path: Path) -> List[Dict]:
+    """Return the entries of one shard, from the cache when it is unchanged.
+
+    Unreadable or malformed shards yield no entries.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return []
+    cached = _cached_shard(path, stat)
+    if cached is not None:
+        return cached
+
+    try:
+        with open(path, 'r') as f:
+            entries = json.load(f)
+    except (json.JSONDecodeError, IOError):
+        return []
+    if not isinstance(entries, list):
+        return []
+
+    with _cache_lock:
+        _shard_cache[path] = (stat.st_mtime_ns, stat.st_size, entries)
+    return entries
+
+
+def clear_shard_cache() -> None:
+    """Forget all parsed shards."""
+    with _cache_lock:
+        _shard_cache.clear()
 
 
 def load_time_entries(data_dir: Path) -> List[Dict]:
-    """Load time entries from JSON files."""
+    """Load time entries from JSON files.
+
+    Shards changed since the last call are read concurrently. The returned
+    dicts are shared with the cache and should be treated as read-only.
+    """
     entries = []
     data_dir.mkdir(parents=True, exist_ok=True)
-    
-    for file in data_dir.glob('*.json'):
-        try:
-            with open(file, 'r') as f:
-                entries.extend(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            continue
-    
+
+    files = sorted(data_dir.glob('*.json'))
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=MAX_LOAD_WORKERS) as pool:
+            shards = list(pool.map(_read_shard, files))
+    else:
+        shards = [_read_shard(file) for file in files]
+
+    for shard in shards:
+        entries.extend(shard)
+
     return entries
 
 
+def iter_time_entries(data_dir: Path) -> Iterator[Dict]:
+    """Yield time entries shard by shard, in month order.
+
+    Only one uncached shard is parsed at a time, which makes this suitable
+    for streaming aggregation over many years of data.
+    """
+    if not data_dir.exists():
+        return
+    for file in sorted(data_dir.glob('*.json')):
+        yield from _read_shard(file)
+
+
+def _find_array_end(f) -> Optional[Tuple[int, bool]]:
+    """Locate where new items go in a JSON array file opened in binary mode.
+
+    Returns (offset just past the last item or the opening bracket, whether
+    the array is empty), or None if the file does not end with an array.
+    """
+    size = f.seek(0, os.SEEK_END)
+    window = 4096
+    while True:
+        start = max(0, size - window)
+        f.seek(start)
+        tail = f.read(size - start).rstrip()
+        if tail and not tail.endswith(b']'):
+            return None
+        before = tail[:-1].rstrip()
+        if before:
+            return start + len(before), before.endswith(b'[')
+        if start == 0:
+            return None
+        window *= 2
+
+
+def _format_array_item(entry: Dict) -> str:
+    # Matches json.dump(entries, f, indent=2) so appended files look rewritten
+    return '\n'.join('  ' + line for line in json.dumps(entry, indent=2).splitlines())
+
+
 def save_time_entry(entry: Dict, data_dir: Path):
-    """Save a time entry to a JSON file."""
+    """Save a time entry to a JSON file.
+
+    The entry is appended in place at the end of its month's shard, so
+    existing entries are neither re-read nor rewritten.
+    """
     data_dir.mkdir(parents=True, exist_ok=True)
-    
+
     # Use YYYY-MM.json as filename format
     date = datetime.fromisoformat(entry['date'])
     filename = date.strftime('%Y-%m.json')
     file_path = data_dir / filename
-    
-    # Load existing entries
-    entries = []
+
+    item = _format_array_item(entry)
+    cached = None
+    appended = False
     if file_path.exists():
-        try:
-            with open(file_path, 'r') as f:
-                entries = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            pass
-    
-    # Add new entry and save
-    entries.append(entry)
-    with open(file_path, 'w') as f:
-        json.dump(entries, f, indent=2)
\ No newline at end of file
+        cached = _cached_shard(file_path, file_path.stat())
+        with open(file_path, 'r+b') as f:
+            array_end = _find_array_end(f)
+            if array_end is not None:
+                offset, empty = array_end
+                f.seek(offset)
+                f.write(((',' if not empty else '') + '\n' + item + '\n]').encode('utf-8'))
+                f.truncate()
+                appended = True
+
+    if not appended:
+        # New month, or a shard that is not a JSON array and gets replaced
+        with open(file_path, 'w') as f:
+            f.write('[\n' + item + '\n]')
+        cached = []
+
+    if cached is not None:
+        stat = file_path.stat()
+        with _cache_lock:
+            _shard_cache[file_path] = (stat.st_mtime_ns, stat.st_size, cached + [entry])
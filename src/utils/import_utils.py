@@ -0,0 +1,155 @@
+"""
+Bulk import of time entries from CSV or JSON-lines files.
+
+Rows are parsed lazily and validated a batch at a time, so only one batch
+of parsed entries is held at once. Two row shapes are accepted (column
+names are case-insensitive):
+
+* ``start_time``, ``end_time`` as ISO datetimes (the JSON store format), or
+* ``date``, ``start``, ``end`` as YYYY-MM-DD and HH:MM[:SS] (the webapp
+  export format, where an end before the start is on the next day),
+
+plus optional ``description``, ``is_absence`` (or ``absence``) and ``id``.
+"""
+
+import csv
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from models.time_entry import TimeEntry, new_entry_id
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+DEFAULT_BATCH_SIZE = 1000
+# Rejected rows kept on the report; the rest are only counted (and written
+# to the rejects file, if one is given)
+MAX_REPORTED_ERRORS = 100
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+# (line number, raw record or None if unparseable, parse error or None)
+RawRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+@dataclass
+class ImportReport:
+    """Outcome of an import."""
+    imported: int = 0
+    rejected: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def processed(self) -> int:
+        return self.imported + self.rejected
+
+    def reject(self, line: int, error: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, error))
+
+
+def detect_format(filename: str) -> str:
+    """Guess the import format from a file name (``.jsonl``/``.ndjson`` or CSV)."""
+    lowered = filename.lower()
+    if lowered.endswith(('.jsonl', '.ndjson', '.json')):
+        return 'jsonl'
+    return 'csv'
+
+
+def iter_raw_rows(stream: TextIO, fmt: str) -> Iterator[RawRow]:
+    """Yield the rows of ``stream`` one at a time with their line numbers."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record, None
+    elif fmt == 'jsonl':
+        for line_no, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield line_no, None, f"invalid JSON: {exc.msg}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "expected a JSON object"
+                continue
+            yield line_no, record, None
+    else:
+        raise ValueError(f"Unknown import format '{fmt}'; choose from {IMPORT_FORMATS}")
+
+
+def _is_true(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    return str(value or '').strip().lower() in TRUE_VALUES
+
+
+def parse_record(record: Dict[str, Any]) -> TimeEntry:
+    """Build a TimeEntry from one imported row, raising ValueError if it is invalid."""
+    row = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+
+    if row.get('start_time') and row.get('end_time'):
+        start = datetime.fromisoformat(str(row['start_time']).strip())
+        end = datetime.fromisoformat(str(row['end_time']).strip())
+    elif row.get('date') and row.get('start') and row.get('end'):
+        day = str(row['date']).strip()
+        start = datetime.fromisoformat(f"{day}T{str(row['start']).strip()}")
+        end = datetime.fromisoformat(f"{day}T{str(row['end']).strip()}")
+        if end < start:
+            # The webapp stores a timer stopped after midnight with an end
+            # earlier than its start
+            end += timedelta(days=1)
+    else:
+        raise ValueError("needs start_time/end_time or date/start/end")
+
+    if end <= start:
+        raise ValueError("end must be after start")
+
+    return TimeEntry(
+        start_time=start,
+        end_time=end,
+        description=str(row.get('description') or '').strip(),
+        is_absence=_is_true(row.get('is_absence', row.get('absence'))),
+        id=str(row.get('id') or '').strip() or new_entry_id(),
+    )
+
+
+def import_entries(
+    rows: Iterable[RawRow],
+    add_batch: Callable[[List[TimeEntry]], None],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: Optional[Callable[[ImportReport], None]] = None,
+    on_reject: Optional[Callable[[int, Optional[Dict[str, Any]], str], None]] = None,
+) -> ImportReport:
+    """Validate ``rows`` in batches and pass each batch of valid entries to ``add_batch``.
+
+    ``on_progress`` is called after every batch and ``on_reject`` for every
+    rejected row (line number, raw record, error).
+    """
+    report = ImportReport()
+    batch: List[TimeEntry] = []
+
+    def flush() -> None:
+        if batch:
+            add_batch(batch)
+            report.imported += len(batch)
+            batch.clear()
+        if on_progress:
+            on_progress(report)
+
+    for line_no, record, error in rows:
+        if error is None:
+            try:
+                batch.append(parse_record(record))
+            except (TypeError, ValueError) as exc:
+                error = str(exc)
+        if error is not None:
+            report.reject(line_no, error)
+            if on_reject:
+                on_reject(line_no, record, error)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return report
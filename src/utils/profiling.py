@@ -0,0 +1,150 @@
+"""
+Opt-in timing and profiling for CLI runs.
+
+Classes declare the methods worth timing in a ``TIMED_METHODS`` tuple. Those
+methods are only wrapped while a RunProfiler is active, so there is no
+overhead at all when profiling is off.
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+TOP_N = 25
+
+
+class CallTimings:
+    """Call count and inclusive wall time per instrumented method."""
+
+    def __init__(self):
+        self.calls: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        stats = self.calls.setdefault(name, [0, 0.0])
+        stats[0] += 1
+        stats[1] += seconds
+
+    def total(self, name: str) -> float:
+        return self.calls.get(name, [0, 0.0])[1]
+
+
+def _timed(original: Callable, label: str, timings: CallTimings) -> Callable:
+    @functools.wraps(original)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            timings.record(label, time.perf_counter() - start)
+
+    return wrapper
+
+
+def instrument(cls: type, timings: CallTimings) -> Callable[[], None]:
+    """Wrap ``cls.TIMED_METHODS`` to record into ``timings``.
+
+    Returns a function that restores the original methods.
+    """
+    originals: List[Tuple[str, Callable]] = []
+    for name in getattr(cls, "TIMED_METHODS", ()):
+        original = cls.__dict__[name]
+        setattr(cls, name, _timed(original, f"{cls.__name__}.{name}", timings))
+        originals.append((name, original))
+
+    def restore() -> None:
+        for name, original in originals:
+            setattr(cls, name, original)
+
+    return restore
+
+
+class RunProfiler:
+    """Collect phase timings, method timings and an optional profile for one run."""
+
+    def __init__(self, mode: Optional[str] = None, output: Optional[Path] = None):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'")
+        self.mode = mode
+        self.output = output
+        self.phases: List[Tuple[str, float]] = []
+        self.calls = CallTimings()
+        self._restore: List[Callable[[], None]] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+        self._peak = 0
+
+    def instrument(self, *classes: type) -> None:
+        for cls in classes:
+            self._restore.append(instrument(cls, self.calls))
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start)
+
+    def start(self) -> None:
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == "tracemalloc":
+            tracemalloc.start()
+
+    def stop(self) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        elif self.mode == "tracemalloc" and tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+            self._peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        for restore in self._restore:
+            restore()
+        self._restore = []
+
+    def report(self, stream: TextIO) -> None:
+        """Write phase and method timings, then the profile if one was taken."""
+        print("Phase timings:", file=stream)
+        for name, seconds in self.phases:
+            print(f"  {name:<20}{seconds * 1000:10.2f} ms", file=stream)
+        if self.calls.calls:
+            print("Instrumented calls (inclusive):", file=stream)
+            ranked = sorted(self.calls.calls.items(), key=lambda item: -item[1][1])
+            for name, (count, seconds) in ranked:
+                print(f"  {name:<40}{int(count):6d}x {seconds * 1000:10.2f} ms", file=stream)
+
+        if self._profile is not None:
+            self._report_cprofile(stream)
+        elif self._snapshot is not None:
+            self._report_tracemalloc(stream)
+
+    def _report_cprofile(self, stream: TextIO) -> None:
+        if self.output:
+            self._profile.dump_stats(str(self.output))
+            print(f"cProfile stats written to {self.output}", file=stream)
+            return
+        buffer = io.StringIO()
+        pstats.Stats(self._profile, stream=buffer).sort_stats("cumulative").print_stats(TOP_N)
+        stream.write(buffer.getvalue())
+
+    def _report_tracemalloc(self, stream: TextIO) -> None:
+        lines = [f"tracemalloc peak: {self._peak / 1024:.1f} KiB", f"Top {TOP_N} allocation sites:"]
+        for stat in self._snapshot.statistics("lineno")[:TOP_N]:
+            lines.append(f"  {stat}")
+        text = "\n".join(lines) + "\n"
+        if self.output:
+            self.output.write_text(text)
+            print(f"tracemalloc stats written to {self.output}", file=stream)
+        else:
+            stream.write(text)
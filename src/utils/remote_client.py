@@ -8,7 +8,7 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
-from models.time_entry import TimeEntry
+from models.time_entry import TimeEntry, new_entry_id
 
 REMOTE_TIME_FORMATS = ["%H:%M:%S", "%H:%M"]
 
@@ -47,6 +47,7 @@ def _entry_to_payload(entry: TimeEntry) -> Dict[str, Any]:
         "end": entry.end_time.strftime("%H:%M:%S"),
         "description": entry.description,
         "is_absence": entry.is_absence,
+        "id": entry.id,
     }
 
 
@@ -63,12 +64,16 @@ def _entry_from_payload(payload: Dict[str, Any]) -> TimeEntry:
         end_time=end_time,
         description=payload.get("description", ""),
         is_absence=bool(payload.get("is_absence")),
+        id=payload.get("id") or new_entry_id(),
     )
 
 
 class RemoteTimeTrackerClient:
     """Minimal client for the Flask API that stores time entries."""
 
+    # Wrapped with timing hooks only while CLI profiling is enabled
+    TIMED_METHODS = ("login", "load_entries", "save_entries")
+
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
@@ -3,25 +3,124 @@ Time-related utility functions.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple
 
+GROUP_BYS = ('day', 'week', 'month', 'description')
 
-def calculate_weekly_hours(entries: List[Dict]) -> Dict[str, timedelta]:
-    """Calculate total hours worked per week."""
-    weekly_hours = {}
-    
-    for entry in entries:
-        start = datetime.fromisoformat(entry['start_time'])
-        end = datetime.fromisoformat(entry['end_time'])
-        week = start.strftime('%Y-W%W')
-        
+
+def _as_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _entry_fields(entry: Any) -> Tuple[datetime, datetime, str, bool]:
+    """Return (start, end, description, is_absence) for a TimeEntry or an entry dict."""
+    if isinstance(entry, dict):
+        return (
+            _as_datetime(entry['start_time']),
+            _as_datetime(entry['end_time']),
+            entry.get('description', ''),
+            bool(entry.get('is_absence', False)),
+        )
+    return entry.start_time, entry.end_time, entry.description, entry.is_absence
+
+
+def period_key(moment: datetime, group_by: str) -> str:
+    """Return the key of the day, ISO week or month containing ``moment``.
+
+    Weeks are ISO 8601 weeks (Monday-based, keyed by ISO year), matching
+    TimeEntryManager.get_week_total. Keys of one kind sort chronologically.
+    """
+    if group_by == 'day':
+        return moment.date().isoformat()
+    if group_by == 'week':
+        iso_year, iso_week, _ = moment.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if group_by == 'month':
+        return f"{moment.year}-{moment.month:02d}"
+    raise ValueError(f"Unknown period '{group_by}'")
+
+
+class DurationAggregator:
+    """Accumulate entry durations for several groupings in a single pass.
+
+    Entries are attributed to the period containing their start time. Feed
+    entries with add() (any number of times, from any source) and read the
+    running totals with totals().
+    """
+
+    def __init__(self, group_by: Sequence[str] = ('week',), skip_absences: bool = False):
+        unknown = [g for g in group_by if g not in GROUP_BYS]
+        if unknown:
+            raise ValueError(f"Unknown group-by {unknown}; choose from {GROUP_BYS}")
+        self.group_by = tuple(group_by)
+        self.skip_absences = skip_absences
+        self._totals: Dict[str, Dict[str, timedelta]] = {g: {} for g in self.group_by}
+
+    def add(self, entry: Any) -> None:
+        """Add one entry (a TimeEntry or a dict with ISO start_time/end_time)."""
+        start, end, description, is_absence = _entry_fields(entry)
+        if is_absence and self.skip_absences:
+            return
         duration = end - start
-        if week in weekly_hours:
-            weekly_hours[week] += duration
-        else:
-            weekly_hours[week] = duration
-    
-    return weekly_hours
+        for group_by in self.group_by:
+            key = description if group_by == 'description' else period_key(start, group_by)
+            bucket = self._totals[group_by]
+            bucket[key] = bucket.get(key, timedelta()) + duration
+
+    def totals(self) -> Dict[str, Dict[str, timedelta]]:
+        """Return {group_by: {key: total}} for everything added so far."""
+        return self._totals
+
+
+def aggregate_durations(
+    entries: Iterable[Any],
+    group_by: Sequence[str] = ('week',),
+    skip_absences: bool = False,
+) -> Dict[str, Dict[str, timedelta]]:
+    """Total entry durations per day, week, month and/or description in one pass.
+
+    ``entries`` can be any iterable, e.g. a generator over JSON shards; it is
+    consumed once and never materialized.
+    """
+    aggregator = DurationAggregator(group_by, skip_absences)
+    for entry in entries:
+        aggregator.add(entry)
+    return aggregator.totals()
+
+
+def iter_period_totals(
+    entries: Iterable[Any], period: str = 'week', skip_absences: bool = False
+) -> Iterator[Tuple[str, timedelta]]:
+    """Yield (period, total) pairs as each period completes.
+
+    ``entries`` must be ordered by start time, which lets each period be
+    emitted as soon as the first entry of a later one arrives, so memory use
+    does not grow with the number of periods.
+    """
+    current: Optional[str] = None
+    total = timedelta()
+    for entry in entries:
+        start, end, _, is_absence = _entry_fields(entry)
+        if is_absence and skip_absences:
+            continue
+        key = period_key(start, period)
+        if key != current:
+            if current is not None:
+                if key < current:
+                    raise ValueError("Entries must be ordered by start time")
+                yield current, total
+            current = key
+            total = timedelta()
+        total += end - start
+    if current is not None:
+        yield current, total
+
+
+def calculate_weekly_hours(entries: Iterable[Dict]) -> Dict[str, timedelta]:
+    """Calculate total hours worked per ISO week (keys like '2025-W46')."""
+    return aggregate_durations(entries, ('week',))['week']
 
 
 def format_duration(duration: timedelta) -> str:
@@ -30,5 +129,5 @@ def format_duration(duration: timedelta) -> str:
     hours = total_seconds // 3600
     minutes = (total_seconds % 3600) // 60
     seconds = total_seconds % 60
-    
-    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
\ No newline at end of file
+
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
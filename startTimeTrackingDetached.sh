@@ -1,7 +1,7 @@
 #!/bin/zsh
 
-# Run the nohup command with the full paths
-/usr/bin/nohup sh -c 'cd /Users/denny/Development/TimeTracking && PYTHONPATH=/Users/denny/Development/TimeTracking/src /Users/denny/Development/.venv/bin/python -u src/main.py' &
+# Start the resident timer daemon in the background with the full paths
+/usr/bin/nohup sh -c 'cd /Users/denny/Development/TimeTracking && PYTHONPATH=/Users/denny/Development/TimeTracking/src /Users/denny/Development/.venv/bin/python -u src/main.py daemon' &
 
 # Optional: Exit the script immediately
 exit
\ No newline at end of file
@@ -0,0 +1,24 @@
+from benchmarks.generator import generate_history
+from benchmarks.run import compare, run_suite
+
+
+def test_generator_is_deterministic_and_chronological():
+    first = list(generate_history(500, seed=7))
+    second = list(generate_history(500, seed=7))
+    assert first == second
+    assert len(first) == 500
+    assert all(a.start_time <= b.start_time for a, b in zip(first, first[1:]))
+    assert any(e.is_absence for e in first)
+    assert list(generate_history(500, seed=8)) != first
+
+
+def test_suite_runs_and_flags_regressions():
+    results = run_suite([200], ["manager_load", "generate_report_month"], repeat=1, log=lambda _: None)
+    assert set(results["results"]) == {"manager_load@200", "generate_report_month@200"}
+
+    baseline = {"results": {k: {"seconds": v["seconds"] / 10} for k, v in results["results"].items()}}
+    assert len(compare(results, baseline, tolerance=2.0)) == 2
+    assert compare(results, results, tolerance=1.5) == []
+    assert compare(results, {"results": {"manager_load@200": results["results"]["manager_load@200"]}}, tolerance=1.5) == [
+        "generate_report_month@200: not in baseline"
+    ]
@@ -0,0 +1,66 @@
+import json
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from main import main
+from models import binary_store
+from models.entry_manager import TimeEntryManager
+from models.time_entry import TimeEntry
+
+
+def test_round_trip_is_lossless_and_deduplicates_descriptions():
+    entries = [
+        TimeEntry(start_time=datetime(2025, 11, 10, 9, 0, 0, 123456), end_time=datetime(2025, 11, 10, 10), description="Wörk 🏖", id="a"),
+        TimeEntry(start_time=datetime(1969, 12, 31, 23), end_time=datetime(1970, 1, 1, 1), description="Wörk 🏖"),
+        TimeEntry(start_time=datetime(2025, 11, 11, 8), end_time=datetime(2025, 11, 11, 9), is_absence=True),
+    ]
+    data = binary_store.encode_entries(entries)
+    assert binary_store.decode_entries(data) == entries
+    # Two IDs, the shared description and the empty one
+    assert binary_store.read_header(data) == (3, 5)
+
+    with pytest.raises(ValueError):
+        binary_store.decode_entries(b"JSON" + data[4:])
+    with pytest.raises(ValueError):
+        aware = datetime(2025, 11, 10, 9, tzinfo=timezone.utc)
+        binary_store.encode_entries([TimeEntry(start_time=aware, end_time=aware + timedelta(hours=1))])
+
+
+def test_manager_uses_binary_storage_by_suffix_and_converts(tmp_path, capsys):
+    storage = tmp_path / "timedata.json"
+    mgr = TimeEntryManager(storage)
+    mgr.add_manual_entry(TimeEntry(start_time=datetime(2025, 11, 10, 9), end_time=datetime(2025, 11, 10, 10), description="Work"))
+
+    assert main(["--no-daemon", "--storage", str(storage), "convert", "--to", "binary"]) is None
+    binary = tmp_path / "timedata.ttb"
+    assert binary.read_bytes().startswith(binary_store.MAGIC)
+    from_binary = TimeEntryManager(binary)
+    assert [e.description for e in from_binary.get_entries_for_date(date(2025, 11, 10))] == ["Work"]
+
+    from_binary.add_manual_entry(TimeEntry(start_time=datetime(2025, 11, 11, 9), end_time=datetime(2025, 11, 11, 10)))
+    back = tmp_path / "back.json"
+    main(["--no-daemon", "--storage", str(binary), "convert", "--to", "json", "--output", str(back)])
+    assert len(json.loads(back.read_text())) == 2
+    assert json.loads(back.read_text())["2025-11-10"] == json.loads(storage.read_text())["2025-11-10"]
+
+    # Existing targets are only overwritten with --force
+    with pytest.raises(SystemExit):
+        main(["--no-daemon", "--storage", str(binary), "convert", "--to", "json", "--output", str(back)])
+    assert "already exists" in capsys.readouterr().err
+
+
+def test_storage_format_setting_falls_back_to_json(tmp_path, monkeypatch, capsys):
+    from main import _configured_storage_format
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert _configured_storage_format() == "json"
+    assert not (tmp_path / ".timetracker").exists()
+
+    config = tmp_path / ".timetracker" / "config.json"
+    config.parent.mkdir()
+    config.write_text('{"storage_format": "binary"')
+    assert _configured_storage_format() == "json"
+    assert "unreadable settings" in capsys.readouterr().err
+    config.write_text('{"storage_format": "binary"}')
+    assert _configured_storage_format() == "binary"
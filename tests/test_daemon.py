@@ -0,0 +1,138 @@
+import threading
+from datetime import date, datetime
+
+import pytest
+
+from main import main, run_command
+from models.entry_manager import TimeEntryManager
+from models.time_entry import TimeEntry
+from utils.daemon import TimerDaemon, daemon_supported, run_remote, send_request
+
+pytestmark = pytest.mark.skipif(not daemon_supported(), reason="requires Unix domain sockets")
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    storage = tmp_path / "timedata.json"
+    manager = TimeEntryManager(storage)
+    server = TimerDaemon(tmp_path / "tt.sock", lambda argv: run_command(manager, argv))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, manager
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_timer_survives_between_requests(daemon):
+    server, manager = daemon
+
+    code, out, _ = run_remote(server.socket_path, ["start", "--description", "Deep work"])
+    assert code == 0
+    assert "Timer started." in out
+
+    code, out, _ = run_remote(server.socket_path, ["status"])
+    assert code == 0
+    assert "Timer is running:" in out
+
+    code, out, _ = run_remote(server.socket_path, ["stop"])
+    assert code == 0
+    assert manager.current_entry is None
+    assert any(e.description == "Deep work" for day in manager.entries.values() for e in day)
+
+
+def test_errors_are_reported_with_exit_code(daemon):
+    server, _ = daemon
+
+    code, _, err = run_remote(server.socket_path, ["stop"])
+    assert code == 1
+    assert "No timer running." in err
+
+    code, _, err = run_remote(server.socket_path, ["daemon"])
+    assert code == 2
+
+
+def test_no_daemon_returns_none(tmp_path):
+    assert run_remote(tmp_path / "missing.sock", ["status"]) is None
+
+
+def test_stale_socket_is_replaced_and_live_one_refused(daemon, tmp_path):
+    server, _ = daemon
+    assert send_request(server.socket_path, {"action": "ping"})["exit_code"] == 0
+    with pytest.raises(RuntimeError):
+        TimerDaemon(server.socket_path, lambda argv: (0, "", ""))
+
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    other = TimerDaemon(stale, lambda argv: (0, "", ""))
+    other.server_close()
+    assert not stale.exists()
+
+
+def test_daemon_reloads_writes_from_other_processes(daemon, tmp_path):
+    server, manager = daemon
+    assert run_remote(server.socket_path, ["add", "--start", "2025-11-10T09:00:00", "--end", "2025-11-10T10:00:00", "--description", "Mine"])[0] == 0
+    assert run_remote(server.socket_path, ["start", "--description", "Running"])[0] == 0
+
+    other = TimeEntryManager(tmp_path / "timedata.json")
+    other.add_manual_entry(TimeEntry(start_time=datetime(2025, 11, 10, 11), end_time=datetime(2025, 11, 10, 12), description="Theirs"))
+
+    assert run_remote(server.socket_path, ["stop"])[0] == 0
+    stored = TimeEntryManager(tmp_path / "timedata.json")
+    descriptions = {e.description for e in stored.iter_range(date.min, date.max)}
+    assert {"Mine", "Theirs", "Running"} <= descriptions
+
+
+def test_running_timer_outlives_the_process(tmp_path):
+    storage = tmp_path / "timedata.json"
+    manager = TimeEntryManager(storage)
+    entry = TimeEntry(start_time=datetime(2025, 11, 10, 9), end_time=datetime(2025, 11, 10, 10), description="Resumed")
+    manager.add_manual_entry(entry)
+    manager.resume_entry(manager.get_entry(entry.id))
+    assert manager.suspend_timer()
+
+    # The next process continues the timer; the stored copy is not doubled
+    restored = TimeEntryManager(storage)
+    assert restored.restore_timer() and restored.current_entry.id == entry.id
+    assert not manager.timer_path.exists()
+    restored.stop_timer()
+    assert [e.id for e in TimeEntryManager(storage).iter_range(date.min, date.max)] == [entry.id]
+
+    main(["--no-daemon", "--storage", str(storage), "start", "--description", "Across runs"])
+    main(["--no-daemon", "--storage", str(storage), "stop"])
+    assert "Across runs" in {e.description for e in TimeEntryManager(storage).iter_range(date.min, date.max)}
+
+
+def test_restoring_a_timer_keeps_the_store_lazy(tmp_path):
+    storage = tmp_path / "timedata.json"
+    manager = TimeEntryManager(storage)
+    manager.add_entries([
+        TimeEntry(start_time=datetime(year, 3, day, 9), end_time=datetime(year, 3, day, 17), description=f"{year}-{day}")
+        for year in (2021, 2022, 2025) for day in range(1, 11)
+    ])
+    manager.archive_years(2023)
+    manager.start_timer("New")
+    assert manager.suspend_timer()
+
+    # A new timer was never stored: nothing is decoded and no archive is read
+    restored = TimeEntryManager(storage)
+    assert restored.restore_timer() and restored.current_entry.description == "New"
+    assert restored._lazy is not None and restored._cold_years == {2021, 2022}
+    assert restored.entries == {}
+
+    # Neither does a reload after another process saved
+    TimeEntryManager(storage).add_manual_entry(TimeEntry(start_time=datetime(2025, 4, 1, 9), end_time=datetime(2025, 4, 1, 10)))
+    assert restored.reload_if_changed()
+    assert restored._lazy is not None and restored._cold_years == {2021, 2022}
+    assert restored.entries == {}
+
+    # A resumed entry only decodes its own day
+    resumed = TimeEntryManager(storage)
+    resumed.resume_entry(resumed.get_entries_for_date(date(2025, 3, 5))[0])
+    assert resumed.suspend_timer()
+    restored = TimeEntryManager(storage)
+    assert restored.restore_timer() and restored.current_entry.description == "2025-5"
+    assert restored._lazy is not None and restored._cold_years == {2021, 2022}
+    assert restored.get_entries_for_date(date(2025, 3, 5)) == []
+    restored.stop_timer()
+    assert [e.description for e in TimeEntryManager(storage).get_entries_for_date(date(2025, 3, 5))] == ["2025-5"]
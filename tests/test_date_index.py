@@ -0,0 +1,48 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from models.date_index import DateIndex, index_path
+from models.entry_manager import TimeEntryManager
+from models.time_entry import TimeEntry
+
+
+def _history():
+    entries = [
+        TimeEntry(start_time=datetime(2025, 3, 1) + timedelta(days=i, hours=9), end_time=datetime(2025, 3, 1) + timedelta(days=i, hours=17), description=f"Day {i}")
+        for i in range(30)
+    ]
+    # A week-long absence and a shift running past midnight
+    entries.append(TimeEntry(start_time=datetime(2025, 3, 10), end_time=datetime(2025, 3, 17), is_absence=True))
+    entries.append(TimeEntry(start_time=datetime(2025, 3, 20, 22), end_time=datetime(2025, 3, 21, 2), description="Night"))
+    return entries
+
+
+@pytest.mark.parametrize("name", ["timedata.json", "timedata.ttb"])
+def test_days_are_decoded_lazily_through_the_index(tmp_path, name):
+    storage = tmp_path / name
+    TimeEntryManager(storage).replace_entries(_history())
+    assert index_path(storage).exists()
+
+    mgr = TimeEntryManager(storage)
+    assert [e.description for e in mgr.get_entries_for_date(date(2025, 3, 5))] == ["Day 4"]
+    assert list(mgr.entries) == [date(2025, 3, 5)]
+
+    # Window queries reach back far enough for long and cross-midnight entries
+    assert mgr.get_total_time_for_date(date(2025, 3, 21)) == timedelta(hours=10)
+    assert mgr.get_total_time_for_date(date(2025, 3, 15)) == timedelta()
+    assert len(mgr.entries) < 30
+
+    # Changes load the whole store first, so saving keeps every day
+    mgr.add_manual_entry(TimeEntry(start_time=datetime(2025, 4, 1, 9), end_time=datetime(2025, 4, 1, 10)))
+    reloaded = TimeEntryManager(storage)
+    assert len(list(reloaded.iter_range(date.min, date.max))) == 33
+
+
+def test_stale_index_is_ignored(tmp_path):
+    storage = tmp_path / "timedata.json"
+    TimeEntryManager(storage).replace_entries(_history())
+    # Rewritten by something that does not maintain the index
+    storage.write_text('{"2025-05-01": [{"start_time": "2025-05-01T09:00:00", "end_time": "2025-05-01T10:00:00"}]}')
+    assert DateIndex.open(storage) is None
+    assert [e.date for e in TimeEntryManager(storage).iter_range(date.min, date.max)] == [date(2025, 5, 1)]
@@ -1,9 +1,12 @@
+import json
 import sys
 import os
 import tempfile
 from pathlib import Path
 from datetime import datetime, date
 
+import pytest
+
 # Ensure src is on path
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
 if ROOT not in sys.path:
@@ -62,3 +65,212 @@ def test_save_and_load_persistence():
         entries = mgr2.get_entries_for_date(d)
         assert len(entries) == 1
         assert entries[0].description == "Review"
+
+
+def test_identical_entries_are_addressed_by_id(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    start = datetime(2025, 11, 12, 9, 0, 0)
+    first = TimeEntry(start_time=start, end_time=start + timedelta(hours=1), description="Dup")
+    second = TimeEntry(start_time=start, end_time=start + timedelta(hours=1), description="Dup")
+    mgr.add_manual_entry(first)
+    mgr.add_manual_entry(second)
+    assert first.id != second.id
+
+    assert mgr.delete_entry(second) is second
+    remaining = mgr.get_entries_for_date(start.date())
+    assert remaining == [first]
+    assert mgr.get_entry(second.id) is None
+
+    # IDs survive a reload
+    mgr2 = TimeEntryManager(tmp_path / "data.json")
+    assert mgr2.get_entry(first.id).description == "Dup"
+
+
+def test_update_entry_keeps_id_and_moves_date(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    old = TimeEntry(start_time=datetime(2025, 11, 12, 9), end_time=datetime(2025, 11, 12, 10), description="Old")
+    mgr.add_manual_entry(old)
+
+    moved = TimeEntry(start_time=datetime(2025, 11, 13, 9), end_time=datetime(2025, 11, 13, 11), description="Moved")
+    mgr.update_entry(old, moved)
+
+    assert moved.id == old.id
+    assert mgr.get_entries_for_date(date(2025, 11, 12)) == []
+    assert mgr.get_entry(old.id).description == "Moved"
+
+
+def test_entries_stay_sorted_and_iter_range_is_chronological(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    mgr.add_manual_entry(create_entry(date(2025, 11, 12), 14, 1, "Late"))
+    mgr.add_manual_entry(create_entry(date(2025, 11, 10), 9, 1, "First day"))
+    mgr.add_manual_entry(create_entry(date(2025, 11, 12), 8, 1, "Early"))
+    mgr.add_manual_entry(create_entry(date(2025, 11, 20), 8, 1, "Outside"))
+
+    assert [e.description for e in mgr.get_entries_for_date(date(2025, 11, 12))] == ["Early", "Late"]
+    in_range = [e.description for e in mgr.iter_range(date(2025, 11, 10), date(2025, 11, 12))]
+    assert in_range == ["First day", "Early", "Late"]
+
+    # Moving an entry within its day re-sorts it
+    late = mgr.get_entries_for_date(date(2025, 11, 12))[1]
+    mgr.update_entry(late, create_entry(date(2025, 11, 12), 6, 1, "Earliest"))
+    assert [e.description for e in mgr.get_entries_for_date(date(2025, 11, 12))] == ["Earliest", "Early"]
+    assert mgr.get_entry(late.id).description == "Earliest"
+
+    mgr.delete_entry(mgr.get_entries_for_date(date(2025, 11, 10))[0])
+    assert [e.description for e in mgr.iter_range(date.min, date.max)] == ["Earliest", "Early", "Outside"]
+
+
+def test_entries_spanning_midnight_are_split_between_days(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    night = TimeEntry(start_time=datetime(2025, 11, 14, 22), end_time=datetime(2025, 11, 15, 2), description="Release")
+    mgr.add_manual_entry(night)
+    # Absence on the second day overlapping the spanning entry
+    mgr.add_manual_entry(TimeEntry(start_time=datetime(2025, 11, 15, 1), end_time=datetime(2025, 11, 15, 3), is_absence=True))
+
+    assert mgr.get_total_time_for_date(date(2025, 11, 14)) == timedelta(hours=2)
+    assert mgr.get_total_time_for_date(date(2025, 11, 15)) == timedelta(hours=1)
+
+    dates, _, matrix = mgr.generate_report(date(2025, 11, 14), date(2025, 11, 15))
+    assert matrix["Release"] == [2.0, 2.0]
+    assert matrix["🏖 Absence"] == [0.0, -2.0]
+
+
+def test_window_queries_cover_arbitrary_ranges(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    friday_late = TimeEntry(start_time=datetime(2025, 11, 14, 17), end_time=datetime(2025, 11, 14, 19), description="Fri")
+    saturday = TimeEntry(start_time=datetime(2025, 11, 15, 10), end_time=datetime(2025, 11, 15, 12), description="Sat")
+    monday = TimeEntry(start_time=datetime(2025, 11, 17, 7), end_time=datetime(2025, 11, 17, 9), description="Mon")
+    vacation = TimeEntry(start_time=datetime(2025, 11, 1), end_time=datetime(2025, 11, 30), is_absence=True)
+    for entry in (monday, saturday, vacation, friday_late):
+        mgr.add_manual_entry(entry)
+
+    window_start, window_end = datetime(2025, 11, 14, 18), datetime(2025, 11, 17, 8)
+    found = mgr.entries_between(window_start, window_end)
+    assert found == [vacation, friday_late, saturday, monday]
+
+    mgr.delete_entry(vacation)
+    assert mgr.get_total_time_between(window_start, window_end) == timedelta(hours=4)
+
+
+def test_archived_years_are_compressed_and_loaded_on_demand(tmp_path):
+    storage = tmp_path / "data.json"
+    mgr = TimeEntryManager(storage)
+    old = create_entry(date(2021, 3, 1), 9, 2, "Old")
+    # Crosses into 2022, so a window early in 2022 must still find it
+    new_year = TimeEntry(start_time=datetime(2021, 12, 31, 22), end_time=datetime(2022, 1, 1, 2), description="NYE")
+    recent = create_entry(date(2023, 5, 2), 9, 1, "Recent")
+    mgr.add_entries([old, new_year, recent])
+
+    assert mgr.archive_years(2023, "xz") == [2021]
+    assert (mgr.archive_dir / "2021.json.xz").exists()
+    assert "2021" not in storage.read_text()
+    assert mgr.get_entry(recent.id) is recent and len(mgr.entries) == 1
+
+    # A fresh manager only reads archives a query reaches into
+    mgr2 = TimeEntryManager(storage)
+    assert [e.description for e in mgr2.get_entries_for_date(date(2023, 5, 2))] == ["Recent"]
+    assert list(mgr2.entries) == [date(2023, 5, 2)]
+    assert mgr2.get_total_time_for_date(date(2022, 1, 1)) == timedelta(hours=2)
+    assert [e.description for e in mgr2.get_entries_for_date(date(2021, 3, 1))] == ["Old"]
+
+    # Changing an archived year rewrites its archive, not the main file
+    mgr2.delete_entry(mgr2.get_entry(old.id))
+    mgr3 = TimeEntryManager(storage)
+    assert [e.description for e in mgr3.iter_range(date.min, date.max)] == ["NYE", "Recent"]
+    assert "2021" not in storage.read_text()
+
+    # Replacing everything removes archives that end up empty
+    mgr3.replace_entries([recent])
+    assert not (mgr3.archive_dir / "2021.json.xz").exists()
+    assert [e.id for e in TimeEntryManager(storage).iter_range(date.min, date.max)] == [recent.id]
+
+
+def test_reports_are_cached_until_a_covered_day_changes(tmp_path):
+    mgr = TimeEntryManager(tmp_path / "data.json")
+    monday = create_entry(date(2025, 11, 10), 9, 2, "Dev")
+    mgr.add_manual_entry(monday)
+    week = (date(2025, 11, 10), date(2025, 11, 16))
+
+    first = mgr.generate_report(*week)
+    first[2]["Dev"][0] = 99.0  # callers get copies
+    assert mgr.generate_report(*week)[2]["Dev"][0] == 2.0
+    assert mgr.report_cache_stats() == {"hits": 1, "misses": 1, "cached": 1}
+
+    # A change outside the range keeps the cached report
+    mgr.add_manual_entry(create_entry(date(2025, 11, 20), 9, 1, "Later"))
+    mgr.generate_report(*week)
+    assert mgr.report_cache_stats()["hits"] == 2
+
+    # An entry spilling over midnight into the range invalidates it
+    mgr.add_manual_entry(TimeEntry(start_time=datetime(2025, 11, 9, 23), end_time=datetime(2025, 11, 10, 1), description="Ops"))
+    assert mgr.generate_report(*week)[2]["Ops"][0] == 1.0
+    mgr.update_entry(monday, TimeEntry(start_time=monday.start_time, end_time=monday.end_time, description="Review", id=monday.id))
+    assert "Dev" not in mgr.generate_report(*week)[1]
+    assert mgr.report_cache_stats()["misses"] == 3
+
+    mgr.clear_report_cache()
+    mgr.generate_report(*week)
+    assert mgr.report_cache_stats() == {"hits": 2, "misses": 4, "cached": 1}
+
+
+def test_unreadable_archive_is_kept_and_reported(tmp_path):
+    storage = tmp_path / "data.json"
+    mgr = TimeEntryManager(storage)
+    mgr.add_entries([create_entry(date(2021, 3, 1), 9, 2, "Old"), create_entry(date(2023, 5, 2), 9, 1, "Recent")])
+    mgr.archive_years(2023)
+    archive = mgr.archive_dir / "2021.json.gz"
+    archive.write_bytes(b"not gzip")
+
+    mgr2 = TimeEntryManager(storage)
+    with pytest.raises(RuntimeError, match="2021.json.gz"):
+        mgr2.get_entries_for_date(date(2021, 3, 1))
+    with pytest.raises(RuntimeError):
+        mgr2.add_manual_entry(create_entry(date(2021, 4, 1), 9, 1, "New"))
+    mgr2.add_manual_entry(create_entry(date(2023, 6, 1), 9, 1, "Later"))
+    assert archive.read_bytes() == b"not gzip"
+
+
+def test_store_copy_of_an_archived_year_is_ignored(tmp_path):
+    # A save interrupted after the archive was written but before the store was
+    # rewritten leaves the year in both; it must not load twice
+    storage = tmp_path / "data.json"
+    index = storage.with_name(storage.name + ".idx")
+    mgr = TimeEntryManager(storage)
+    old = create_entry(date(2021, 3, 1), 9, 2, "Old")
+    mgr.add_entries([old, create_entry(date(2023, 5, 2), 9, 1, "Recent")])
+    interrupted, interrupted_index, mtime_ns = storage.read_bytes(), index.read_bytes(), storage.stat().st_mtime_ns
+    mgr.archive_years(2023)
+    storage.write_bytes(interrupted)
+    index.write_bytes(interrupted_index)
+    os.utime(storage, ns=(mtime_ns, mtime_ns))
+
+    # Read through the date index, then by parsing the whole store
+    for _ in range(2):
+        mgr2 = TimeEntryManager(storage)
+        assert [e.id for e in mgr2.get_entries_for_date(date(2021, 3, 1))] == [old.id]
+        assert len(list(mgr2.iter_range(date.min, date.max))) == 2
+        index.unlink(missing_ok=True)
+
+
+def test_legacy_entries_keep_their_ids_across_loads(tmp_path):
+    storage = tmp_path / "data.json"
+    legacy = {"start_time": "2025-11-12T09:00:00", "end_time": "2025-11-12T10:00:00", "description": "Dup"}
+    storage.write_text(json.dumps({"2025-11-12": [legacy, legacy]}))
+
+    ids = [e.id for e in TimeEntryManager(storage).get_entries_for_date(date(2025, 11, 12))]
+    assert len(set(ids)) == 2
+    assert [e.id for e in TimeEntryManager(storage).get_entries_for_date(date(2025, 11, 12))] == ids
+    assert TimeEntryManager(storage).get_entry(ids[1]).description == "Dup"
+
+
+def test_update_entry_finds_entries_not_loaded_yet(tmp_path):
+    storage = tmp_path / "data.json"
+    mgr = TimeEntryManager(storage)
+    old = create_entry(date(2025, 11, 12), 9, 1, "Old")
+    mgr.add_entries([old, create_entry(date(2025, 11, 13), 9, 1, "Other")])
+
+    # Read through the date index: 2025-11-12 is not decoded yet
+    mgr2 = TimeEntryManager(storage)
+    mgr2.get_entries_for_date(date(2025, 11, 13))
+    mgr2.update_entry(old, create_entry(date(2025, 11, 12), 10, 1, "New"))
+    assert [e.description for e in TimeEntryManager(storage).get_entries_for_date(date(2025, 11, 12))] == ["New"]
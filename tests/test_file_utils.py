@@ -0,0 +1,54 @@
+import json
+
+import pytest
+
+from utils import file_utils
+from utils.file_utils import iter_time_entries, load_time_entries, save_time_entry
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    file_utils.clear_shard_cache()
+    yield
+    file_utils.clear_shard_cache()
+
+
+def _entry(day: str, description: str) -> dict:
+    return {'date': day, 'start_time': f'{day}T09:00:00', 'end_time': f'{day}T10:00:00', 'description': description}
+
+
+def test_append_keeps_shard_identical_to_full_rewrite(tmp_path):
+    entries = [_entry('2025-11-10', 'A'), _entry('2025-11-11', 'B'), _entry('2025-11-12', 'Ünïcode')]
+    for entry in entries:
+        save_time_entry(entry, tmp_path)
+
+    shard = tmp_path / '2025-11.json'
+    assert shard.read_text() == json.dumps(entries, indent=2)
+    assert load_time_entries(tmp_path) == entries
+
+
+def test_unchanged_shards_are_not_reparsed(tmp_path, monkeypatch):
+    save_time_entry(_entry('2025-10-01', 'Oct'), tmp_path)
+    save_time_entry(_entry('2025-11-01', 'Nov'), tmp_path)
+    assert len(load_time_entries(tmp_path)) == 2
+
+    def fail(*args, **kwargs):
+        raise AssertionError("shard was re-read")
+
+    monkeypatch.setattr(file_utils.json, 'load', fail)
+    assert [e['description'] for e in load_time_entries(tmp_path)] == ['Oct', 'Nov']
+    # Appending updates the cached shard without reading it back
+    save_time_entry(_entry('2025-11-02', 'Nov 2'), tmp_path)
+    assert [e['description'] for e in iter_time_entries(tmp_path)] == ['Oct', 'Nov', 'Nov 2']
+
+
+def test_modified_and_malformed_shards(tmp_path):
+    save_time_entry(_entry('2025-11-01', 'Nov'), tmp_path)
+    load_time_entries(tmp_path)
+
+    (tmp_path / '2025-11.json').write_text(json.dumps([_entry('2025-11-05', 'Edited elsewhere')]))
+    (tmp_path / '2025-12.json').write_text('{not json')
+    assert [e['description'] for e in load_time_entries(tmp_path)] == ['Edited elsewhere']
+
+    save_time_entry(_entry('2025-12-01', 'Dec'), tmp_path)
+    assert json.loads((tmp_path / '2025-12.json').read_text()) == [_entry('2025-12-01', 'Dec')]
@@ -0,0 +1,70 @@
+import io
+import json
+from datetime import date, datetime
+
+import pytest
+
+from main import main
+from models.entry_manager import TimeEntryManager
+from utils.import_utils import import_entries, iter_raw_rows, parse_record
+
+
+def test_parse_record_accepts_both_shapes():
+    store = parse_record({"start_time": "2025-11-10T09:00:00", "end_time": "2025-11-10T10:00:00", "id": "abc"})
+    web = parse_record({"Date": "2025-11-10", "Start": "09:00", "End": "10:00", "Absence": "yes"})
+    assert store.start_time == web.start_time == datetime(2025, 11, 10, 9)
+    assert store.id == "abc"
+    assert web.is_absence and not store.is_absence
+
+    # A webapp timer stopped after midnight ends on the next day
+    overnight = parse_record({"date": "2025-11-10", "start": "23:00", "end": "01:00"})
+    assert overnight.end_time == datetime(2025, 11, 11, 1)
+
+    with pytest.raises(ValueError):
+        parse_record({"date": "2025-11-10", "start": "10:00", "end": "10:00"})
+
+
+def test_import_batches_and_reports_rejects():
+    rows = ["start_time,end_time,description"]
+    rows += [f"2025-11-{d:02d}T09:00:00,2025-11-{d:02d}T10:00:00,Work" for d in range(1, 11)]
+    rows.insert(3, "not-a-date,2025-11-01T10:00:00,Broken")
+    batches = []
+    rejected = []
+
+    report = import_entries(
+        iter_raw_rows(io.StringIO("\n".join(rows)), "csv"),
+        lambda batch: batches.append(len(batch)),
+        batch_size=4,
+        on_reject=lambda line, record, error: rejected.append(line),
+    )
+
+    assert report.imported == 10 and report.rejected == 1
+    assert batches == [4, 4, 2]
+    assert rejected == [4]
+    assert report.errors[0][0] == 4
+
+
+def test_jsonl_reports_invalid_lines():
+    text = '{"date": "2025-11-10", "start": "09:00", "end": "10:00"}\n{oops\n\n[1]\n'
+    report = import_entries(iter_raw_rows(io.StringIO(text), "jsonl"), lambda batch: None)
+    assert report.imported == 1
+    assert [line for line, _ in report.errors] == [2, 4]
+
+
+def test_cli_import(tmp_path, capsys):
+    source = tmp_path / "history.jsonl"
+    source.write_text("\n".join(
+        json.dumps({"date": f"2025-11-{d:02d}", "start": "09:00", "end": "17:00", "description": "Work"})
+        for d in range(1, 31)
+    ) + "\n{}\n")
+    storage = tmp_path / "data.json"
+    rejects = tmp_path / "rejects.jsonl"
+
+    main(["--storage", str(storage), "--no-daemon", "import", str(source), "--batch-size", "7",
+          "--rejects", str(rejects)])
+
+    out = capsys.readouterr().out
+    assert "Imported 30 entries, rejected 1." in out
+    manager = TimeEntryManager(storage)
+    assert len(list(manager.iter_range(date(2025, 11, 1), date(2025, 11, 30)))) == 30
+    assert json.loads(rejects.read_text())["line"] == 31
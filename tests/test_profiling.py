@@ -0,0 +1,32 @@
+import io
+from datetime import datetime
+
+from main import main
+from models.entry_manager import TimeEntryManager
+from utils.profiling import RunProfiler
+
+
+def test_instrumentation_is_removed_after_run(tmp_path):
+    original = TimeEntryManager.__dict__["save_entries"]
+    profiler = RunProfiler()
+    profiler.instrument(TimeEntryManager)
+    assert TimeEntryManager.__dict__["save_entries"] is not original
+
+    TimeEntryManager(tmp_path / "data.json").save_entries()
+    profiler.stop()
+
+    assert TimeEntryManager.__dict__["save_entries"] is original
+    assert profiler.calls.calls["TimeEntryManager.save_entries"][0] == 1
+
+
+def test_cli_timings_report_phases(tmp_path, capsys):
+    storage = tmp_path / "data.json"
+    main(["--storage", str(storage), "--timings", "--profile", "cprofile",
+          "--profile-output", str(tmp_path / "out.prof"),
+          "add", "--start", "2025-11-10T09:00:00", "--end", "2025-11-10T10:00:00"])
+
+    err = capsys.readouterr().err
+    for phase in ("import", "storage resolution", "load", "command", "save (in command)"):
+        assert phase in err
+    assert "TimeEntryManager.save_entries" in err
+    assert (tmp_path / "out.prof").exists()
@@ -0,0 +1,77 @@
+import json
+import os
+
+import pytest
+
+from models.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_instances():
+    Settings.reset_instances()
+    yield
+    Settings.reset_instances()
+
+
+def test_instance_is_shared_per_config_file(tmp_path):
+    config = tmp_path / "config.json"
+    assert Settings.instance(config) is Settings.instance(config)
+    assert Settings.instance(config) is not Settings.instance(tmp_path / "other.json")
+
+
+def test_batch_writes_once_and_notifies_after_commit(tmp_path, monkeypatch):
+    settings = Settings(tmp_path / "config.json")
+    changes = []
+    settings.subscribe(lambda key, old, new: changes.append((key, old, new)))
+
+    writes = []
+    original_replace = os.replace
+    monkeypatch.setattr(os, "replace", lambda *a: (writes.append(a), original_replace(*a)))
+
+    with settings.batch():
+        settings.set("break_duration", 30)
+        settings.set("theme", "dark")
+        assert changes == []
+
+    assert len(writes) == 1
+    assert changes == [("break_duration", 60, 30), ("theme", None, "dark")]
+    assert json.loads(settings.config_file.read_text())["theme"] == "dark"
+
+
+def test_failed_batch_rolls_back(tmp_path):
+    settings = Settings(tmp_path / "config.json")
+    with pytest.raises(RuntimeError):
+        with settings.batch():
+            settings.set("break_duration", 15)
+            raise RuntimeError("boom")
+    assert settings.get("break_duration") == 60
+    assert json.loads(settings.config_file.read_text())["break_duration"] == 60
+
+
+def test_external_edits_are_reloaded_and_announced(tmp_path):
+    settings = Settings(tmp_path / "config.json")
+    seen = []
+    unsubscribe = settings.subscribe(lambda key, old, new: seen.append(new), key="work_hours")
+
+    data = json.loads(settings.config_file.read_text())
+    data["work_hours"] = {"start": "08:00", "end": "16:30"}
+    settings.config_file.write_text(json.dumps(data))
+
+    assert settings.get("work_hours") == {"start": "08:00", "end": "16:30"}
+    assert seen == [{"start": "08:00", "end": "16:30"}]
+
+    unsubscribe()
+    settings.set("work_hours", {"start": "10:00", "end": "18:00"})
+    assert len(seen) == 1
+
+
+def test_read_value_does_not_create_the_file(tmp_path):
+    config = tmp_path / "config.json"
+    assert Settings.read_value("storage_format", "json", config) == "json"
+    assert not config.exists()
+
+    config.write_text('{"storage_format": "binary"}')
+    assert Settings.read_value("storage_format", "json", config) == "binary"
+    config.write_text('{"storage_format": ')
+    with pytest.raises(ValueError):
+        Settings.read_value("storage_format", "json", config)
@@ -16,3 +16,14 @@ def test_duration_computation():
     entry = TimeEntry(start_time=start, end_time=end, description="Work")
     assert isinstance(entry.duration, timedelta)
     assert entry.duration == end - start
+
+
+def test_dict_round_trip_keeps_id():
+    entry = TimeEntry(start_time=datetime(2025, 11, 10, 9), end_time=datetime(2025, 11, 10, 10))
+    restored = TimeEntry.from_dict(entry.to_dict())
+    assert restored.id == entry.id
+    assert restored == entry
+
+    legacy = {'start_time': '2025-11-10T09:00:00', 'end_time': '2025-11-10T10:00:00'}
+    assert TimeEntry.from_dict(legacy).id == TimeEntry.from_dict(dict(legacy)).id
+    assert TimeEntry.from_dict(legacy).id != TimeEntry.from_dict(dict(legacy, description='Other')).id
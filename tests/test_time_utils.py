@@ -4,7 +4,12 @@ Test time calculations.
 
 from datetime import datetime, timedelta
 import pytest
-from src.utils.time_utils import calculate_weekly_hours, format_duration
+from src.utils.time_utils import (
+    aggregate_durations,
+    calculate_weekly_hours,
+    format_duration,
+    iter_period_totals,
+)
 
 
 def test_calculate_weekly_hours():
@@ -21,11 +26,47 @@ def test_calculate_weekly_hours():
     
     result = calculate_weekly_hours(entries)
     assert len(result) == 1
-    week_key = '2025-W45'  # Week number for Nov 10, 2025
+    week_key = '2025-W46'  # ISO week number for Nov 10, 2025
     assert week_key in result
     assert result[week_key] == timedelta(hours=16)
 
 
+def test_weekly_hours_use_iso_weeks_across_year_boundary():
+    entries = [
+        # Monday 2024-12-30 belongs to ISO week 1 of 2025
+        {'start_time': '2024-12-30T09:00:00', 'end_time': '2024-12-30T10:00:00'},
+        {'start_time': '2025-01-02T09:00:00', 'end_time': '2025-01-02T11:00:00'},
+    ]
+    assert calculate_weekly_hours(iter(entries)) == {'2025-W01': timedelta(hours=3)}
+
+
+def test_aggregate_durations_single_pass_over_generator():
+    def shard():
+        yield {'start_time': '2025-01-31T09:00:00', 'end_time': '2025-01-31T10:00:00', 'description': 'A'}
+        yield {'start_time': '2025-02-03T09:00:00', 'end_time': '2025-02-03T12:00:00', 'description': 'B'}
+        yield {'start_time': '2025-02-03T13:00:00', 'end_time': '2025-02-03T14:00:00', 'description': 'A',
+               'is_absence': True}
+
+    totals = aggregate_durations(shard(), ('day', 'month', 'description'), skip_absences=True)
+    assert totals['day'] == {'2025-01-31': timedelta(hours=1), '2025-02-03': timedelta(hours=3)}
+    assert totals['month'] == {'2025-01': timedelta(hours=1), '2025-02': timedelta(hours=3)}
+    assert totals['description'] == {'A': timedelta(hours=1), 'B': timedelta(hours=3)}
+
+
+def test_iter_period_totals_emits_incrementally():
+    entries = [
+        {'start_time': '2025-01-06T09:00:00', 'end_time': '2025-01-06T10:00:00'},
+        {'start_time': '2025-01-07T09:00:00', 'end_time': '2025-01-07T10:00:00'},
+        {'start_time': '2025-01-13T09:00:00', 'end_time': '2025-01-13T11:00:00'},
+    ]
+    totals = iter_period_totals(iter(entries), 'week')
+    assert next(totals) == ('2025-W02', timedelta(hours=2))
+    assert next(totals) == ('2025-W03', timedelta(hours=2))
+
+    with pytest.raises(ValueError):
+        list(iter_period_totals(reversed(entries), 'week'))
+
+
 def test_format_duration():
     duration = timedelta(hours=2, minutes=30, seconds=15)
     result = format_duration(duration)
@@ -1,13 +1,37 @@
 from pathlib import Path
 import os
+import csv
+import io
 import json
 import hashlib
-from datetime import timedelta
-from flask import Flask, send_from_directory, request, jsonify, render_template, session
+import queue
+import re
+import sys
+import threading
+import time
+import uuid
+import zipfile
+import click
+from bisect import bisect_left
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from collections import deque
+from functools import lru_cache
+from itertools import chain, groupby
+from xml.sax.saxutils import escape as xml_escape
+from flask import Flask, send_from_directory, request, jsonify, render_template, session, g, Response
+from werkzeug.exceptions import HTTPException
 from appdirs import user_data_dir
 import sqlite3
 from dotenv import load_dotenv
 
+# Imports are parsed by the CLI's code (the Docker image copies src/ to /src)
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from utils.import_utils import IMPORT_FORMATS, iter_raw_rows, parse_record  # noqa: E402
+
 # Load environment variables from .env file
 load_dotenv(dotenv_path=Path(__file__).parent.parent / '.env')
 
@@ -28,6 +52,9 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
 app.config['SESSION_COOKIE_NAME'] = 'timetracker_session'
 app.config['SESSION_REFRESH_EACH_REQUEST'] = True  # Refresh session on each request
 
+# Largest accepted request body in bytes (0 = no limit)
+app.config['MAX_CONTENT_LENGTH'] = int(os.getenv("MAX_CONTENT_LENGTH", str(16 * 1024 * 1024))) or None
+
 
 # Error handlers to ensure JSON responses instead of HTML
 @app.errorhandler(404)
@@ -35,21 +62,175 @@ def not_found(e):
     return jsonify({"error": "Not found"}), 404
 
 
+@app.errorhandler(413)
+def payload_too_large(e):
+    return jsonify({"error": "Request body too large"}), 413
+
+
 @app.errorhandler(500)
 def internal_error(e):
     return jsonify({"error": "Internal server error"}), 500
 
 
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+ROW_BUCKETS = (0, 10, 100, 1000, 10000, 100000, 1000000)
+
+# Statements slower than this many milliseconds are logged as warnings
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "250"))
+
+
+class Histogram:
+    """Bucketed observations, rendered cumulatively as Prometheus expects."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Thread-safe labelled counters and histograms with Prometheus text output."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # name -> (help text, type, {labels: float or Histogram})
+        self._metrics = {}
+
+    def _series(self, name, help_text, kind):
+        if name not in self._metrics:
+            self._metrics[name] = (help_text, kind, {})
+        return self._metrics[name][2]
+
+    def inc(self, name, help_text, labels=(), amount=1.0):
+        with self._lock:
+            series = self._series(name, help_text, "counter")
+            series[labels] = series.get(labels, 0.0) + amount
+
+    def observe(self, name, help_text, value, buckets, labels=()):
+        with self._lock:
+            series = self._series(name, help_text, "histogram")
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(buckets)
+            histogram.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._metrics = {}
+
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        rendered = []
+        for key, value in pairs:
+            value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+            rendered.append(f'{key}="{value}"')
+        return "{" + ",".join(rendered) + "}"
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self._metrics):
+                help_text, kind, series = self._metrics[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels in sorted(series, key=str):
+                    value = series[labels]
+                    if kind == "counter":
+                        lines.append(f"{name}{self._format_labels(labels)} {value:g}")
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(value.buckets + (None,), value.counts):
+                        cumulative += count
+                        le = "+Inf" if bound is None else f"{bound:g}"
+                        lines.append(f"{name}_bucket{self._format_labels(labels, [('le', le)])} {cumulative}")
+                    lines.append(f"{name}_sum{self._format_labels(labels)} {value.total:g}")
+                    lines.append(f"{name}_count{self._format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+
+METRICS = MetricsRegistry()
+
+
+def _record_query(sql: str, seconds: float):
+    words = sql.split(None, 1)
+    statement = words[0].upper() if words else "EMPTY"
+    METRICS.observe(
+        "timetracker_db_query_duration_seconds",
+        "SQLite statement execution time.",
+        seconds,
+        LATENCY_BUCKETS,
+        (("statement", statement),),
+    )
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        METRICS.inc(
+            "timetracker_db_slow_queries_total",
+            "Statements slower than SLOW_QUERY_MS.",
+            (("statement", statement),),
+        )
+        app.logger.warning("Slow query (%.1f ms): %s", seconds * 1000, " ".join(sql.split())[:200])
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that records how long each statement takes."""
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            _record_query(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            _record_query(sql, time.perf_counter() - start)
+
+
+class TimedConnection(sqlite3.Connection):
+    """Connection whose cursors, including the execute() shortcuts, are timed."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
 def get_db_path() -> Path:
     data_dir = Path(user_data_dir(APPNAME, APPAUTHOR))
     data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir / "web_data.db"
 
 
+def get_db_connection() -> sqlite3.Connection:
+    """Open the app database; every statement run on it feeds the query metrics."""
+    return sqlite3.connect(get_db_path(), factory=TimedConnection)
+
+
 def init_db():
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_db_connection()
     c = conn.cursor()
+    # Only takes effect on a new, empty database; run_maintenance converts older ones
+    c.execute("PRAGMA auto_vacuum = INCREMENTAL")
     
     # Check if old schema exists (entries table without user_id)
     c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='entries'")
@@ -90,6 +271,7 @@ def init_db():
                     end TEXT,
                     description TEXT,
                     is_absence INTEGER,
+                    entry_id TEXT,
                     FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
                 )
                 """
@@ -106,7 +288,7 @@ def init_db():
             
             for entry in old_entries:
                 c.execute(
-                    "INSERT INTO entries (user_id, date, start, end, description, is_absence) VALUES (?, ?, ?, ?, ?, ?)",
+                    "INSERT INTO entries (user_id, date, start, end, description, is_absence, entry_id) VALUES (?, ?, ?, ?, ?, ?, lower(hex(randomblob(16))))",
                     (legacy_user_id, *entry)
                 )
             
@@ -115,6 +297,11 @@ def init_db():
             
             print(f"Migration complete! {len(old_entries)} entries moved to 'legacy' user (PIN: 0000)")
             
+            conn.commit()
+        elif 'entry_id' not in columns:
+            # Entries predating stable IDs get one so clients can address them
+            c.execute("ALTER TABLE entries ADD COLUMN entry_id TEXT")
+            c.execute("UPDATE entries SET entry_id = lower(hex(randomblob(16))) WHERE entry_id IS NULL")
             conn.commit()
     else:
         # Fresh install - create tables
@@ -141,22 +328,730 @@ def init_db():
                 end TEXT,
                 description TEXT,
                 is_absence INTEGER,
+                entry_id TEXT,
                 FOREIGN KEY (user_id) REFERENCES users (id) ON DELETE CASCADE
             )
             """
         )
-        
-        # Create index for faster lookups
-        c.execute(
-            """
-            CREATE INDEX IF NOT EXISTS idx_entries_user_id ON entries(user_id)
-            """
+    
+    _ensure_entries_schema(c)
+    
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS maintenance_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            finished_at REAL NOT NULL,
+            archived INTEGER NOT NULL,
+            databases INTEGER NOT NULL
         )
+        """
+    )
     
     conn.commit()
     conn.close()
 
 
+def _ensure_entries_schema(c):
+    """Create the entries tables and indexes if missing (app database or a shard)."""
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            date TEXT,
+            start TEXT,
+            end TEXT,
+            description TEXT,
+            is_absence INTEGER,
+            entry_id TEXT
+        )
+        """
+    )
+    # Lookups by user alone use the (user_id, ...) indexes below; a separate
+    # user_id index only slowed every save down
+    c.execute("DROP INDEX IF EXISTS idx_entries_user_id")
+    # Ordered range scans for exports
+    c.execute("CREATE INDEX IF NOT EXISTS idx_entries_user_date ON entries(user_id, date, start)")
+    # Re-imports replace entries by ID
+    c.execute("CREATE INDEX IF NOT EXISTS idx_entries_user_entry ON entries(user_id, entry_id)")
+    
+    # Entries moved out of the hot table by run_maintenance
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entries_archive (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            date TEXT,
+            start TEXT,
+            end TEXT,
+            description TEXT,
+            is_absence INTEGER,
+            entry_id TEXT
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_entries_archive_user_date ON entries_archive(user_id, date, start)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_entries_archive_user_entry ON entries_archive(user_id, entry_id)")
+    
+    # Rows of large saves, parked here batch by batch while the body is read
+    # and moved into entries by the writer (see stage_save_rows)
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS entries_staging (
+            id INTEGER PRIMARY KEY,
+            save_id TEXT NOT NULL,
+            staged_at REAL NOT NULL,
+            user_id INTEGER NOT NULL,
+            date TEXT,
+            start TEXT,
+            end TEXT,
+            description TEXT,
+            is_absence INTEGER,
+            entry_id TEXT
+        )
+        """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_entries_staging_save ON entries_staging(save_id)")
+    
+    # Per-user data version, bumped on every save so other sessions can sync
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS data_versions (
+            user_id INTEGER PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+
+
+# ---------------------------------------------------------------------------
+# Entry database sharding
+# ---------------------------------------------------------------------------
+#
+# DB_SHARDS unset or "0" keeps everything in web_data.db. "user" gives every
+# user their own entries database; a number N spreads users over N bucket
+# databases. The users table always stays in web_data.db. Sharding lets
+# saves from different users commit in parallel instead of queueing behind
+# one SQLite write lock.
+
+_initialized_shards = set()
+_shards_lock = threading.Lock()
+
+
+def _shard_mode():
+    """Return None (no sharding), "user", or the number of buckets."""
+    value = os.getenv("DB_SHARDS", "").strip().lower()
+    if value in ("", "0", "off", "none"):
+        return None
+    if value == "user":
+        return "user"
+    try:
+        buckets = int(value)
+    except ValueError:
+        raise ValueError(f"DB_SHARDS must be 'user' or a number of buckets, not {value!r}") from None
+    if buckets < 0:
+        raise ValueError("DB_SHARDS must not be negative")
+    return buckets or None
+
+
+def get_shard_dir() -> Path:
+    return get_db_path().parent / "shards"
+
+
+def entries_db_path(user_id: int) -> Path:
+    """Path of the database holding ``user_id``'s entries."""
+    mode = _shard_mode()
+    if mode is None:
+        return get_db_path()
+    if mode == "user":
+        return get_shard_dir() / f"user-{user_id}.db"
+    return get_shard_dir() / f"bucket-{user_id % mode:04d}.db"
+
+
+def iter_entry_db_paths():
+    """Yield every database that holds entries in the current mode."""
+    if _shard_mode() is None:
+        yield get_db_path()
+        return
+    shard_dir = get_shard_dir()
+    if shard_dir.exists():
+        yield from sorted(shard_dir.glob("*.db"))
+
+
+def get_entries_connection(user_id: int) -> sqlite3.Connection:
+    """Open the database holding ``user_id``'s entries, creating a shard on first use."""
+    if _shard_mode() is None:
+        return get_db_connection()
+    path = entries_db_path(user_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, factory=TimedConnection, timeout=30)
+    with _shards_lock:
+        if path not in _initialized_shards:
+            # Incremental vacuum must be chosen before the first table exists;
+            # WAL lets readers (exports, event streams) run alongside a save
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")
+            _ensure_entries_schema(conn.cursor())
+            conn.commit()
+            _initialized_shards.add(path)
+    return conn
+
+
+def migrate_entries_to_shards() -> int:
+    """Move entries and data versions from web_data.db into the configured shards.
+
+    Returns the number of entries moved. Safe to re-run: a user's shard
+    rows are replaced before their web_data.db rows are deleted.
+    """
+    if _shard_mode() is None:
+        raise RuntimeError("Set DB_SHARDS before migrating entries to shards")
+    moved = 0
+    conn = get_db_connection()
+    try:
+        c = conn.cursor()
+        c.execute("SELECT DISTINCT user_id FROM entries")
+        for (user_id,) in c.fetchall():
+            c.execute(
+                "SELECT user_id, date, start, end, description, is_absence, entry_id FROM entries WHERE user_id = ?",
+                (user_id,),
+            )
+            rows = c.fetchall()
+            version = get_data_version(user_id, c)
+            shard = get_entries_connection(user_id)
+            try:
+                sc = shard.cursor()
+                sc.execute("DELETE FROM entries WHERE user_id = ?", (user_id,))
+                sc.executemany(
+                    "INSERT INTO entries (user_id, date, start, end, description, is_absence, entry_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                # Move the version forward so open clients reload
+                sc.execute(
+                    "INSERT INTO data_versions (user_id, version) VALUES (?, ?) "
+                    "ON CONFLICT(user_id) DO UPDATE SET version = MAX(version, excluded.version)",
+                    (user_id, version + 1),
+                )
+                shard.commit()
+            finally:
+                shard.close()
+            c.execute("DELETE FROM entries WHERE user_id = ?", (user_id,))
+            c.execute("DELETE FROM data_versions WHERE user_id = ?", (user_id,))
+            conn.commit()
+            moved += len(rows)
+    finally:
+        conn.close()
+    return moved
+
+
+@app.cli.command("shard-db")
+def shard_db_command():
+    """Move entries from web_data.db into the shards configured by DB_SHARDS."""
+    init_db()
+    moved = migrate_entries_to_shards()
+    print(f"Moved {moved} entries; {len(list(iter_entry_db_paths()))} shard database(s) in use.")
+
+
+# ---------------------------------------------------------------------------
+# Change notifications
+# ---------------------------------------------------------------------------
+
+# Seconds between keep-alives (and database re-checks, which pick up saves
+# made by other worker processes) on an event stream
+EVENTS_POLL_SECONDS = float(os.getenv("EVENTS_POLL_SECONDS", "15"))
+# Streams are closed after this long; EventSource reconnects on its own
+EVENTS_MAX_SECONDS = float(os.getenv("EVENTS_MAX_SECONDS", "30"))
+# Streams held open at once per process. Each one occupies a server thread,
+# so keep this below the thread count; further clients get the current
+# version right away and are told to reconnect after EVENTS_BUSY_RETRY_MS,
+# which turns them into pollers until a slot frees up.
+EVENTS_MAX_STREAMS = int(os.getenv("EVENTS_MAX_STREAMS", "8"))
+EVENTS_BUSY_RETRY_MS = int(os.getenv("EVENTS_BUSY_RETRY_MS", "30000"))
+_event_streams = threading.BoundedSemaphore(EVENTS_MAX_STREAMS) if EVENTS_MAX_STREAMS > 0 else None
+
+_data_changed = threading.Condition()
+_data_generation = 0  # bumped under _data_changed on every save in this process
+
+
+def bump_data_version(c, user_id: int) -> int:
+    """Increment a user's data version inside the caller's transaction."""
+    c.execute(
+        "INSERT INTO data_versions (user_id, version) VALUES (?, 1) "
+        "ON CONFLICT(user_id) DO UPDATE SET version = version + 1",
+        (user_id,),
+    )
+    c.execute("SELECT version FROM data_versions WHERE user_id = ?", (user_id,))
+    return c.fetchone()[0]
+
+
+def get_data_version(user_id: int, c=None) -> int:
+    if c is None:
+        conn = get_entries_connection(user_id)
+        try:
+            return get_data_version(user_id, conn.cursor())
+        finally:
+            conn.close()
+    c.execute("SELECT version FROM data_versions WHERE user_id = ?", (user_id,))
+    row = c.fetchone()
+    return row[0] if row else 0
+
+
+def notify_data_changed():
+    global _data_generation
+    with _data_changed:
+        _data_generation += 1
+        _data_changed.notify_all()
+
+
+# ---------------------------------------------------------------------------
+# Write queue
+# ---------------------------------------------------------------------------
+
+# Route saves through one writer thread per process (set SAVE_QUEUE=0 to
+# write from the request thread instead)
+SAVE_QUEUE = os.getenv("SAVE_QUEUE", "1") == "1"
+# How long a busy writer keeps collecting saves before committing a batch
+SAVE_BATCH_WINDOW_MS = float(os.getenv("SAVE_BATCH_WINDOW_MS", "5"))
+# How long a request waits for its batch to commit
+SAVE_TIMEOUT_SECONDS = float(os.getenv("SAVE_TIMEOUT_SECONDS", "30"))
+SAVE_BATCH_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+
+
+def write_user_entry_batches(c, user_id: int, batches) -> int:
+    """Replace a user's entries with ``batches`` (lists of rows) in the caller's transaction; returns the new version."""
+    c.execute("DELETE FROM entries WHERE user_id = ?", (user_id,))
+    for rows in batches:
+        c.executemany(
+            "INSERT INTO entries (user_id, date, start, end, description, is_absence, entry_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        drop_archived_copies(c, user_id, rows)
+    return bump_data_version(c, user_id)
+
+
+class StagedSave:
+    """A save whose rows were parked in entries_staging while its body was read."""
+
+    def __init__(self, save_id: str):
+        self.save_id = save_id
+
+
+def stage_save_rows(user_id: int, save_id: str, batches) -> int:
+    """Park ``batches`` (lists of entries-table rows) in the user's entries_staging table.
+
+    Each list is committed on its own, so the write lock is only held while
+    a list is inserted, never while the next one is still being read.
+    Returns the number of rows staged.
+    """
+    conn = get_entries_connection(user_id)
+    staged = 0
+    try:
+        for rows in batches:
+            staged_at = time.time()
+            conn.executemany(
+                f"INSERT INTO entries_staging (save_id, staged_at, {ENTRY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(save_id, staged_at, *row) for row in rows],
+            )
+            conn.commit()
+            staged += len(rows)
+    finally:
+        conn.close()
+    return staged
+
+
+def discard_staged_save(c, save):
+    """Delete the staged rows of ``save`` if it is a StagedSave."""
+    if isinstance(save, StagedSave):
+        c.execute("DELETE FROM entries_staging WHERE save_id = ?", (save.save_id,))
+
+
+def write_user_save(c, user_id: int, save) -> int:
+    """Replace a user's entries with ``save`` (lists of rows, or a StagedSave) in the caller's transaction; returns the new version."""
+    if not isinstance(save, StagedSave):
+        return write_user_entry_batches(c, user_id, save)
+    c.execute("DELETE FROM entries WHERE user_id = ?", (user_id,))
+    c.execute(
+        f"INSERT INTO entries ({ENTRY_COLUMNS}) SELECT {ENTRY_COLUMNS} FROM entries_staging WHERE save_id = ? ORDER BY id",
+        (save.save_id,),
+    )
+    c.execute("SELECT MAX(date) FROM entries_archive WHERE user_id = ?", (user_id,))
+    newest = c.fetchone()[0]
+    if newest is not None:
+        c.execute(
+            "DELETE FROM entries_archive WHERE user_id = ? AND entry_id IN "
+            "(SELECT entry_id FROM entries_staging WHERE save_id = ? AND date <= ?)",
+            (user_id, save.save_id, newest),
+        )
+    discard_staged_save(c, save)
+    return bump_data_version(c, user_id)
+
+
+class WriteQueue:
+    """Serializes saves through a single writer thread.
+
+    Saves queued while the writer is busy are committed together, one
+    transaction per entries database; when several are waiting, the writer
+    also collects those arriving within the batch window. A save that finds
+    the queue idle is committed without waiting. Because a save replaces the user's
+    whole list, only the newest of several queued saves by the same user
+    is written. Each caller gets a Future that resolves to the user's data
+    version once its batch commits, or to the error that failed its save;
+    a failing save is rolled back alone and the rest of the batch commits. Request threads therefore never wait
+    on each other's SQLite lock.
+    """
+
+    def __init__(self, window_ms: float = SAVE_BATCH_WINDOW_MS):
+        self.window = window_ms / 1000
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, user_id: int, save) -> Future:
+        """Queue ``save`` (lists of entries-table rows, or a StagedSave) for ``user_id``."""
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((user_id, save, future))
+        return future
+
+    def _ensure_thread(self):
+        # Started lazily so forking servers start it in each worker, not the master
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            # Saves that queued up during the previous commit join this batch.
+            # A lone save is committed at once; the window is only waited out
+            # when others are arriving too.
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            deadline = time.monotonic() + (self.window if len(batch) > 1 else 0)
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._commit(batch)
+            except Exception as ex:
+                # Nobody may be left waiting on a save the writer gave up on
+                app.logger.exception("Save batch failed")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(ex)
+
+    def _commit(self, batch):
+        METRICS.observe("timetracker_save_batch_size", "Saves committed per writer batch.", len(batch), SAVE_BATCH_BUCKETS)
+        # Newest save per user wins; every caller is answered with its result
+        latest = {}
+        superseded = {}
+        waiters = {}
+        for user_id, save, future in batch:
+            if user_id in latest:
+                superseded.setdefault(user_id, []).append(latest[user_id])
+            latest[user_id] = save
+            waiters.setdefault(user_id, []).append(future)
+        coalesced = len(batch) - len(latest)
+        if coalesced:
+            METRICS.inc("timetracker_saves_coalesced_total", "Saves superseded by a newer save in the same batch.", amount=coalesced)
+
+        by_database = {}
+        for user_id in latest:
+            by_database.setdefault(entries_db_path(user_id), []).append(user_id)
+
+        for user_ids in by_database.values():
+            conn = None
+            results = {}
+            try:
+                conn = get_entries_connection(user_ids[0])
+                c = conn.cursor()
+                c.execute("BEGIN")
+                # Each user is written inside a savepoint, so a failing save
+                # is rolled back alone and the others still commit
+                for user_id in user_ids:
+                    c.execute("SAVEPOINT user_save")
+                    try:
+                        for older in superseded.get(user_id, ()):
+                            discard_staged_save(c, older)
+                        results[user_id] = write_user_save(c, user_id, latest[user_id])
+                    except Exception as ex:
+                        c.execute("ROLLBACK TO user_save")
+                        results[user_id] = ex
+                    c.execute("RELEASE user_save")
+                conn.commit()
+            except Exception as ex:
+                if conn is not None:
+                    conn.rollback()
+                results = dict.fromkeys(user_ids, ex)
+            finally:
+                if conn is not None:
+                    conn.close()
+            for user_id, result in results.items():
+                for future in waiters[user_id]:
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        notify_data_changed()
+
+
+WRITE_QUEUE = WriteQueue()
+
+
+# ---------------------------------------------------------------------------
+# Save payloads
+# ---------------------------------------------------------------------------
+
+# Saves are validated into lists of this many rows. A save of one list is
+# handed to the writer as is; longer ones are staged list by list as the
+# body is read, so a worker never holds more than one list of rows.
+SAVE_BATCH_ROWS = int(os.getenv("SAVE_BATCH_ROWS", "1000"))
+# JSON bodies smaller than this are decoded in one go, which is faster;
+# larger ones are parsed as they are read
+SAVE_STREAM_MIN_BYTES = int(os.getenv("SAVE_STREAM_MIN_BYTES", str(1024 * 1024)))
+# Largest single entry (in characters of JSON) accepted in a save
+SAVE_MAX_ROW_CHARS = int(os.getenv("SAVE_MAX_ROW_CHARS", "65536"))
+SAVE_READ_CHUNK = 65536
+# Skipped entries listed in the response; the rest are only counted
+SAVE_MAX_ERRORS = 100
+# Saves allowed per user within the window (0 = unlimited)
+SAVE_RATE_LIMIT = int(os.getenv("SAVE_RATE_LIMIT", "60"))
+SAVE_RATE_WINDOW_SECONDS = float(os.getenv("SAVE_RATE_WINDOW_SECONDS", "60"))
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl")
+# Stored dates and times are compared as strings, so only these forms are accepted
+_SAVE_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_SAVE_TIME_RE = re.compile(r"([01]?\d|2[0-3]):[0-5]\d(:[0-5]\d)?")
+
+
+class _JSONStream:
+    """Incremental reader of JSON values from a text stream.
+
+    Only the unparsed tail of the body is buffered, so the reader itself
+    holds at most about one value; what happens to the values it yields is
+    up to the caller.
+    """
+
+    def __init__(self, stream, max_value_chars: int = SAVE_MAX_ROW_CHARS):
+        self.stream = stream
+        self.max_value_chars = max_value_chars
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        chunk = "" if self.eof else self.stream.read(SAVE_READ_CHUNK)
+        self.eof = not chunk
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return bool(chunk)
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at the end of the body)."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"expected '{char}' but found {found!r}" if found else f"expected '{char}' before end of body")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as exc:
+                if len(self.buffer) - self.pos > self.max_value_chars:
+                    raise ValueError(f"entry larger than {self.max_value_chars} characters")
+                if not self._fill():
+                    raise ValueError(f"invalid JSON: {exc.msg}")
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def array_items(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def iter_json_entries(stream, key: str = "entries"):
+    """Yield the items of a JSON body's ``key`` array (or of a bare array) one at a time.
+
+    Keys before ``key`` are skipped; anything after the array is not read.
+    """
+    reader = _JSONStream(stream)
+    if reader.peek() == "[":
+        yield from reader.array_items()
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        if not isinstance(name, str):
+            raise ValueError("expected an object key")
+        reader.expect(":")
+        if name == key:
+            yield from reader.array_items()
+            return
+        reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def parse_json_entries(data, key: str = "entries") -> list:
+    """Return the ``key`` array of a whole JSON body (or the body itself if it is an array)."""
+    try:
+        body = json.loads(data)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"invalid JSON: {exc.msg}")
+    entries = body.get(key, []) if isinstance(body, dict) else body
+    if not isinstance(entries, list):
+        raise ValueError(f"expected '{key}' to be an array")
+    return entries
+
+
+def iter_ndjson_entries(stream):
+    """Yield one JSON value per non-blank line."""
+    for line_no, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        if len(line) > SAVE_MAX_ROW_CHARS:
+            raise ValueError(f"line {line_no}: entry larger than {SAVE_MAX_ROW_CHARS} characters")
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"line {line_no}: invalid JSON: {exc.msg}")
+
+
+# Cached: a history repeats the same days and times over many entries
+@lru_cache(maxsize=4096)
+def _check_save_date(day: str):
+    if not _SAVE_DATE_RE.fullmatch(day):
+        raise ValueError(f"date must be YYYY-MM-DD, not {day!r}")
+    date.fromisoformat(day)
+
+
+@lru_cache(maxsize=4096)
+def _check_save_time(value: str):
+    if not _SAVE_TIME_RE.fullmatch(value):
+        raise ValueError(f"times must be H:MM or H:MM:SS, not {value!r}")
+
+
+def _save_row(user_id: int, entry) -> tuple:
+    """Validate one saved entry and return its entries-table row.
+
+    Only the shape is checked: entries the browser keeps (such as a timer
+    stopped after midnight, whose end is earlier than its start) are
+    stored as sent.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("expected a JSON object")
+    day, start, end = entry.get("date"), entry.get("start"), entry.get("end")
+    if not (isinstance(day, str) and isinstance(start, str) and isinstance(end, str)):
+        raise ValueError("date, start and end must be strings")
+    _check_save_date(day)
+    _check_save_time(start)
+    _check_save_time(end)
+    description = entry.get("description")
+    if description is not None and not isinstance(description, str):
+        raise ValueError("description must be a string")
+    entry_id = entry.get("id")
+    if entry_id is not None and not isinstance(entry_id, str):
+        raise ValueError("id must be a string")
+    return (user_id, day, start, end, description, 1 if entry.get("is_absence") else 0, entry_id or uuid.uuid4().hex)
+
+
+class SkippedEntries:
+    """Count of the entries a save skipped, with the first SAVE_MAX_ERRORS reasons."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = []
+
+    def add(self, position: int, message: str):
+        self.count += 1
+        if len(self.errors) < SAVE_MAX_ERRORS:
+            self.errors.append({"entry": position, "error": message})
+
+
+def iter_save_batches(user_id: int, entries, skipped: SkippedEntries, batch_size: int = SAVE_BATCH_ROWS):
+    """Validate ``entries`` into lists of at most ``batch_size`` rows, yielded as they fill.
+
+    Invalid entries are skipped and recorded in ``skipped`` by position
+    (counted from 1).
+    """
+    rows = []
+    for position, entry in enumerate(entries, 1):
+        try:
+            rows.append(_save_row(user_id, entry))
+        except (TypeError, ValueError) as exc:
+            skipped.add(position, str(exc))
+            continue
+        if len(rows) >= batch_size:
+            yield rows
+            rows = []
+    if rows:
+        yield rows
+
+
+class RateLimiter:
+    """Sliding-window limit of ``limit`` events per ``window`` seconds per key."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._events = {}
+        self._pruned_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def retry_after(self, key) -> float:
+        """Record an event for ``key``; returns 0 if allowed, else seconds until the next slot frees."""
+        if self.limit <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            events = self._events.setdefault(key, deque())
+            while events and events[0] <= now - self.window:
+                events.popleft()
+            if len(events) >= self.limit:
+                return events[0] + self.window - now
+            events.append(now)
+            # Forget users with no saves in the last window, once per window
+            if now - self._pruned_at > self.window:
+                self._events = {k: v for k, v in self._events.items() if v[-1] > now - self.window}
+                self._pruned_at = now
+            return 0.0
+
+
+SAVE_RATE_LIMITER = RateLimiter(SAVE_RATE_LIMIT, SAVE_RATE_WINDOW_SECONDS)
+
+
 def hash_pin(pin: str) -> str:
     """Hash a PIN using SHA-256"""
     return hashlib.sha256(pin.encode()).hexdigest()
@@ -164,8 +1059,7 @@ def hash_pin(pin: str) -> str:
 
 def verify_pin(username: str, pin: str) -> tuple[bool, int]:
     """Verify username and PIN. Returns (success, user_id)"""
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_db_connection()
     c = conn.cursor()
     
     pin_hash = hash_pin(pin)
@@ -180,8 +1074,7 @@ def verify_pin(username: str, pin: str) -> tuple[bool, int]:
 
 def create_user(username: str, pin: str) -> tuple[bool, str, int]:
     """Create a new user. Returns (success, message, user_id)"""
-    db_path = get_db_path()
-    conn = sqlite3.connect(db_path)
+    conn = get_db_connection()
     c = conn.cursor()
     
     try:
@@ -205,6 +1098,64 @@ def index():
     return render_template("index.html")
 
 
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def start_maintenance_scheduler():
+    if MAINTENANCE_INTERVAL_HOURS > 0:
+        MAINTENANCE.ensure_started()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+    # Label by route pattern, not raw path, to keep the label set bounded
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    labels = (("endpoint", endpoint), ("method", request.method))
+    METRICS.observe(
+        "timetracker_http_request_duration_seconds",
+        "Time spent handling requests.",
+        time.perf_counter() - started,
+        LATENCY_BUCKETS,
+        labels,
+    )
+    METRICS.inc(
+        "timetracker_http_requests_total",
+        "Requests handled, by status code.",
+        labels + (("status", response.status_code),),
+    )
+    METRICS.observe(
+        "timetracker_http_request_size_bytes",
+        "Request body sizes.",
+        request.content_length or 0,
+        SIZE_BUCKETS,
+        labels,
+    )
+    if not response.is_streamed:
+        METRICS.observe(
+            "timetracker_http_response_size_bytes",
+            "Response body sizes.",
+            response.calculate_content_length() or 0,
+            SIZE_BUCKETS,
+            labels,
+        )
+    return response
+
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text exposition; set METRICS_TOKEN to require a bearer token."""
+    token = os.getenv("METRICS_TOKEN")
+    if token and request.headers.get("Authorization") != f"Bearer {token}":
+        return jsonify({"error": "Not authenticated"}), 401
+    return Response(METRICS.render(), mimetype="text/plain; version=0.0.4")
+
+
 @app.after_request
 def add_header(response):
     """Add headers to disable caching for development"""
@@ -296,29 +1247,77 @@ def save_entries():
     if "user_id" not in session:
         return jsonify({"error": "Not authenticated"}), 401
     
+    user_id = session["user_id"]
+    retry_after = SAVE_RATE_LIMITER.retry_after(user_id)
+    if retry_after:
+        METRICS.inc("timetracker_save_rate_limited_total", "Saves rejected by the per-user rate limit.")
+        response = jsonify({"error": "Too many saves, try again later"})
+        response.headers["Retry-After"] = str(max(1, round(retry_after)))
+        return response, 429
+
+    # The body ({"entries": [...]}, a bare array, or NDJSON) is validated as
+    # it is read. A save of more than one batch is staged batch by batch, so
+    # neither worker memory nor the write lock depends on the upload.
+    skipped = SkippedEntries()
+    staged = None
     try:
-        data = request.get_json() or {}
-        entries = data.get("entries", [])
-        user_id = session["user_id"]
-        
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        
-        # Delete only this user's entries
-        c.execute("DELETE FROM entries WHERE user_id = ?", (user_id,))
-        
-        # Insert entries for this user
-        for e in entries:
-            c.execute(
-                "INSERT INTO entries (user_id, date, start, end, description, is_absence) VALUES (?, ?, ?, ?, ?, ?)",
-                (user_id, e.get("date"), e.get("start"), e.get("end"), e.get("description"), 1 if e.get("is_absence") else 0),
-            )
-        conn.commit()
-        conn.close()
-        return jsonify({"saved": len(entries)})
+        if request.mimetype in NDJSON_TYPES:
+            entries = iter_ndjson_entries(io.TextIOWrapper(request.stream, encoding="utf-8"))
+        elif request.content_length is not None and request.content_length < SAVE_STREAM_MIN_BYTES:
+            entries = parse_json_entries(request.get_data())
+        else:
+            entries = iter_json_entries(io.TextIOWrapper(request.stream, encoding="utf-8"))
+        batches = iter_save_batches(user_id, entries, skipped, SAVE_BATCH_ROWS)
+        first = next(batches, [])
+        second = next(batches, None)
+        if second is None:
+            save = [first]
+            saved = len(first)
+        else:
+            staged = StagedSave(uuid.uuid4().hex)
+            saved = stage_save_rows(user_id, staged.save_id, chain([first, second], batches))
+            save = staged
+    except Exception as ex:
+        # Nothing was written: unreadable bodies fail before the queue
+        if staged is not None:
+            _discard_staged(user_id, staged)
+        if isinstance(ex, HTTPException):
+            raise
+        if isinstance(ex, (ValueError, UnicodeDecodeError)):
+            return jsonify({"error": str(ex)}), 400
+        return jsonify({"error": str(ex)}), 500
+
+    try:
+        if SAVE_QUEUE:
+            version = WRITE_QUEUE.submit(user_id, save).result(timeout=SAVE_TIMEOUT_SECONDS)
+        else:
+            conn = get_entries_connection(user_id)
+            try:
+                version = write_user_save(conn.cursor(), user_id, save)
+                conn.commit()
+            finally:
+                conn.close()
+            notify_data_changed()
+    except TimeoutError:
+        # Still queued: the writer consumes or discards the staged rows
+        return jsonify({"error": f"save not committed within {SAVE_TIMEOUT_SECONDS:g}s"}), 500
     except Exception as ex:
+        if staged is not None:
+            _discard_staged(user_id, staged)
         return jsonify({"error": str(ex)}), 500
+    METRICS.observe("timetracker_save_rows", "Rows written per save_entries call.", saved, ROW_BUCKETS)
+    if skipped.count:
+        METRICS.inc("timetracker_save_rejected_rows_total", "Invalid entries skipped by save_entries.", amount=skipped.count)
+    return jsonify({"saved": saved, "rejected": skipped.count, "errors": skipped.errors, "version": version})
+
+
+def _discard_staged(user_id: int, staged: StagedSave):
+    conn = get_entries_connection(user_id)
+    try:
+        discard_staged_save(conn.cursor(), staged)
+        conn.commit()
+    finally:
+        conn.close()
 
 
 @app.route("/api/load_entries")
@@ -332,13 +1331,17 @@ def load_entries():
     
     try:
         user_id = session["user_id"]
-        db_path = get_db_path()
-        conn = sqlite3.connect(db_path)
+        include_archived = request.args.get("include_archived") == "1"
+        conn = get_entries_connection(user_id)
         c = conn.cursor()
         
         # Load only this user's entries
-        c.execute("SELECT date, start, end, description, is_absence FROM entries WHERE user_id = ?", (user_id,))
+        c.execute(
+            f"SELECT date, start, end, description, is_absence, entry_id FROM {entries_source(include_archived)} WHERE user_id = ?",
+            (user_id,),
+        )
         rows = c.fetchall()
+        version = get_data_version(user_id, c)
         conn.close()
         
         entries = []
@@ -349,12 +1352,782 @@ def load_entries():
                 "end": r[2],
                 "description": r[3],
                 "is_absence": bool(r[4]),
+                "id": r[5],
             })
-        return jsonify({"entries": entries})
+        return jsonify({"entries": entries, "version": version})
     except Exception as ex:
         return jsonify({"error": str(ex)}), 500
 
 
+@app.route("/api/events")
+def events():
+    """Server-Sent Events stream announcing new data versions for this user.
+
+    Pass the version the client already has as ``since`` (EventSource sends
+    it back as Last-Event-ID on reconnect); a ``version`` event is sent
+    whenever the stored version differs from the last one sent. When
+    EVENTS_MAX_STREAMS streams are already open, the response is closed
+    after the first check and the client polls instead.
+    """
+    if os.getenv("USE_SERVER_DB", "0") != "1":
+        return jsonify({"error": "server persistence disabled"}), 403
+
+    if "user_id" not in session:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    user_id = session["user_id"]
+    since = request.headers.get("Last-Event-ID") or request.args.get("since")
+    try:
+        last_sent = int(since) if since is not None else None
+    except ValueError:
+        last_sent = None
+
+    def stream():
+        slots = _event_streams
+        held = slots is not None and slots.acquire(blocking=False)
+        if not held:
+            METRICS.inc("timetracker_event_streams_busy_total", "Event streams answered once because all slots were taken.")
+        try:
+            sent = last_sent
+            deadline = time.monotonic() + (EVENTS_MAX_SECONDS if held else 0)
+            yield f"retry: {2000 if held else EVENTS_BUSY_RETRY_MS}\n\n"
+            while True:
+                with _data_changed:
+                    generation = _data_generation
+                version = get_data_version(user_id)
+                if version != sent:
+                    sent = version
+                    yield f"id: {version}\nevent: version\ndata: {json.dumps({'version': version})}\n\n"
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                with _data_changed:
+                    changed = _data_changed.wait_for(
+                        lambda: _data_generation != generation, min(EVENTS_POLL_SECONDS, remaining)
+                    )
+                if not changed:
+                    yield ": keep-alive\n\n"
+        finally:
+            if held:
+                slots.release()
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_KINDS = ("entries", "report")
+# Rows buffered before a chunk is sent to the client
+EXPORT_CHUNK_ROWS = 500
+MINUTES_PER_DAY = 24 * 60
+
+
+def _entry_hours(start, end) -> float:
+    """Hours from start to end (HH:MM strings), 0 if either is missing.
+
+    An end before the start is on the next day, like a timer stopped after
+    midnight.
+    """
+    try:
+        sh, sm = (int(x) for x in start.split(":")[:2])
+        eh, em = (int(x) for x in end.split(":")[:2])
+    except (AttributeError, ValueError):
+        return 0.0
+    return ((eh * 60 + em) - (sh * 60 + sm)) % MINUTES_PER_DAY / 60
+
+
+def _report_label(description, is_absence) -> str:
+    # Same labels as TimeEntryManager.generate_report
+    trimmed = (description or "").strip()
+    if is_absence:
+        return f"🏖 Absence: {trimmed}" if trimmed else "🏖 Absence"
+    return trimmed
+
+
+def _iter_user_entries(user_id: int, start: str, end: str, columns: str, include_archived: bool = False):
+    """Yield rows of one user's entries in [start, end], ordered by date and start, from a cursor."""
+    conn = get_entries_connection(user_id)
+    try:
+        c = conn.cursor()
+        c.execute(
+            f"SELECT {columns} FROM {entries_source(include_archived)} "
+            "WHERE user_id = ? AND date >= ? AND date <= ? ORDER BY date, start",
+            (user_id, start, end),
+        )
+        yield from c
+    finally:
+        conn.close()
+
+
+def iter_entry_rows(user_id: int, start: str, end: str, include_archived: bool = False):
+    """One row per entry."""
+    yield ("Date", "Start", "End", "Hours", "Description", "Absence", "ID")
+    for d, s, e, desc, is_absence, entry_id in _iter_user_entries(
+        user_id, start, end, "date, start, end, description, is_absence, entry_id", include_archived
+    ):
+        yield (d, s, e, round(_entry_hours(s, e), 2), desc or "", "yes" if is_absence else "", entry_id)
+
+
+def iter_report_rows(user_id: int, start: str, end: str, include_archived: bool = False):
+    """Pivot of hours per day (rows) and description (columns), absences negative.
+
+    Only the distinct descriptions are held in memory; days are streamed.
+    """
+    conn = get_entries_connection(user_id)
+    try:
+        c = conn.cursor()
+        c.execute(
+            f"SELECT DISTINCT description, is_absence FROM {entries_source(include_archived)} "
+            "WHERE user_id = ? AND date >= ? AND date <= ?",
+            (user_id, start, end),
+        )
+        labels = sorted({(_report_label(desc, is_abs), bool(is_abs)) for desc, is_abs in c.fetchall()})
+    finally:
+        conn.close()
+    columns = {key: i for i, key in enumerate(labels)}
+
+    yield ("Date", *(label for label, _ in labels), "Total")
+    rows = _iter_user_entries(user_id, start, end, "date, start, end, description, is_absence", include_archived)
+    for day, day_rows in groupby(rows, key=lambda row: row[0]):
+        hours = [0.0] * len(labels)
+        for _, s, e, desc, is_absence in day_rows:
+            sign = -1 if is_absence else 1
+            hours[columns[(_report_label(desc, is_absence), bool(is_absence))]] += sign * _entry_hours(s, e)
+        yield (day, *(round(h, 2) for h in hours), round(sum(hours), 2))
+
+
+def iter_csv(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(row)
+        # Send the header at once so the download starts immediately
+        if i == 1 or i % EXPORT_CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object that zipfile streams into."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="{sheet}" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_cell(value) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = xml_escape(_XML_ILLEGAL.sub("", str(value if value is not None else "")))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def iter_xlsx(rows, sheet: str = "Export"):
+    """Stream a single-sheet workbook with inline strings, one zip chunk at a time."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in _XLSX_PARTS.items():
+            zf.writestr(name, content.replace("{sheet}", xml_escape(sheet)))
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as part:
+            part.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            for i, row in enumerate(rows, 1):
+                part.write(f"<row>{''.join(_xlsx_cell(v) for v in row)}</row>".encode("utf-8"))
+                if i == 1 or i % EXPORT_CHUNK_ROWS == 0:
+                    yield sink.drain()
+            part.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+@app.route("/api/export")
+def export_entries():
+    """Stream the user's entries (kind=entries) or a pivot report (kind=report) as CSV or XLSX.
+
+    Optional ``start``/``end`` (YYYY-MM-DD) limit the range and
+    ``include_archived=1`` adds archived entries. Rows come straight from a
+    SQLite cursor, so memory use does not depend on the range.
+    """
+    if os.getenv("USE_SERVER_DB", "0") != "1":
+        return jsonify({"error": "server persistence disabled"}), 403
+
+    if "user_id" not in session:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    fmt = request.args.get("format", "csv")
+    kind = request.args.get("kind", "entries")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    if kind not in EXPORT_KINDS:
+        return jsonify({"error": f"kind must be one of {', '.join(EXPORT_KINDS)}"}), 400
+    try:
+        start = date.fromisoformat(request.args["start"]).isoformat() if request.args.get("start") else ""
+        end = date.fromisoformat(request.args["end"]).isoformat() if request.args.get("end") else ""
+    except ValueError:
+        return jsonify({"error": "start and end must be YYYY-MM-DD"}), 400
+
+    user_id = session["user_id"]
+    iter_rows = iter_entry_rows if kind == "entries" else iter_report_rows
+    include_archived = request.args.get("include_archived") == "1"
+    rows = iter_rows(user_id, start or "0000-01-01", end or "9999-12-31", include_archived)
+    body = iter_csv(rows) if fmt == "csv" else iter_xlsx(rows, sheet=kind.capitalize())
+    filename = f"timetracker_{kind}_{start or 'all'}_to_{end or 'all'}.{fmt}"
+    return Response(
+        body,
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+# Rejected rows listed in the response; the rest are only counted
+IMPORT_MAX_ERRORS = 100
+IMPORT_PROGRESS_EVERY = 100_000
+
+
+def _import_row(user_id: int, record: dict) -> tuple:
+    """Validate one imported record and return its entries-table row.
+
+    Rows in the webapp shape (date, start, end) are checked exactly like a
+    save, so an export imports back as it was, including timers stopped
+    after midnight. Rows in the CLI store shape (start_time, end_time) are
+    parsed by the CLI importer and may run past midnight, but not a day.
+    """
+    row = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+    if not (row.get("date") and row.get("start") and row.get("end")):
+        entry = parse_record(row)
+        if entry.end_time - entry.start_time >= timedelta(days=1):
+            raise ValueError("entries must be shorter than a day")
+        start, end = (
+            dt.strftime("%H:%M:%S" if dt.second else "%H:%M") for dt in (entry.start_time, entry.end_time)
+        )
+        row = {
+            "date": entry.start_time.date().isoformat(),
+            "start": start,
+            "end": end,
+            "description": entry.description,
+            "is_absence": entry.is_absence,
+            "id": entry.id,
+        }
+    absence = row.get("is_absence", row.get("absence"))
+    if not isinstance(absence, bool):
+        absence = str(absence or "").strip().lower() in ("1", "true", "yes", "y", "x")
+    return _save_row(user_id, {
+        "date": str(row["date"]).strip(),
+        "start": str(row["start"]).strip(),
+        "end": str(row["end"]).strip(),
+        "description": str(row.get("description") or "").strip(),
+        "is_absence": absence,
+        "id": str(row.get("id") or "").strip() or None,
+    })
+
+
+def _insert_import_batch(conn, user_id: int, rows: list):
+    """Insert one batch in its own transaction, replacing entries (hot or archived) with the same IDs."""
+    c = conn.cursor()
+    c.executemany(
+        "DELETE FROM entries WHERE user_id = ? AND entry_id = ?",
+        [(user_id, row[-1]) for row in rows],
+    )
+    c.executemany(
+        "INSERT INTO entries (user_id, date, start, end, description, is_absence, entry_id) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        rows,
+    )
+    drop_archived_copies(c, user_id, rows)
+    conn.commit()
+
+
+@app.route("/api/import", methods=["POST"])
+def import_entries():
+    """Append entries from a CSV or JSON-lines request body.
+
+    The body is read as a stream and inserted in batches of
+    IMPORT_BATCH_SIZE rows, one transaction each, so memory use does not
+    grow with the upload. Rows whose ``id`` already exists replace the
+    stored entry. The format comes from ``?format=`` or the Content-Type.
+    """
+    if os.getenv("USE_SERVER_DB", "0") != "1":
+        return jsonify({"error": "server persistence disabled"}), 403
+
+    if "user_id" not in session:
+        return jsonify({"error": "Not authenticated"}), 401
+
+    fmt = request.args.get("format")
+    if fmt is None:
+        fmt = "jsonl" if request.mimetype in ("application/x-ndjson", "application/jsonl", "application/json") else "csv"
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(IMPORT_FORMATS)}"}), 400
+
+    user_id = session["user_id"]
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8", newline="")
+    imported = rejected = 0
+    errors = []
+    batch = []
+    conn = get_entries_connection(user_id)
+    try:
+        for line, record, error in iter_raw_rows(stream, fmt):
+            if error is None:
+                try:
+                    batch.append(_import_row(user_id, record))
+                except (TypeError, ValueError) as exc:
+                    error = str(exc)
+            if error is not None:
+                rejected += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"line": line, "error": error})
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                _insert_import_batch(conn, user_id, batch)
+                imported += len(batch)
+                batch = []
+                if imported % IMPORT_PROGRESS_EVERY < IMPORT_BATCH_SIZE:
+                    app.logger.info("Import for user %s: %d rows imported, %d rejected", user_id, imported, rejected)
+        if batch:
+            _insert_import_batch(conn, user_id, batch)
+            imported += len(batch)
+        failure = None
+    except UnicodeDecodeError:
+        failure = "body must be UTF-8"
+    except csv.Error as ex:
+        failure = f"malformed CSV: {ex}"
+    finally:
+        # Batches committed before a failure stay imported, so announce them either way
+        version = None
+        if imported:
+            version = bump_data_version(conn.cursor(), user_id)
+            conn.commit()
+        conn.close()
+
+    if imported:
+        notify_data_changed()
+    METRICS.observe("timetracker_import_rows", "Rows imported per import call.", imported, ROW_BUCKETS)
+    result = {"imported": imported, "rejected": rejected, "errors": errors, "version": version}
+    if failure:
+        return jsonify({"error": failure, **result}), 400
+    return jsonify(result)
+
+
+# ---------------------------------------------------------------------------
+# Team reports
+# ---------------------------------------------------------------------------
+#
+# Per user, period and description totals across every user. Totals are
+# summed in SQL, including the work time overlapping each user's absences,
+# so report rows are streamed without loading entries into Python.
+
+# SQL grouping key per period; {col} is the entry date column
+TEAM_PERIODS = {
+    "day": "{col}",
+    "week": "date({col}, '-' || ((CAST(strftime('%w', {col}) AS INTEGER) + 6) % 7) || ' days')",
+    "month": "substr({col}, 1, 7)",
+    "year": "substr({col}, 1, 4)",
+}
+TEAM_TOTAL_LABEL = "Total worked"
+
+# Minutes since midnight of an HH:MM[:SS] column, like _entry_hours
+_SQL_MINUTES = "(CAST(substr({col}, 1, instr({col}, ':') - 1) AS INTEGER) * 60 + CAST(substr({col}, instr({col}, ':') + 1, 2) AS INTEGER))"
+
+
+def _sql_entry_minutes(alias: str) -> str:
+    """SQL for the duration in minutes of entries aliased ``alias``; an end before the start is on the next day."""
+    start = _SQL_MINUTES.format(col=f"{alias}.start")
+    end = _SQL_MINUTES.format(col=f'{alias}."end"')
+    return f"((({end} - {start}) % {MINUTES_PER_DAY} + {MINUTES_PER_DAY}) % {MINUTES_PER_DAY})"
+
+
+def _sql_entry_bounds(alias: str) -> tuple:
+    """SQL for the start and end minute of entries aliased ``alias``, counted from their day's midnight."""
+    start = _SQL_MINUTES.format(col=f"{alias}.start")
+    return start, f"({start} + {_sql_entry_minutes(alias)})"
+
+
+_SQL_ENTRY_MINUTES = _sql_entry_minutes("e")
+
+
+def _team_overlaps(c, source: str, period_sql: str, start: str, end: str) -> dict:
+    """{(user_id, period): hours of work overlapping the user's absences} for one database.
+
+    Each absence is paired with the work entries on its day and SQLite sums
+    the overlaps, so no entry rows reach Python.
+    """
+    work_start, work_end = _sql_entry_bounds("w")
+    absence_start, absence_end = _sql_entry_bounds("a")
+    # CROSS JOIN keeps absences (the few) as the outer loop, and "+a.date"
+    # stops SQLite from copying the date range onto w, so the inner lookup
+    # is an exact (user_id, date) index search
+    c.execute(
+        f"""
+        SELECT w.user_id, {period_sql.format(col='w.date')} AS period,
+               SUM(MAX(0, MIN({work_end}, {absence_end}) - MAX({work_start}, {absence_start}))) / 60.0
+        FROM {source} a
+        CROSS JOIN {source} w ON w.user_id = a.user_id AND w.date = +a.date AND w.is_absence = 0
+        WHERE a.is_absence = 1 AND a.date >= ? AND a.date <= ?
+        GROUP BY w.user_id, period
+        """,
+        (start, end),
+    )
+    return {(user_id, period): hours for user_id, period, hours in c}
+
+
+def iter_team_report_rows(start: str, end: str, period: str = "month", include_archived: bool = False):
+    """Rows of (user, period, description, hours) for every user, absences negative.
+
+    Each user and period ends with a TEAM_TOTAL_LABEL row: work hours minus
+    the work time overlapping that user's absences.
+    """
+    period_sql = TEAM_PERIODS[period]
+    conn = get_db_connection()
+    try:
+        usernames = dict(conn.execute("SELECT id, username FROM users"))
+    finally:
+        conn.close()
+
+    yield ("User", "Period", "Description", "Hours")
+    for path in iter_entry_db_paths():
+        conn = sqlite3.connect(path, factory=TimedConnection, timeout=30)
+        try:
+            c = conn.cursor()
+            source = entries_source(include_archived)
+            overlaps = _team_overlaps(c, source, period_sql, start, end)
+            c.execute(
+                f"""
+                SELECT e.user_id, {period_sql.format(col='e.date')} AS period,
+                       TRIM(COALESCE(e.description, '')) AS label, e.is_absence,
+                       SUM({_SQL_ENTRY_MINUTES}) / 60.0
+                FROM {source} e
+                WHERE e.date >= ? AND e.date <= ?
+                GROUP BY e.user_id, period, label, e.is_absence
+                ORDER BY e.user_id, period, e.is_absence, label
+                """,
+                (start, end),
+            )
+            for (user_id, period_key), group in groupby(c, key=lambda row: row[:2]):
+                user = usernames.get(user_id, f"user {user_id}")
+                worked = 0.0
+                for _, _, label, is_absence, hours in group:
+                    if is_absence:
+                        yield (user, period_key, _report_label(label, True), -round(hours, 2))
+                    else:
+                        worked += hours
+                        yield (user, period_key, label, round(hours, 2))
+                yield (user, period_key, TEAM_TOTAL_LABEL, round(worked - overlaps.get((user_id, period_key), 0), 2))
+        finally:
+            conn.close()
+
+
+def _is_admin() -> bool:
+    """Admins send the ADMIN_TOKEN bearer token or are logged in as one of ADMIN_USER_IDS.
+
+    Admins are listed by user ID rather than name: names are claimed by
+    whoever registers them first.
+    """
+    token = os.getenv("ADMIN_TOKEN")
+    if token and request.headers.get("Authorization") == f"Bearer {token}":
+        return True
+    admins = {part.strip() for part in os.getenv("ADMIN_USER_IDS", "").split(",") if part.strip()}
+    return "user_id" in session and str(session["user_id"]) in admins
+
+
+def _team_report_args(args) -> tuple:
+    """Validate start/end/period (from request args or CLI options); raises ValueError."""
+    period = args.get("period") or "month"
+    if period not in TEAM_PERIODS:
+        raise ValueError(f"period must be one of {', '.join(TEAM_PERIODS)}")
+    try:
+        start = date.fromisoformat(args["start"]).isoformat() if args.get("start") else "0000-01-01"
+        end = date.fromisoformat(args["end"]).isoformat() if args.get("end") else "9999-12-31"
+    except ValueError:
+        raise ValueError("start and end must be YYYY-MM-DD") from None
+    return start, end, period
+
+
+@app.route("/api/admin/team_report")
+def team_report():
+    """Stream per user, period and description totals for all users as CSV or XLSX (admins only)."""
+    if os.getenv("USE_SERVER_DB", "0") != "1":
+        return jsonify({"error": "server persistence disabled"}), 403
+
+    if not _is_admin():
+        return jsonify({"error": "Admin access required"}), 403
+
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    try:
+        start, end, period = _team_report_args(request.args)
+    except ValueError as ex:
+        return jsonify({"error": str(ex)}), 400
+
+    rows = iter_team_report_rows(start, end, period, request.args.get("include_archived") == "1")
+    body = iter_csv(rows) if fmt == "csv" else iter_xlsx(rows, sheet="Team")
+    filename = f"timetracker_team_{period}_{request.args.get('start') or 'all'}_to_{request.args.get('end') or 'all'}.{fmt}"
+    return Response(
+        body,
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@app.cli.command("team-report")
+@click.option("--start", help="First day (YYYY-MM-DD).")
+@click.option("--end", help="Last day (YYYY-MM-DD).")
+@click.option("--period", type=click.Choice(list(TEAM_PERIODS)), default="month", show_default=True)
+@click.option("--include-archived", is_flag=True, help="Include archived entries.")
+@click.option("--output", type=click.File("w", encoding="utf-8"), default="-", help="CSV file to write (default: stdout).")
+def team_report_command(start, end, period, include_archived, output):
+    """Write per user, period and description totals for all users as CSV."""
+    init_db()
+    try:
+        start, end, period = _team_report_args({"start": start, "end": end, "period": period})
+    except ValueError as ex:
+        raise click.BadParameter(str(ex))
+    for chunk in iter_csv(iter_team_report_rows(start, end, period, include_archived)):
+        output.write(chunk)
+
+
+# ---------------------------------------------------------------------------
+# Maintenance and archival
+# ---------------------------------------------------------------------------
+#
+# Entries dated more than ARCHIVE_AFTER_DAYS ago are moved to the
+# entries_archive table of their database. Saves, event streams and plain
+# loads only read the hot entries table; loads and exports include the
+# archive when asked with include_archived=1.
+
+# Archive entries older than this many days (0 keeps everything hot)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "0"))
+# Run maintenance in the background this often (0 leaves it to the maintain-db command)
+MAINTENANCE_INTERVAL_HOURS = float(os.getenv("MAINTENANCE_INTERVAL_HOURS", "0"))
+# Staged save rows older than this were left by a worker that died mid-save
+STAGED_SAVE_MAX_AGE_SECONDS = 24 * 3600
+# Free pages handed back to the filesystem per database and run
+VACUUM_PAGES = int(os.getenv("VACUUM_PAGES", "1000"))
+
+ENTRY_COLUMNS = "user_id, date, start, end, description, is_absence, entry_id"
+
+
+def entries_source(include_archived: bool) -> str:
+    """FROM clause for entries, optionally including archived ones."""
+    if not include_archived:
+        return "entries"
+    return f"(SELECT {ENTRY_COLUMNS} FROM entries UNION ALL SELECT {ENTRY_COLUMNS} FROM entries_archive)"
+
+
+def drop_archived_copies(c, user_id: int, rows: list):
+    """Delete archived entries that ``rows`` (entries-table tuples) bring back into the hot table.
+
+    Only rows dated on or before the user's newest archived entry can
+    collide, so ordinary saves of recent data skip the lookups.
+    """
+    c.execute("SELECT MAX(date) FROM entries_archive WHERE user_id = ?", (user_id,))
+    newest = c.fetchone()[0]
+    if newest is None:
+        return
+    c.executemany(
+        "DELETE FROM entries_archive WHERE user_id = ? AND entry_id = ?",
+        [(user_id, row[6]) for row in rows if row[1] is not None and row[1] <= newest],
+    )
+
+
+def archive_old_entries(c, cutoff: str) -> dict:
+    """Move entries dated before ``cutoff`` into entries_archive in the caller's transaction.
+
+    Returns {user_id: entries moved}. Each affected user's data version is
+    bumped so open sessions reload without the archived entries.
+    """
+    c.execute("SELECT user_id, COUNT(*) FROM entries WHERE date < ? GROUP BY user_id", (cutoff,))
+    moved = dict(c.fetchall())
+    if not moved:
+        return moved
+    c.execute(
+        "DELETE FROM entries_archive WHERE (user_id, entry_id) IN "
+        "(SELECT user_id, entry_id FROM entries WHERE date < ?)",
+        (cutoff,),
+    )
+    c.execute(
+        f"INSERT INTO entries_archive ({ENTRY_COLUMNS}) SELECT {ENTRY_COLUMNS} FROM entries WHERE date < ?",
+        (cutoff,),
+    )
+    c.execute("DELETE FROM entries WHERE date < ?", (cutoff,))
+    for user_id in moved:
+        bump_data_version(c, user_id)
+    return moved
+
+
+def _vacuum(conn) -> str:
+    """Return free pages to the filesystem; returns "full" or "incremental"."""
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        # Databases created before incremental mode need one full VACUUM to switch
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return "full"
+    conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES})").fetchall()
+    return "incremental"
+
+
+def run_maintenance(archive_after_days: int = None) -> dict:
+    """Archive old entries, drop abandoned staged saves, reclaim free pages and refresh planner statistics in every database."""
+    days = ARCHIVE_AFTER_DAYS if archive_after_days is None else archive_after_days
+    cutoff = (date.today() - timedelta(days=days)).isoformat() if days > 0 else None
+    archived = 0
+    paths = list(dict.fromkeys([get_db_path(), *iter_entry_db_paths()]))
+    for path in paths:
+        conn = sqlite3.connect(path, factory=TimedConnection, timeout=30)
+        try:
+            c = conn.cursor()
+            _ensure_entries_schema(c)
+            c.execute("DELETE FROM entries_staging WHERE staged_at < ?", (time.time() - STAGED_SAVE_MAX_AGE_SECONDS,))
+            if cutoff:
+                archived += sum(archive_old_entries(c, cutoff).values())
+            conn.commit()
+            _vacuum(conn)
+            conn.execute("ANALYZE")
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+        finally:
+            conn.close()
+    if archived:
+        notify_data_changed()
+
+    conn = get_db_connection()
+    try:
+        conn.execute(
+            "INSERT INTO maintenance_runs (finished_at, archived, databases) VALUES (?, ?, ?)",
+            (time.time(), archived, len(paths)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    METRICS.inc("timetracker_archived_entries_total", "Entries moved to the archive by maintenance.", amount=archived)
+    app.logger.info("Maintenance: archived %d entries across %d database(s)", archived, len(paths))
+    return {"archived": archived, "databases": len(paths), "cutoff": cutoff}
+
+
+def last_maintenance_time() -> float:
+    conn = get_db_connection()
+    try:
+        row = conn.execute("SELECT MAX(finished_at) FROM maintenance_runs").fetchone()
+    finally:
+        conn.close()
+    return row[0] or 0.0
+
+
+class MaintenanceScheduler:
+    """Runs run_maintenance every ``interval_hours`` on a daemon thread.
+
+    The last run is read from the database, so several worker processes
+    (and restarts) share one schedule instead of each running on their own.
+    """
+
+    def __init__(self, interval_hours: float = MAINTENANCE_INTERVAL_HOURS):
+        self.interval = interval_hours * 3600
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        # Started lazily so forking servers start it in each worker, not the master
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-maintenance", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                wait = last_maintenance_time() + self.interval - time.time()
+                if wait <= 0:
+                    run_maintenance()
+                    wait = self.interval
+            except Exception:
+                app.logger.exception("Database maintenance failed")
+                wait = self.interval
+            time.sleep(wait)
+
+
+MAINTENANCE = MaintenanceScheduler()
+
+
+@app.cli.command("maintain-db")
+@click.option("--archive-after-days", type=int, default=None,
+              help="Archive entries older than this many days (defaults to ARCHIVE_AFTER_DAYS; 0 disables).")
+def maintain_db_command(archive_after_days):
+    """Archive old entries, vacuum and refresh statistics in every database."""
+    init_db()
+    result = run_maintenance(archive_after_days)
+    print(
+        f"Archived {result['archived']} entries dated before {result['cutoff'] or '(archiving off)'}; "
+        f"maintained {result['databases']} database(s)."
+    )
+
+
 if __name__ == "__main__":
     init_db()
     app.run(host="0.0.0.0", port=int(os.getenv("PORT", 5000)), debug=True)
@@ -0,0 +1,98 @@
+// Per-day hour totals, shared by the page (fallback) and aggregate_worker.js.
+// Loaded with a <script> tag on the page and with importScripts() in the worker.
+(function (root) {
+    const HOUR_MS = 1000 * 60 * 60;
+
+    // Start/end of an entry in epoch milliseconds, or null if incomplete
+    function entryBounds(entry) {
+        if (entry.start_iso && entry.end_iso) {
+            return [new Date(entry.start_iso).getTime(), new Date(entry.end_iso).getTime()];
+        }
+        if (entry.date && entry.start && entry.end) {
+            const start = new Date(`${entry.date}T${entry.start}`).getTime();
+            let end = new Date(`${entry.date}T${entry.end}`).getTime();
+            // An end before the start is on the next day (a timer stopped after midnight)
+            if (end < start) end += 24 * HOUR_MS;
+            return [start, end];
+        }
+        return null;
+    }
+
+    // Work hours of one day's records, minus time overlapping that day's absences
+    function dayHours(records) {
+        const absences = records.filter(r => r.is_absence);
+        let total = 0;
+        records.forEach(work => {
+            if (work.is_absence) return;
+            let duration = work.end - work.start;
+            absences.forEach(absence => {
+                const overlap = Math.min(work.end, absence.end) - Math.max(work.start, absence.start);
+                if (overlap > 0) duration -= overlap;
+            });
+            total += duration;
+        });
+        return total / HOUR_MS;
+    }
+
+    // Incrementally maintained per-day totals. Entries are parsed once when
+    // they are added; a change only recomputes the days it touches.
+    class DayTotals {
+        constructor() {
+            this.records = new Map();   // id -> { date, start, end, is_absence }
+            this.byDate = new Map();    // date -> Set of ids
+            this.totals = new Map();    // date -> hours (absent when stale)
+        }
+
+        reset(entries) {
+            this.records.clear();
+            this.byDate.clear();
+            this.totals.clear();
+            entries.forEach(entry => this.put(entry));
+        }
+
+        put(entry) {
+            this.remove(entry.id);
+            const bounds = entryBounds(entry);
+            if (!entry.date || !bounds) return;
+            this.records.set(entry.id, {
+                date: entry.date,
+                start: bounds[0],
+                end: bounds[1],
+                is_absence: !!entry.is_absence,
+            });
+            if (!this.byDate.has(entry.date)) this.byDate.set(entry.date, new Set());
+            this.byDate.get(entry.date).add(entry.id);
+            this.totals.delete(entry.date);
+        }
+
+        remove(id) {
+            const record = this.records.get(id);
+            if (!record) return;
+            this.records.delete(id);
+            const ids = this.byDate.get(record.date);
+            ids.delete(id);
+            if (ids.size === 0) this.byDate.delete(record.date);
+            this.totals.delete(record.date);
+        }
+
+        hoursFor(date) {
+            if (!this.totals.has(date)) {
+                const ids = this.byDate.get(date);
+                this.totals.set(date, ids ? dayHours([...ids].map(id => this.records.get(id))) : 0);
+            }
+            return this.totals.get(date);
+        }
+
+        // { date: hours } for the given dates, omitting days without time
+        totalsFor(dates) {
+            const result = {};
+            dates.forEach(date => {
+                const hours = this.hoursFor(date);
+                if (hours) result[date] = hours;
+            });
+            return result;
+        }
+    }
+
+    root.TimeAggregate = { entryBounds, dayHours, DayTotals };
+})(self);
@@ -0,0 +1,25 @@
+// Keeps per-day totals off the main thread. The page mirrors entry changes
+// here ('reset', 'put', 'delete') and asks for the days it shows ('totals').
+importScripts('/static/aggregate.js');
+
+const dayTotals = new TimeAggregate.DayTotals();
+
+self.onmessage = (event) => {
+    const msg = event.data;
+    switch (msg.type) {
+        case 'reset':
+            dayTotals.reset(msg.entries);
+            break;
+        case 'put':
+            dayTotals.put(msg.entry);
+            break;
+        case 'delete':
+            dayTotals.remove(msg.id);
+            break;
+        case 'totals':
+            self.postMessage({ type: 'totals', requestId: msg.requestId, hours: dayTotals.totalsFor(msg.dates) });
+            break;
+        default:
+            console.warn('[AggregateWorker] unknown message', msg.type);
+    }
+};
@@ -50,12 +50,25 @@
     // Keys
     const ENTRIES_KEY = 'timetracker_entries';
     const RUNNING_KEY = 'timetracker_running';
+    const SYNC_PENDING_KEY = 'timetracker_sync_pending';
 
     // Authentication state
     let isAuthenticated = false;
     let currentUsername = null;
     let serverDbEnabled = false;
-    let autoSyncInterval = null;
+
+    // Sync state
+    const SYNC_DEBOUNCE_MS = 2000;
+    const SYNC_RETRY_MAX_MS = 60000;
+    // Browsers refuse keepalive requests with larger bodies
+    const SYNC_KEEPALIVE_MAX_BYTES = 60000;
+    let syncTimer = null;
+    let syncPending = false;
+    let syncInFlight = null;  // promise of the upload in progress
+    let syncEdits = 0;
+    let syncFailures = 0;
+    let dataVersion = 0;
+    let eventSource = null;
 
     // Calendar state
     let currentCalendarDate = new Date();
@@ -74,12 +87,7 @@
                 const pingResp = await fetch('/api/ping');
                 const pingData = await pingResp.json();
                 serverDbEnabled = pingData.server_db_enabled;
-                if (serverDbEnabled) {
-                    // Load data from server on startup
-                    await loadFromServer();
-                    // Start auto-sync every 30 seconds
-                    startAutoSync();
-                }
+                if (serverDbEnabled) await startServerSync();
             } else {
                 showAuthModal();
             }
@@ -88,45 +96,151 @@
         }
     }
 
-    function startAutoSync() {
-        if (autoSyncInterval) clearInterval(autoSyncInterval);
-        // Auto-sync every 30 seconds
-        autoSyncInterval = setInterval(() => {
-            if (isAuthenticated && serverDbEnabled) {
-                saveToServer(true); // silent save
+    // Local changes are uploaded SYNC_DEBOUNCE_MS after the last mutation,
+    // and right away when the tab is hidden or the page is closed.
+    // Saves from other sessions are announced on the /api/events stream,
+    // which is closed while the tab is hidden.
+    function syncActive() {
+        return isAuthenticated && serverDbEnabled;
+    }
+
+    function setSyncPending(pending) {
+        syncPending = pending;
+        // Kept across reloads (per user) so edits the page could not upload
+        // before it closed are sent on the next visit
+        if (pending) localStorage.setItem(SYNC_PENDING_KEY, currentUsername);
+        else localStorage.removeItem(SYNC_PENDING_KEY);
+    }
+
+    function scheduleSync() {
+        if (!syncActive()) return;
+        syncEdits++;
+        setSyncPending(true);
+        clearTimeout(syncTimer);
+        syncTimer = setTimeout(flushSync, SYNC_DEBOUNCE_MS);
+    }
+
+    // Uploads pending changes. The pending flag is only cleared once the
+    // server has stored them; failed uploads are retried with exponential
+    // backoff (or after the server's Retry-After).
+    function flushSync() {
+        clearTimeout(syncTimer);
+        syncTimer = null;
+        if (syncInFlight) return syncInFlight;
+        if (!syncPending || !syncActive()) return Promise.resolve();
+        const edits = syncEdits;
+        syncInFlight = saveToServer(true).then((result) => {
+            syncInFlight = null;
+            if (result.ok) {
+                syncFailures = 0;
+                // Edits made while uploading go out with the next save
+                if (syncEdits === edits) setSyncPending(false);
+                else scheduleSync();
+            } else if (syncActive()) {
+                syncFailures++;
+                const delay = result.retryAfterMs || Math.min(SYNC_RETRY_MAX_MS, SYNC_DEBOUNCE_MS * 2 ** syncFailures);
+                syncTimer = setTimeout(flushSync, delay);
             }
-        }, 30000);
+        });
+        return syncInFlight;
+    }
+
+    // Pushes this user's changes left from an earlier visit before pulling
+    // the server's copy, which would otherwise replace them
+    async function startServerSync() {
+        setSyncPending(localStorage.getItem(SYNC_PENDING_KEY) === currentUsername);
+        if (syncPending) await flushSync();
+        if (!syncPending) await loadFromServer();
+        startAutoSync();
+    }
+
+    function startAutoSync() {
+        if (eventSource) eventSource.close();
+        eventSource = null;
+        if (document.hidden || !syncActive() || !window.EventSource) return;
+        eventSource = new EventSource(`/api/events?since=${dataVersion}`);
+        eventSource.addEventListener('version', (event) => {
+            const { version } = JSON.parse(event.data);
+            // Skip our own saves and anything a pending upload will overwrite
+            if (version === dataVersion || syncPending || syncInFlight) return;
+            loadFromServer(true);
+        });
     }
 
     function stopAutoSync() {
-        if (autoSyncInterval) {
-            clearInterval(autoSyncInterval);
-            autoSyncInterval = null;
+        if (eventSource) {
+            eventSource.close();
+            eventSource = null;
         }
+        clearTimeout(syncTimer);
+        syncTimer = null;
     }
 
+    document.addEventListener('visibilitychange', () => {
+        if (!syncActive()) return;
+        if (document.hidden) {
+            // Upload outstanding changes (as a keepalive request, which
+            // outlives the page if it is closed), then go idle until the
+            // tab is visible
+            flushSync();
+            if (eventSource) {
+                eventSource.close();
+                eventSource = null;
+            }
+        } else {
+            // Reconnecting with ?since= announces anything missed while hidden
+            startAutoSync();
+        }
+    });
+
+    window.addEventListener('pagehide', () => {
+        if (syncActive()) flushSync();
+    });
+
+    // Returns { ok } once the server answered; a rate-limited save also
+    // carries retryAfterMs. Failures and skipped entries are shown even
+    // for silent saves.
     async function saveToServer(silent = false) {
         if (!isAuthenticated) {
             if (!silent) statusEl.textContent = 'Please login first';
-            return;
+            return { ok: false };
         }
-        const list = loadLocal();
+        const body = JSON.stringify({ entries: loadLocal() });
         if (!silent) statusEl.textContent = 'Saving...';
         try {
             const resp = await fetch('/api/save_entries', { 
                 method: 'POST', 
                 headers: { 'Content-Type': 'application/json' }, 
-                body: JSON.stringify({ entries: list }) 
+                body,
+                keepalive: new Blob([body]).size <= SYNC_KEEPALIVE_MAX_BYTES
             });
-            const json = await resp.json();
+            const json = await resp.json().catch(() => ({}));
             if (resp.status === 401) {
                 if (!silent) statusEl.textContent = 'Session expired. Please login again.';
                 showAuthModal();
-            } else {
-                if (!silent) statusEl.textContent = json.error ? JSON.stringify(json) : `Saved ${json.saved} entries`;
+                return { ok: false };
             }
+            if (resp.status === 429) {
+                const seconds = Math.max(1, Number(resp.headers.get('Retry-After')) || 5);
+                statusEl.textContent = `Too many saves, retrying in ${seconds}s`;
+                return { ok: false, retryAfterMs: seconds * 1000 };
+            }
+            if (!resp.ok) {
+                statusEl.textContent = `Save failed: ${json.error || resp.statusText}`;
+                return { ok: false };
+            }
+            if (json.version != null) dataVersion = json.version;
+            if (json.rejected) {
+                const first = (json.errors || [])[0];
+                statusEl.textContent = `Saved ${json.saved} entries, skipped ${json.rejected} invalid`
+                    + (first ? ` (entry ${first.entry}: ${first.error})` : '');
+            } else if (!silent) {
+                statusEl.textContent = `Saved ${json.saved} entries`;
+            }
+            return { ok: true };
         } catch (err) {
-            if (!silent) statusEl.textContent = `Error: ${err}`;
+            statusEl.textContent = `Save failed: ${err}`;
+            return { ok: false };
         }
     }
 
@@ -143,7 +257,8 @@
                 if (!silent) statusEl.textContent = 'Session expired. Please login again.';
                 showAuthModal();
             } else if (json.entries) {
-                saveLocal(json.entries);
+                replaceEntries(json.entries, true);
+                if (json.version != null) dataVersion = json.version;
                 render();
                 if (!silent) statusEl.textContent = `Loaded ${json.entries.length} entries`;
             } else {
@@ -199,10 +314,7 @@
                 const pingResp = await fetch('/api/ping');
                 const pingData = await pingResp.json();
                 serverDbEnabled = pingData.server_db_enabled;
-                if (serverDbEnabled) {
-                    await loadFromServer();
-                    startAutoSync();
-                }
+                if (serverDbEnabled) await startServerSync();
             } else {
                 authError.textContent = data.error || 'Login failed';
             }
@@ -244,10 +356,7 @@
                 const pingResp = await fetch('/api/ping');
                 const pingData = await pingResp.json();
                 serverDbEnabled = pingData.server_db_enabled;
-                if (serverDbEnabled) {
-                    await loadFromServer();
-                    startAutoSync();
-                }
+                if (serverDbEnabled) await startServerSync();
             } else {
                 authError.textContent = data.error || 'Registration failed';
             }
@@ -263,6 +372,7 @@
             currentUsername = null;
             serverDbEnabled = false;
             stopAutoSync();
+            setSyncPending(false);
             logoutBtn.style.display = 'none';
             currentUserEl.textContent = '';
             showAuthModal();
@@ -342,17 +452,267 @@
     }
 
     // Helpers
+    function newEntryId() {
+        if (window.crypto && crypto.randomUUID) {
+            return crypto.randomUUID().replace(/-/g, '');
+        }
+        let id = '';
+        for (let i = 0; i < 32; i++) {
+            id += Math.floor(Math.random() * 16).toString(16);
+        }
+        return id;
+    }
+
+    // Give entries created before stable IDs existed an ID. Returns true if any changed.
+    function ensureEntryIds(list) {
+        let changed = false;
+        list.forEach(entry => {
+            if (!entry.id) {
+                entry.id = newEntryId();
+                changed = true;
+            }
+        });
+        return changed;
+    }
+
+    // Entry store: entries live in memory (parsed once) and are persisted to
+    // IndexedDB, keyed by id with a date index. Mutations mark records dirty
+    // and a single batched transaction writes only those records.
+    const DB_NAME = 'timetracker';
+    const DB_VERSION = 1;
+    const ENTRY_STORE = 'entries';
+
+    const entryStore = {
+        db: null,
+        byId: new Map(),
+        byDate: new Map(),      // date -> Set of ids
+        version: 0,             // bumped on every change
+        list: null,             // cached array of entries, rebuilt after changes
+        sorted: null,           // cached sortEntries(list)
+        dirty: new Set(),       // ids to write
+        removed: new Set(),     // ids to delete
+        cleared: false,         // wipe the object store before writing
+        flushTimer: null,
+    };
+
+    function openEntryDb() {
+        return new Promise((resolve, reject) => {
+            if (!window.indexedDB) {
+                resolve(null);
+                return;
+            }
+            const req = indexedDB.open(DB_NAME, DB_VERSION);
+            req.onupgradeneeded = () => {
+                const db = req.result;
+                if (!db.objectStoreNames.contains(ENTRY_STORE)) {
+                    const store = db.createObjectStore(ENTRY_STORE, { keyPath: 'id' });
+                    store.createIndex('date', 'date', { unique: false });
+                }
+            };
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    function readAllEntries(db) {
+        return new Promise((resolve, reject) => {
+            const req = db.transaction(ENTRY_STORE, 'readonly').objectStore(ENTRY_STORE).getAll();
+            req.onsuccess = () => resolve(req.result || []);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    function indexEntry(entry) {
+        entryStore.byId.set(entry.id, entry);
+        const key = entry.date || '';
+        if (!entryStore.byDate.has(key)) entryStore.byDate.set(key, new Set());
+        entryStore.byDate.get(key).add(entry.id);
+    }
+
+    function unindexEntry(id) {
+        const entry = entryStore.byId.get(id);
+        if (!entry) return null;
+        entryStore.byId.delete(id);
+        const ids = entryStore.byDate.get(entry.date || '');
+        if (ids) {
+            ids.delete(id);
+            if (ids.size === 0) entryStore.byDate.delete(entry.date || '');
+        }
+        return entry;
+    }
+
+    // local: the change was made here and should be uploaded
+    function markChanged(local = true) {
+        entryStore.version++;
+        entryStore.list = null;
+        entryStore.sorted = null;
+        scheduleFlush();
+        if (local) scheduleSync();
+    }
+
+    async function initStore() {
+        let entries = [];
+        try {
+            entryStore.db = await openEntryDb();
+            if (entryStore.db) entries = await readAllEntries(entryStore.db);
+        } catch (err) {
+            console.error('[Storage] IndexedDB unavailable, using localStorage:', err);
+            entryStore.db = null;
+        }
+        const legacy = localStorage.getItem(ENTRIES_KEY);
+        if (entryStore.db && entries.length === 0 && legacy) {
+            // One-time migration of the old localStorage list
+            entries = JSON.parse(legacy);
+            entryStore.cleared = true;
+        } else if (!entryStore.db && legacy) {
+            entries = JSON.parse(legacy);
+        }
+        if (ensureEntryIds(entries)) entryStore.cleared = true;
+        entries.forEach(indexEntry);
+        aggregator.reset(entries);
+        if (entryStore.cleared) {
+            entries.forEach(entry => entryStore.dirty.add(entry.id));
+            markChanged(false);
+        }
+        console.log('[Storage] initStore: loaded', entries.length, 'entries');
+    }
+
+    function scheduleFlush() {
+        if (entryStore.flushTimer) return;
+        entryStore.flushTimer = setTimeout(flushStore, 0);
+    }
+
+    function flushStore() {
+        entryStore.flushTimer = null;
+        const { db } = entryStore;
+        if (!db) {
+            localStorage.setItem(ENTRIES_KEY, JSON.stringify(loadLocal()));
+            entryStore.dirty.clear();
+            entryStore.removed.clear();
+            entryStore.cleared = false;
+            return Promise.resolve();
+        }
+        const dirty = [...entryStore.dirty];
+        const removed = [...entryStore.removed];
+        const cleared = entryStore.cleared;
+        entryStore.dirty.clear();
+        entryStore.removed.clear();
+        entryStore.cleared = false;
+        return new Promise((resolve, reject) => {
+            const tx = db.transaction(ENTRY_STORE, 'readwrite');
+            const store = tx.objectStore(ENTRY_STORE);
+            if (cleared) store.clear();
+            removed.forEach(id => store.delete(id));
+            dirty.forEach(id => {
+                const entry = entryStore.byId.get(id);
+                if (entry) store.put(entry);
+            });
+            tx.oncomplete = () => {
+                if (cleared) localStorage.removeItem(ENTRIES_KEY);
+                resolve();
+            };
+            tx.onerror = () => {
+                console.error('[Storage] flush failed:', tx.error);
+                reject(tx.error);
+            };
+        });
+    }
+
+    // All entries as an array. Shared with the store: do not mutate, use
+    // putEntry/deleteEntry/replaceEntries instead.
     function loadLocal() {
-        const raw = localStorage.getItem(ENTRIES_KEY);
-        const entries = raw ? JSON.parse(raw) : [];
-        console.log('[Storage] loadLocal: loaded', entries.length, 'entries');
-        return entries;
+        if (!entryStore.list) entryStore.list = Array.from(entryStore.byId.values());
+        return entryStore.list;
+    }
+
+    function loadSorted() {
+        if (!entryStore.sorted) entryStore.sorted = sortEntries(loadLocal());
+        return entryStore.sorted;
+    }
+
+    function entriesForDate(date) {
+        const ids = entryStore.byDate.get(date);
+        return ids ? [...ids].map(id => entryStore.byId.get(id)) : [];
     }
 
-    function saveLocal(list) {
-        console.log('[Storage] saveLocal: saving', list.length, 'entries');
-        localStorage.setItem(ENTRIES_KEY, JSON.stringify(list));
-        console.log('[Storage] saveLocal: saved successfully');
+    // Add or replace one entry (pass a new object, not a mutated stored one)
+    function putEntry(entry) {
+        if (!entry.id) entry.id = newEntryId();
+        unindexEntry(entry.id);
+        indexEntry(entry);
+        aggregator.put(entry);
+        entryStore.removed.delete(entry.id);
+        entryStore.dirty.add(entry.id);
+        markChanged();
+        return entry;
+    }
+
+    function deleteEntry(id) {
+        const entry = unindexEntry(id);
+        if (!entry) return null;
+        aggregator.remove(id);
+        entryStore.dirty.delete(id);
+        entryStore.removed.add(id);
+        markChanged();
+        return entry;
+    }
+
+    function replaceEntries(list, fromServer = false) {
+        ensureEntryIds(list);
+        entryStore.byId.clear();
+        entryStore.byDate.clear();
+        entryStore.dirty.clear();
+        entryStore.removed.clear();
+        entryStore.cleared = true;
+        list.forEach(entry => {
+            indexEntry(entry);
+            entryStore.dirty.add(entry.id);
+        });
+        aggregator.reset(list);
+        markChanged(!fromServer);
+    }
+
+    // Day totals are maintained in aggregate_worker.js, which mirrors every
+    // store change. Without Worker support the same code runs on the page.
+    const aggregator = createAggregator();
+
+    function createAggregator() {
+        let worker = null;
+        if (window.Worker) {
+            try {
+                worker = new Worker('/static/aggregate_worker.js');
+            } catch (err) {
+                console.warn('[Aggregate] Worker unavailable, aggregating on the main thread:', err);
+            }
+        }
+        if (!worker) {
+            const dayTotals = new TimeAggregate.DayTotals();
+            return {
+                reset: entries => dayTotals.reset(entries),
+                put: entry => dayTotals.put(entry),
+                remove: id => dayTotals.remove(id),
+                totalsFor: dates => Promise.resolve(dayTotals.totalsFor(dates)),
+            };
+        }
+
+        const pending = new Map();
+        let nextRequest = 0;
+        worker.onmessage = (event) => {
+            const { requestId, hours } = event.data;
+            const resolve = pending.get(requestId);
+            pending.delete(requestId);
+            if (resolve) resolve(hours);
+        };
+        return {
+            reset: entries => worker.postMessage({ type: 'reset', entries }),
+            put: entry => worker.postMessage({ type: 'put', entry }),
+            remove: id => worker.postMessage({ type: 'delete', id }),
+            totalsFor: dates => new Promise(resolve => {
+                const requestId = ++nextRequest;
+                pending.set(requestId, resolve);
+                worker.postMessage({ type: 'totals', requestId, dates });
+            }),
+        };
     }
 
     function loadRunning() {
@@ -398,7 +758,7 @@
         return `${hours}${separator}${minutes}`;
     }
 
-    function fmtEntryCard(e, idx) {
+    function fmtEntryCard(e) {
         const wrap = document.createElement('div');
         wrap.className = 'entry-card';
         if (e.is_absence) {
@@ -428,16 +788,8 @@
         const edit = document.createElement('button');
         edit.textContent = '✏️ Edit';
         edit.addEventListener('click', () => {
-            const list = loadLocal();
-            // Find the current index of this entry
-            const currentIdx = list.findIndex(entry => 
-                entry.date === e.date && 
-                entry.start === e.start && 
-                entry.end === e.end && 
-                entry.description === e.description
-            );
-            if (currentIdx !== -1) {
-                openEditModal(e, currentIdx);
+            if (entryStore.byId.has(e.id)) {
+                openEditModal(e);
             } else {
                 alert('Entry not found');
                 render();
@@ -454,22 +806,11 @@
                     alert('A timer is already running. Stop it first.');
                     return;
                 }
-                const list = loadLocal();
-                // Find the current index of this entry
-                const currentIdx = list.findIndex(entry => 
-                    entry.date === e.date && 
-                    entry.start === e.start && 
-                    entry.end === e.end && 
-                    entry.description === e.description
-                );
-                
-                if (currentIdx !== -1) {
-                    // remove this entry from storage so stop will re-add updated one
-                    list.splice(currentIdx, 1);
-                    saveLocal(list);
-                }
+                // remove this entry from storage so stop will re-add updated one
+                deleteEntry(e.id);
                 
                 const running = {
+                    id: e.id,
                     start_iso: e.start_iso,
                     description: e.description || ''
                 };
@@ -493,46 +834,21 @@
                 return;
             }
             
-            const list = loadLocal();
-            console.log('[Delete] Current list has', list.length, 'entries');
-            
-            // Find the current index of this entry (in case list changed)
-            const currentIdx = list.findIndex(entry => 
-                entry.date === e.date && 
-                entry.start === e.start && 
-                entry.end === e.end && 
-                entry.description === e.description
-            );
-            
-            console.log('[Delete] Found entry at index:', currentIdx);
-            
-            if (currentIdx === -1) {
-                console.error('[Delete] Entry not found in list');
+            const deleted = deleteEntry(e.id);
+            if (!deleted) {
+                console.error('[Delete] Entry not found in store');
                 alert('Entry not found');
                 render();
                 return;
             }
-            
-            const deleted = list.splice(currentIdx, 1)[0];
             console.log('[Delete] Removed entry:', deleted);
             
-            saveLocal(list);
-            console.log('[Delete] Saved updated list, now has', list.length, 'entries');
-            
             // store last deleted for undo
-            sessionStorage.setItem('timetracker_last_deleted', JSON.stringify({ entry: deleted, index: currentIdx }));
+            sessionStorage.setItem('timetracker_last_deleted', JSON.stringify({ entry: deleted }));
             // show undo in status
             showUndoStatus();
             render();
             console.log('[Delete] Re-rendered entries list');
-            
-            // Auto-save to server if enabled
-            if (serverDbEnabled && isAuthenticated) {
-                console.log('[Delete] Auto-syncing to server');
-                saveToServer(true);
-            } else {
-                console.log('[Delete] Auto-sync skipped (serverDbEnabled:', serverDbEnabled, 'isAuthenticated:', isAuthenticated, ')');
-            }
         });
         actions.appendChild(del);
         
@@ -618,7 +934,7 @@
         });
     }
 
-    function openEditModal(e, idx) {
+    function openEditModal(e) {
         const modal = document.getElementById('edit_modal');
         const d = document.getElementById('edit_date');
         const s = document.getElementById('edit_start');
@@ -647,8 +963,14 @@
         }
 
         function onSave() {
-            const list = loadLocal();
-            const item = list[idx];
+            const current = entryStore.byId.get(e.id);
+            if (!current) {
+                cleanup();
+                alert('Entry not found');
+                render();
+                return;
+            }
+            const item = { ...current };
             item.date = d.value;
             item.start = s.value;
             item.end = en.value;
@@ -656,13 +978,9 @@
             item.description = desc.value;
             if (item.date && item.start) item.start_iso = `${item.date}T${item.start}`;
             if (item.date && item.end) item.end_iso = `${item.date}T${item.end}`;
-            saveLocal(list);
+            putEntry(item);
             cleanup();
             render();
-            // Auto-save to server if enabled
-            if (serverDbEnabled && isAuthenticated) {
-                saveToServer(true);
-            }
         }
 
         function onCancel() {
@@ -689,28 +1007,36 @@
             statusEl.innerHTML = `Deleted entry. <button id="undo_btn">Undo</button>`;
             const btn = document.getElementById('undo_btn');
             btn.addEventListener('click', () => {
-                const list = loadLocal();
-                // restore at original index when possible
-                const idx = info.index != null && info.index <= list.length ? info.index : list.length;
-                list.splice(idx, 0, info.entry);
-                saveLocal(list);
+                putEntry(info.entry);
                 sessionStorage.removeItem('timetracker_last_deleted');
                 statusEl.textContent = 'Restored';
                 render();
-                // Auto-save to server if enabled
-                if (serverDbEnabled && isAuthenticated) {
-                    saveToServer(true);
-                }
             });
         } catch (e) {
             statusEl.textContent = '';
         }
     }
 
+    let calendarRequest = 0;
+
     function renderCalendar() {
         const year = currentCalendarDate.getFullYear();
         const month = currentCalendarDate.getMonth();
         
+        // Only the visible month's totals come back from the aggregator
+        const dates = [];
+        const daysInMonth = new Date(year, month + 1, 0).getDate();
+        for (let day = 1; day <= daysInMonth; day++) {
+            dates.push(formatIsoFromDate(new Date(year, month, day)));
+        }
+        const request = ++calendarRequest;
+        aggregator.totalsFor(dates).then(hoursPerDay => {
+            // Skip the draw if a newer render has been requested meanwhile
+            if (request === calendarRequest) drawCalendar(year, month, hoursPerDay);
+        });
+    }
+
+    function drawCalendar(year, month, hoursPerDay) {
         // Update title
         const monthNames = ['January', 'February', 'March', 'April', 'May', 'June',
                            'July', 'August', 'September', 'October', 'November', 'December'];
@@ -728,74 +1054,6 @@
             calendarGrid.appendChild(header);
         });
         
-        // Calculate hours per day
-        const list = loadLocal();
-        const hoursPerDay = {};
-        
-        // Group entries by date
-        const entriesByDate = {};
-        list.forEach(entry => {
-            if (!entry.date) return;
-            if (!entriesByDate[entry.date]) {
-                entriesByDate[entry.date] = [];
-            }
-            entriesByDate[entry.date].push(entry);
-        });
-        
-        // Calculate total for each day (work time minus overlapping absences)
-        Object.keys(entriesByDate).forEach(date => {
-            const entries = entriesByDate[date];
-            const workEntries = entries.filter(e => !e.is_absence);
-            const absenceEntries = entries.filter(e => e.is_absence);
-            
-            let totalHours = 0;
-            
-            // For each work entry, calculate its duration minus overlapping absences
-            workEntries.forEach(workEntry => {
-                let workStart, workEnd;
-                
-                if (workEntry.start_iso && workEntry.end_iso) {
-                    workStart = new Date(workEntry.start_iso);
-                    workEnd = new Date(workEntry.end_iso);
-                } else if (workEntry.date && workEntry.start && workEntry.end) {
-                    workStart = new Date(`${workEntry.date}T${workEntry.start}`);
-                    workEnd = new Date(`${workEntry.date}T${workEntry.end}`);
-                } else {
-                    return;
-                }
-                
-                let workDuration = (workEnd - workStart) / (1000 * 60 * 60);
-                
-                // Subtract overlapping absence time
-                absenceEntries.forEach(absence => {
-                    let absStart, absEnd;
-                    
-                    if (absence.start_iso && absence.end_iso) {
-                        absStart = new Date(absence.start_iso);
-                        absEnd = new Date(absence.end_iso);
-                    } else if (absence.date && absence.start && absence.end) {
-                        absStart = new Date(`${absence.date}T${absence.start}`);
-                        absEnd = new Date(`${absence.date}T${absence.end}`);
-                    } else {
-                        return;
-                    }
-                    
-                    // Calculate overlap
-                    const overlapStart = new Date(Math.max(workStart, absStart));
-                    const overlapEnd = new Date(Math.min(workEnd, absEnd));
-                    
-                    if (overlapStart < overlapEnd) {
-                        const overlapHours = (overlapEnd - overlapStart) / (1000 * 60 * 60);
-                        workDuration -= overlapHours;
-                    }
-                });
-                
-                totalHours += workDuration;
-            });
-            
-            hoursPerDay[date] = totalHours;
-        });
-        
         // Get first day of month (0 = Sunday, 1 = Monday, etc.)
         const firstDay = new Date(year, month, 1);
         let dayOfWeek = firstDay.getDay();
@@ -933,20 +1191,108 @@
         }
     }
 
+    // Entry list: cards are cached by id and reused while their entry object
+    // is unchanged, and date groups are materialized a page at a time as the
+    // sentinel below the list scrolls into view.
+    const GROUPS_PER_PAGE = 20;
+    const cardCache = new Map();        // id -> { entry, node }
+    const headerCache = new Map();      // date -> node
+    const listState = { version: -1, filterKey: null, groups: [], visible: GROUPS_PER_PAGE };
+    const listSentinel = document.createElement('div');
+    listSentinel.className = 'entries-sentinel';
+    const listObserver = window.IntersectionObserver
+        ? new IntersectionObserver((changes) => {
+            if (changes.some(change => change.isIntersecting) && listState.visible < listState.groups.length) {
+                listState.visible += GROUPS_PER_PAGE;
+                renderEntryList();
+            }
+        }, { rootMargin: '400px' })
+        : null;
+
+    function groupByDate(entries) {
+        const groups = [];
+        entries.forEach(e => {
+            const last = groups[groups.length - 1];
+            if (last && last.date === (e.date || '')) last.entries.push(e);
+            else groups.push({ date: e.date || '', entries: [e] });
+        });
+        return groups;
+    }
+
+    function cardFor(e) {
+        const cached = cardCache.get(e.id);
+        if (cached && cached.entry === e) return cached.node;
+        const node = fmtEntryCard(e);
+        cardCache.set(e.id, { entry: e, node });
+        return node;
+    }
+
+    function headerFor(date) {
+        if (!headerCache.has(date)) {
+            const header = document.createElement('div');
+            header.className = 'entries-group-header';
+            header.textContent = formatGroupLabel(date);
+            headerCache.set(date, header);
+        }
+        return headerCache.get(date);
+    }
+
+    // Make parent's children exactly `nodes`, moving only nodes that are out of place
+    function patchChildren(parent, nodes) {
+        let cursor = parent.firstChild;
+        nodes.forEach(node => {
+            if (node === cursor) {
+                cursor = cursor.nextSibling;
+                return;
+            }
+            parent.insertBefore(node, cursor);
+        });
+        while (cursor) {
+            const next = cursor.nextSibling;
+            parent.removeChild(cursor);
+            cursor = next;
+        }
+    }
+
+    function renderEntryList() {
+        const groups = listObserver ? listState.groups.slice(0, listState.visible) : listState.groups;
+        const nodes = [];
+        groups.forEach(group => {
+            if (group.date) nodes.push(headerFor(group.date));
+            group.entries.forEach(e => nodes.push(cardFor(e)));
+        });
+        const more = groups.length < listState.groups.length;
+        if (more) nodes.push(listSentinel);
+        patchChildren(entriesEl, nodes);
+        if (more) {
+            // Re-observing reports the current intersection, so another page
+            // loads right away if the sentinel is still on screen
+            listObserver.unobserve(listSentinel);
+            listObserver.observe(listSentinel);
+        }
+    }
+
     function render() {
-        console.log('[Render] Starting render');
-        
         // Render calendar
         renderCalendar();
         
         // Render entries list
-        entriesEl.innerHTML = '';
-        const list = sortEntries(loadLocal());
-        console.log('[Render] Rendering', list.length, 'entries');
         updateFilterPanel();
-        const filteredList = applyCalendarFilter(list);
+        const filterKey = JSON.stringify(currentCalendarFilter);
+        if (filterKey !== listState.filterKey) {
+            listState.visible = GROUPS_PER_PAGE;
+        }
+        if (filterKey !== listState.filterKey || entryStore.version !== listState.version) {
+            listState.groups = groupByDate(applyCalendarFilter(loadSorted()));
+            listState.filterKey = filterKey;
+            listState.version = entryStore.version;
+        }
+        // Drop cached cards of entries that no longer exist
+        cardCache.forEach((cached, id) => {
+            if (entryStore.byId.get(id) !== cached.entry) cardCache.delete(id);
+        });
         
-        if (filteredList.length === 0) {
+        if (listState.groups.length === 0) {
             const empty = document.createElement('div');
             empty.style.textAlign = 'center';
             empty.style.padding = '40px 20px';
@@ -958,22 +1304,10 @@
                 ? filterMessage
                 : '<p>No entries yet</p><p style="font-size: 2rem; margin-top: 12px;">📝</p>';
             empty.innerHTML = message;
-            entriesEl.appendChild(empty);
-        } else {
-            let lastDate = null;
-            filteredList.forEach((e, i) => {
-                if (e.date && e.date !== lastDate) {
-                    const header = document.createElement('div');
-                    header.className = 'entries-group-header';
-                    header.textContent = formatGroupLabel(e.date);
-                    entriesEl.appendChild(header);
-                    lastDate = e.date;
-                }
-                console.log('[Render] Creating card for entry', i, ':', e);
-                entriesEl.appendChild(fmtEntryCard(e, i));
-            });
+            patchChildren(entriesEl, [empty]);
+            return;
         }
-        console.log('[Render] Render complete');
+        renderEntryList();
     }
 
     // Timer
@@ -1014,6 +1348,7 @@
         if (!running) return;
         const endIso = new Date().toISOString();
         const entry = {
+            id: running.id || newEntryId(),
             date: isoToDate(running.start_iso),
             start: isoToTime(running.start_iso),
             end: isoToTime(endIso),
@@ -1022,18 +1357,12 @@
             start_iso: running.start_iso,
             end_iso: endIso,
         };
-        const list = loadLocal();
-        list.push(entry);
-        saveLocal(list);
+        putEntry(entry);
         saveRunning(null);
         if (timerInterval) { clearInterval(timerInterval); timerInterval = null; }
         timerDescEl.value = '';
         updateTimerDisplay();
         render();
-        // Auto-save to server if enabled
-        if (serverDbEnabled && isAuthenticated) {
-            saveToServer(true);
-        }
     }
 
     timerStartBtn.addEventListener('click', () => startTimer());
@@ -1042,6 +1371,7 @@
     // Manual add
     addBtn.addEventListener('click', () => {
         const e = {
+            id: newEntryId(),
             date: dateEl.value,
             start: startEl.value,
             end: endEl.value,
@@ -1056,9 +1386,7 @@
         e.start_iso = `${e.date}T${e.start}`;
         e.end_iso = `${e.date}T${e.end}`;
         
-        const list = loadLocal();
-        list.push(e);
-        saveLocal(list);
+        putEntry(e);
         // Clear form
         descEl.value = '';
         isAbsEl.checked = false;
@@ -1067,10 +1395,6 @@
         setTimeout(() => { statusEl.textContent = ''; }, 2000);
         switchView('entries');
         render();
-        // Auto-save to server if enabled
-        if (serverDbEnabled && isAuthenticated) {
-            saveToServer(true);
-        }
     });
 
     saveServerBtn.addEventListener('click', () => saveToServer(false));
@@ -1107,16 +1431,6 @@
                 return;
             }
             
-            const list = loadLocal();
-            
-            // Filter entries within date range
-            const filteredEntries = list.filter(e => e.date >= startDate && e.date <= endDate);
-            
-            if (filteredEntries.length === 0) {
-                alert('No entries found in the selected date range');
-                return;
-            }
-            
             // Generate date range
             const dates = [];
             const current = new Date(startDate);
@@ -1128,112 +1442,86 @@
                 current.setDate(current.getDate() + 1);
             }
             
-            // Group entries by date
-            const entriesByDate = {};
-            filteredEntries.forEach(entry => {
-                if (!entry.date) return;
-                if (!entriesByDate[entry.date]) {
-                    entriesByDate[entry.date] = [];
-                }
-                entriesByDate[entry.date].push(entry);
-            });
-            
-            // Calculate hours per day (work minus overlapping absences)
-            const hoursPerDay = {};
-            Object.keys(entriesByDate).forEach(date => {
-                const entries = entriesByDate[date];
-                const workEntries = entries.filter(e => !e.is_absence);
-                const absenceEntries = entries.filter(e => e.is_absence);
-                
-                let totalHours = 0;
-                
-                workEntries.forEach(workEntry => {
-                    let workStart, workEnd;
-                    
-                    if (workEntry.start_iso && workEntry.end_iso) {
-                        workStart = new Date(workEntry.start_iso);
-                        workEnd = new Date(workEntry.end_iso);
-                    } else if (workEntry.date && workEntry.start && workEntry.end) {
-                        workStart = new Date(`${workEntry.date}T${workEntry.start}`);
-                        workEnd = new Date(`${workEntry.date}T${workEntry.end}`);
-                    } else {
-                        return;
-                    }
-                    
-                    let workDuration = (workEnd - workStart) / (1000 * 60 * 60);
-                    
-                    absenceEntries.forEach(absence => {
-                        let absStart, absEnd;
-                        
-                        if (absence.start_iso && absence.end_iso) {
-                            absStart = new Date(absence.start_iso);
-                            absEnd = new Date(absence.end_iso);
-                        } else if (absence.date && absence.start && absence.end) {
-                            absStart = new Date(`${absence.date}T${absence.start}`);
-                            absEnd = new Date(`${absence.date}T${absence.end}`);
-                        } else {
-                            return;
-                        }
-                        
-                        const overlapStart = new Date(Math.max(workStart, absStart));
-                        const overlapEnd = new Date(Math.min(workEnd, absEnd));
-                        
-                        if (overlapStart < overlapEnd) {
-                            const overlapHours = (overlapEnd - overlapStart) / (1000 * 60 * 60);
-                            workDuration -= overlapHours;
-                        }
-                    });
-                    
-                    totalHours += workDuration;
-                });
-                
-                hoursPerDay[date] = totalHours;
-            });
-            
-            // Create CSV with daily and weekly totals
-            let csv = 'Date,Day,Hours Worked\n';
-            let weekHours = 0;
-            let weekNumber = 1;
-            const dayNames = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
-            
-            dates.forEach((dateStr, idx) => {
-                const date = new Date(dateStr + 'T00:00:00');
-                const dayName = dayNames[date.getDay()];
-                const hours = hoursPerDay[dateStr] || 0;
-                weekHours += hours;
-                
-                csv += `${dateStr},${dayName},${hours.toFixed(2)}\n`;
-                
-                // Add week total on Sunday or last day
-                if (date.getDay() === 0 || idx === dates.length - 1) {
-                    csv += `,,Week ${weekNumber} Total: ${weekHours.toFixed(2)}h\n`;
-                    weekHours = 0;
-                    weekNumber++;
-                    csv += '\n'; // Add blank line between weeks
-                }
-            });
+            const entryCount = dates.reduce((count, dateStr) => count + entriesForDate(dateStr).length, 0);
             
-            // Add grand total
-            const grandTotal = Object.values(hoursPerDay).reduce((sum, h) => sum + h, 0);
-            csv += `,,Grand Total: ${grandTotal.toFixed(2)}h\n`;
+            if (entryCount === 0) {
+                alert('No entries found in the selected date range');
+                return;
+            }
             
-            // Download report
-            const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
-            const link = document.createElement('a');
-            const url = URL.createObjectURL(blob);
-            const filename = `timetracker_report_${startDate}_to_${endDate}.csv`;
+            aggregator.totalsFor(dates).then(hoursPerDay => downloadReport(startDate, endDate, dates, hoursPerDay, entryCount));
+        });
+    }
+
+    // Server-side exports stream straight from the database, so they work
+    // for any range without holding it in the browser
+    async function serverExport(kind, format) {
+        if (!syncActive()) {
+            alert('Server exports need server sync: log in with USE_SERVER_DB=1');
+            return;
+        }
+        // Make sure the server has the latest local changes
+        await flushSync();
+        // Exports are explicit requests, so they reach into archived years too
+        const params = new URLSearchParams({ kind, format, include_archived: '1' });
+        if (reportStartEl.value) params.set('start', reportStartEl.value);
+        if (reportEndEl.value) params.set('end', reportEndEl.value);
+        window.location.href = `/api/export?${params}`;
+    }
+
+    [
+        ['export_report_xlsx', 'report', 'xlsx'],
+        ['export_entries_csv', 'entries', 'csv'],
+        ['export_entries_xlsx', 'entries', 'xlsx'],
+    ].forEach(([id, kind, format]) => {
+        const btn = document.getElementById(id);
+        if (btn) btn.addEventListener('click', () => serverExport(kind, format));
+    });
+
+    function downloadReport(startDate, endDate, dates, hoursPerDay, entryCount) {
+        // Create CSV with daily and weekly totals
+        let csv = 'Date,Day,Hours Worked\n';
+        let weekHours = 0;
+        let weekNumber = 1;
+        const dayNames = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'];
+        
+        dates.forEach((dateStr, idx) => {
+            const date = new Date(dateStr + 'T00:00:00');
+            const dayName = dayNames[date.getDay()];
+            const hours = hoursPerDay[dateStr] || 0;
+            weekHours += hours;
             
-            link.setAttribute('href', url);
-            link.setAttribute('download', filename);
-            link.style.visibility = 'hidden';
-            document.body.appendChild(link);
-            link.click();
-            document.body.removeChild(link);
-            URL.revokeObjectURL(url);
+            csv += `${dateStr},${dayName},${hours.toFixed(2)}\n`;
             
-            statusEl.textContent = `Report generated: ${filteredEntries.length} entries, ${grandTotal.toFixed(2)} hours total`;
-            setTimeout(() => { statusEl.textContent = ''; }, 5000);
+            // Add week total on Sunday or last day
+            if (date.getDay() === 0 || idx === dates.length - 1) {
+                csv += `,,Week ${weekNumber} Total: ${weekHours.toFixed(2)}h\n`;
+                weekHours = 0;
+                weekNumber++;
+                csv += '\n'; // Add blank line between weeks
+            }
         });
+        
+        // Add grand total
+        const grandTotal = Object.values(hoursPerDay).reduce((sum, h) => sum + h, 0);
+        csv += `,,Grand Total: ${grandTotal.toFixed(2)}h\n`;
+        
+        // Download report
+        const blob = new Blob([csv], { type: 'text/csv;charset=utf-8;' });
+        const link = document.createElement('a');
+        const url = URL.createObjectURL(blob);
+        const filename = `timetracker_report_${startDate}_to_${endDate}.csv`;
+        
+        link.setAttribute('href', url);
+        link.setAttribute('download', filename);
+        link.style.visibility = 'hidden';
+        document.body.appendChild(link);
+        link.click();
+        document.body.removeChild(link);
+        URL.revokeObjectURL(url);
+        
+        statusEl.textContent = `Report generated: ${entryCount} entries, ${grandTotal.toFixed(2)} hours total`;
+        setTimeout(() => { statusEl.textContent = ''; }, 5000);
     }
 
     // initialize date input with today
@@ -1245,8 +1533,6 @@
         timerInterval = setInterval(updateTimerDisplay, 1000);
     }
     updateTimerDisplay();
-    render();
-    showUndoStatus();
     
     // Initialize report date inputs with current month
     const now = new Date();
@@ -1255,6 +1541,10 @@
     if (reportStartEl) reportStartEl.value = firstDay.toISOString().slice(0, 10);
     if (reportEndEl) reportEndEl.value = lastDay.toISOString().slice(0, 10);
     
-    // Check authentication on startup
-    checkAuth();
+    // Load the entry store, then render and check authentication
+    initStore().then(() => {
+        render();
+        showUndoStatus();
+        checkAuth();
+    });
 })();
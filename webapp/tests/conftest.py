@@ -6,22 +6,26 @@ import importlib
 
 
 @pytest.fixture
-def client(monkeypatch, tmp_path):
+def app_mod():
+    """The application module, for tests that patch its settings or call helpers directly."""
+    # When pytest runs with CWD=webapp, the module is named "app"; when running
+    # from repo root it may be importable as "webapp.app".
+    try:
+        return importlib.import_module("app")
+    except ModuleNotFoundError:
+        return importlib.import_module("webapp.app")
+
+
+@pytest.fixture
+def client(app_mod, monkeypatch, tmp_path):
     """Create a Flask test client and configure the app to use a temporary DB path.
 
-    We import the application module and monkeypatch its get_db_path function so the
-    tests use an isolated sqlite file under tmp_path.
+    We monkeypatch the app module's get_db_path function so the tests use an
+    isolated sqlite file under tmp_path.
     """
     # Ensure Flask app runs in testing mode
     monkeypatch.setenv("FLASK_ENV", "testing")
 
-    # Import the app module fresh. When pytest runs with CWD=webapp, the module is named
-    # "app"; when running from repo root it may be importable as "webapp.app".
-    try:
-        app_mod = importlib.import_module("app")
-    except ModuleNotFoundError:
-        app_mod = importlib.import_module("webapp.app")
-
     # Create a temp db path and monkeypatch get_db_path to return it
     db_file = tmp_path / "test_web_data.db"
 
@@ -32,6 +36,10 @@ def client(monkeypatch, tmp_path):
         return p
 
     monkeypatch.setattr(app_mod, "get_db_path", _get_db_path)
+    # User IDs restart in every temporary DB, so each test gets a fresh save limit
+    monkeypatch.setattr(
+        app_mod, "SAVE_RATE_LIMITER", app_mod.RateLimiter(app_mod.SAVE_RATE_LIMIT, app_mod.SAVE_RATE_WINDOW_SECONDS)
+    )
 
     # Expose the Flask test client
     flask_app = app_mod.app
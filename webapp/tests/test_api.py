@@ -1,5 +1,11 @@
 import os
 import json
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import closing
+
+import pytest
 
 
 def test_ping(client):
@@ -41,3 +47,431 @@ def test_save_and_load_entries_enabled(client, monkeypatch):
     assert len(loaded) == 2
     descs = {e["description"] for e in loaded}
     assert descs == {"Work", "Meeting"}
+    # Entries without an ID get one assigned by the server
+    assert all(e["id"] for e in loaded)
+
+
+def test_entry_ids_round_trip(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entries = [
+        {"id": "abc123", "date": "2025-11-11", "start": "09:00", "end": "10:00", "description": "Work", "is_absence": False},
+    ]
+    r = client.post("/api/save_entries", json={"entries": entries})
+    assert r.status_code == 200
+    loaded = client.get("/api/load_entries").get_json()["entries"]
+    assert [e["id"] for e in loaded] == ["abc123"]
+
+
+def test_metrics_endpoint(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entries = [{"date": "2025-11-11", "start": "09:00", "end": "10:00", "description": "Work", "is_absence": False}]
+    assert client.post("/api/save_entries", json={"entries": entries}).status_code == 200
+
+    r = client.get("/metrics")
+    assert r.status_code == 200
+    text = r.get_data(as_text=True)
+    assert 'timetracker_http_requests_total{endpoint="/api/save_entries",method="POST",status="200"}' in text
+    assert 'timetracker_db_query_duration_seconds_count{statement="INSERT"}' in text
+    assert "timetracker_save_rows_bucket" in text
+
+
+def test_metrics_token(client, monkeypatch):
+    monkeypatch.setenv("METRICS_TOKEN", "secret")
+    assert client.get("/metrics").status_code == 401
+    r = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+    assert r.status_code == 200
+
+
+def test_save_bumps_version_and_events_announce_it(client, app_mod, monkeypatch):
+    monkeypatch.setattr(app_mod, "EVENTS_MAX_SECONDS", 0)
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+
+    entries = [{"date": "2025-11-11", "start": "09:00", "end": "10:00", "description": "Work", "is_absence": False}]
+    assert client.post("/api/save_entries", json={"entries": entries}).get_json()["version"] == 1
+    assert client.post("/api/save_entries", json={"entries": entries}).get_json()["version"] == 2
+    assert client.get("/api/load_entries").get_json()["version"] == 2
+
+    r = client.get("/api/events?since=1")
+    assert r.mimetype == "text/event-stream"
+    body = r.get_data(as_text=True)
+    assert 'event: version\ndata: {"version": 2}' in body
+
+    # Nothing new to announce for an up-to-date client
+    body = client.get("/api/events", headers={"Last-Event-ID": "2"}).get_data(as_text=True)
+    assert "event: version" not in body
+
+    # With every stream slot taken, the client gets the version at once and is told to poll
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(app_mod, "_event_streams", slots)
+    monkeypatch.setattr(app_mod, "EVENTS_MAX_SECONDS", 60)
+    body = client.get("/api/events?since=1").get_data(as_text=True)
+    assert body.startswith(f"retry: {app_mod.EVENTS_BUSY_RETRY_MS}\n") and '"version": 2' in body
+
+
+def _save_sample(client):
+    entries = [
+        {"date": "2025-11-10", "start": "09:00", "end": "12:00", "description": "Work", "is_absence": False},
+        {"date": "2025-11-11", "start": "09:00", "end": "10:30", "description": "Work", "is_absence": False},
+        {"date": "2025-11-11", "start": "13:00", "end": "14:00", "description": "Doctor", "is_absence": True},
+        {"date": "2025-12-01", "start": "09:00", "end": "10:00", "description": "Later", "is_absence": False},
+    ]
+    assert client.post("/api/save_entries", json={"entries": entries}).status_code == 200
+
+
+def test_export_entries_csv_range(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    _save_sample(client)
+    r = client.get("/api/export?start=2025-11-01&end=2025-11-30")
+    assert r.status_code == 200
+    assert r.mimetype == "text/csv"
+    assert "attachment" in r.headers["Content-Disposition"]
+    lines = r.get_data(as_text=True).splitlines()
+    assert lines[0] == "Date,Start,End,Hours,Description,Absence,ID"
+    assert [line.split(",")[:4] for line in lines[1:]] == [
+        ["2025-11-10", "09:00", "12:00", "3.0"],
+        ["2025-11-11", "09:00", "10:30", "1.5"],
+        ["2025-11-11", "13:00", "14:00", "1.0"],
+    ]
+
+
+
+def test_entries_ending_after_midnight_count_into_the_next_day(client, monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entries = [
+        {"date": "2025-11-10", "start": "22:00", "end": "01:30", "description": "Release", "is_absence": False},
+        {"date": "2025-11-10", "start": "23:00", "end": "00:00", "description": "Break", "is_absence": True},
+    ]
+    assert client.post("/api/save_entries", json={"entries": entries}).status_code == 200
+
+    lines = client.get("/api/export?start=2025-11-10&end=2025-11-10").get_data(as_text=True).splitlines()
+    assert [line.split(",")[3] for line in lines[1:]] == ["3.5", "1.0"]
+    report = client.get("/api/admin/team_report?start=2025-11-10&end=2025-11-10&period=day", headers={"Authorization": "Bearer secret"})
+    totals = {row.split(",")[2]: row.split(",")[3] for row in report.get_data(as_text=True).splitlines()[1:] if row.startswith("testuser_")}
+    assert totals == {"Release": "3.5", "🏖 Absence: Break": "-1.0", "Total worked": "2.5"}
+
+def test_export_report_pivot(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    _save_sample(client)
+    r = client.get("/api/export?kind=report&end=2025-11-30")
+    lines = r.get_data(as_text=True).splitlines()
+    assert lines == [
+        "Date,Work,🏖 Absence: Doctor,Total",
+        "2025-11-10,3.0,0.0,3.0",
+        "2025-11-11,1.5,-1.0,0.5",
+    ]
+
+
+def test_export_xlsx_is_valid_workbook(client, monkeypatch):
+    import io
+    import zipfile
+
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    _save_sample(client)
+    r = client.get("/api/export?format=xlsx")
+    assert r.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(r.get_data())) as zf:
+        assert "xl/workbook.xml" in zf.namelist()
+        sheet = zf.read("xl/worksheets/sheet1.xml").decode("utf-8")
+    assert sheet.count("<row>") == 5
+    assert "<v>1.5</v>" in sheet and ">Doctor<" in sheet
+
+
+def test_export_rejects_bad_arguments(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    assert client.get("/api/export?format=pdf").status_code == 400
+    assert client.get("/api/export?start=yesterday").status_code == 400
+
+
+def test_import_streams_batches_and_reports_rejects(client, app_mod, monkeypatch):
+    monkeypatch.setattr(app_mod, "IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+
+    csv_body = "\n".join([
+        "Date,Start,End,Description,Absence,ID",
+        "2025-11-10,09:00,12:00,Work,,a",
+        "2025-11-10,13:00,25:00,Broken,,b",
+        "2025-11-11,09:00,10:00,Work,,c",
+        "2025-11-12,09:00,10:00,Off,yes,d",
+    ])
+    r = client.post("/api/import", data=csv_body, content_type="text/csv")
+    assert r.status_code == 200
+    result = r.get_json()
+    assert result["imported"] == 3 and result["rejected"] == 1
+    assert result["errors"] == [{"line": 3, "error": "times must be H:MM or H:MM:SS, not '25:00'"}]
+
+    # Re-importing an ID replaces the stored entry instead of duplicating it
+    jsonl = '{"start_time": "2025-11-10T08:00:00", "end_time": "2025-11-10T09:00:00", "id": "a"}\n'
+    r = client.post("/api/import", data=jsonl, content_type="application/x-ndjson")
+    assert r.get_json()["imported"] == 1
+
+    loaded = {e["id"]: e for e in client.get("/api/load_entries").get_json()["entries"]}
+    assert sorted(loaded) == ["a", "c", "d"]
+    assert loaded["a"]["start"] == "08:00"
+    assert loaded["d"]["is_absence"] is True
+
+    # CLI store rows may run past midnight, but not for a day or more
+    jsonl = "\n".join([
+        '{"start_time": "2025-11-13T22:00:00", "end_time": "2025-11-14T01:30:00", "id": "e"}',
+        '{"start_time": "2025-11-13T22:00:00", "end_time": "2025-11-14T22:00:00", "id": "f"}',
+    ])
+    result = client.post("/api/import", data=jsonl, content_type="application/x-ndjson").get_json()
+    assert result["imported"] == 1 and result["errors"] == [{"line": 2, "error": "entries must be shorter than a day"}]
+    loaded = {e["id"]: e for e in client.get("/api/load_entries").get_json()["entries"]}
+    assert (loaded["e"]["date"], loaded["e"]["start"], loaded["e"]["end"]) == ("2025-11-13", "22:00", "01:30")
+
+
+def test_export_imports_back_unchanged(client, monkeypatch):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entries = [
+        {"id": "day", "date": "2025-11-10", "start": "09:00", "end": "12:30:15", "description": "Work, \"quoted\"", "is_absence": False},
+        {"id": "night", "date": "2025-11-10", "start": "22:00", "end": "01:15", "description": "Timer past midnight", "is_absence": False},
+        {"id": "zero", "date": "2025-11-11", "start": "08:00", "end": "08:00", "description": "", "is_absence": False},
+        {"id": "off", "date": "2025-11-12", "start": "08:00", "end": "17:00", "description": "Holiday", "is_absence": True},
+    ]
+    assert client.post("/api/save_entries", json={"entries": entries}).get_json()["saved"] == 4
+    exported = client.get("/api/export").get_data(as_text=True)
+
+    assert client.post("/api/save_entries", json={"entries": []}).status_code == 200
+    result = client.post("/api/import", data=exported, content_type="text/csv").get_json()
+    assert result["imported"] == 4 and result["rejected"] == 0
+
+    loaded = sorted(client.get("/api/load_entries").get_json()["entries"], key=lambda e: e["id"])
+    assert [{k: e[k] for k in entries[0]} for e in loaded] == sorted(entries, key=lambda e: e["id"])
+
+
+def test_save_streams_batches_and_enforces_limits(client, app_mod, monkeypatch):
+    monkeypatch.setattr(app_mod, "SAVE_BATCH_ROWS", 2)
+    monkeypatch.setattr(app_mod, "SAVE_READ_CHUNK", 16)
+    monkeypatch.setattr(app_mod, "SAVE_STREAM_MIN_BYTES", 0)
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entries = [
+        {"id": f"e{i}", "date": "2025-11-10", "start": "09:00", "end": "10:00", "description": "Work \u00e9", "is_absence": False}
+        for i in range(5)
+    ]
+
+    # Several batches, read in chunks smaller than one entry, then written by the queue
+    app_mod.METRICS.reset()
+    r = client.post("/api/save_entries", data=json.dumps({"version": 3, "entries": entries}), content_type="application/json")
+    assert r.get_json()["saved"] == 5
+    assert "timetracker_save_batch_size_count 1" in app_mod.METRICS.render()
+    staging = "SELECT COUNT(*) FROM entries_staging"
+    with closing(app_mod.get_db_connection()) as conn:
+        assert conn.execute(staging).fetchone()[0] == 0
+    ndjson = "\n".join(json.dumps(e) for e in entries[:3])
+    r = client.post("/api/save_entries", data=ndjson, content_type="application/x-ndjson")
+    assert r.get_json()["saved"] == 3
+
+    # Invalid rows are skipped and reported; the rest are saved
+    bad = entries[:2] + [{"date": "2025-11-10", "start": "9 o'clock", "end": "10:00"}, entries[2]]
+    r = client.post("/api/save_entries", json={"entries": bad})
+    result = r.get_json()
+    assert r.status_code == 200 and result["saved"] == 3 and result["rejected"] == 1
+    assert result["errors"] == [{"entry": 3, "error": "times must be H:MM or H:MM:SS, not \"9 o'clock\""}]
+
+    # An unreadable body keeps the stored entries, streamed or not
+    for stream_from in (0, 1024 * 1024):
+        monkeypatch.setattr(app_mod, "SAVE_STREAM_MIN_BYTES", stream_from)
+        r = client.post("/api/save_entries", data='{"entries": [{"date": "2025-11-10"', content_type="application/json")
+        assert r.status_code == 400 and r.get_json()["error"].startswith("invalid JSON")
+    # ...including one that breaks after some batches were already staged
+    monkeypatch.setattr(app_mod, "SAVE_STREAM_MIN_BYTES", 0)
+    truncated = json.dumps({"entries": entries})[:-20]
+    r = client.post("/api/save_entries", data=truncated, content_type="application/json")
+    assert r.status_code == 400 and r.get_json()["error"].startswith("invalid JSON")
+    with closing(app_mod.get_db_connection()) as conn:
+        assert conn.execute(staging).fetchone()[0] == 0
+    r = client.post("/api/save_entries", json={"entries": {"id": "e9"}})
+    assert r.status_code == 400
+    assert sorted(e["id"] for e in client.get("/api/load_entries").get_json()["entries"]) == ["e0", "e1", "e2"]
+
+    monkeypatch.setitem(app_mod.app.config, "MAX_CONTENT_LENGTH", 100)
+    r = client.post("/api/save_entries", json={"entries": entries})
+    assert r.status_code == 413 and r.get_json() == {"error": "Request body too large"}
+
+    monkeypatch.setattr(app_mod, "SAVE_RATE_LIMITER", app_mod.RateLimiter(1, 60))
+    assert client.post("/api/save_entries", json={"entries": []}).status_code == 200
+    r = client.post("/api/save_entries", json={"entries": []})
+    assert r.status_code == 429 and int(r.headers["Retry-After"]) >= 1
+
+
+def test_queries_by_user_use_an_index(client, app_mod):
+    conn = app_mod.get_entries_connection(1)
+    try:
+        for sql in ("SELECT date, start FROM entries WHERE user_id = ?", "DELETE FROM entries WHERE user_id = ?"):
+            plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", (1,)))
+            assert plan.startswith("SEARCH entries USING") and "INDEX idx_entries_user_" in plan and "(user_id=?)" in plan, plan
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert "idx_entries_user_id" not in names
+    finally:
+        conn.close()
+
+
+def test_per_user_shards_isolate_entries(client, app_mod, monkeypatch, tmp_path):
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    entry = {"date": "2025-11-10", "start": "09:00", "end": "10:00", "description": "Legacy", "is_absence": False}
+    assert client.post("/api/save_entries", json={"entries": [entry]}).status_code == 200
+
+    monkeypatch.setenv("DB_SHARDS", "user")
+    # Entries saved before sharding was enabled are moved by the migration
+    assert app_mod.migrate_entries_to_shards() == 1
+    assert client.get("/api/load_entries").get_json()["entries"][0]["description"] == "Legacy"
+
+    other = app_mod.app.test_client()
+    other.post("/api/auth/register", json={"username": f"other_{tmp_path.name}", "pin": "1234"})
+    entry["description"] = "Other"
+    assert other.post("/api/save_entries", json={"entries": [entry]}).status_code == 200
+
+    shards = sorted(p.name for p in app_mod.iter_entry_db_paths())
+    assert len(shards) == 2 and all(name.startswith("user-") for name in shards)
+    assert [e["description"] for e in client.get("/api/load_entries").get_json()["entries"]] == ["Legacy"]
+    assert [e["description"] for e in other.get("/api/load_entries").get_json()["entries"]] == ["Other"]
+
+    monkeypatch.setenv("DB_SHARDS", "4")
+    assert app_mod.entries_db_path(6).name == "bucket-0002.db"
+
+
+def test_write_queue_coalesces_saves_in_one_batch(client, app_mod):
+    app_mod.METRICS.reset()
+    writer = app_mod.WriteQueue(window_ms=200)
+
+    def rows(user_id, description):
+        return [(user_id, "2025-11-10", "09:00", "10:00", description, 0, f"{user_id}-{description}")]
+
+    # Queue the saves before the writer starts, as if they arrived during a commit
+    # The superseded save was staged, as a large body would be
+    staged = app_mod.StagedSave("first")
+    assert app_mod.stage_save_rows(901, staged.save_id, [rows(901, "first")]) == 1
+    futures = []
+    for user_id, save in ((901, staged), (901, [rows(901, "second")]), (902, [rows(902, "other")])):
+        futures.append(Future())
+        writer._queue.put((user_id, save, futures[-1]))
+    writer._ensure_thread()
+    versions = [future.result(timeout=5) for future in futures]
+
+    # Both saves by user 901 land in the same batch and only the newest is written
+    assert versions == [1, 1, 1]
+    saved = app_mod._iter_user_entries(901, "2025-11-01", "2025-11-30", "description")
+    assert [row[0] for row in saved] == ["second"]
+    with closing(app_mod.get_entries_connection(901)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM entries_staging").fetchone()[0] == 0
+    metrics = app_mod.METRICS.render()
+    assert "timetracker_saves_coalesced_total 1" in metrics
+    assert "timetracker_save_batch_size_count 1" in metrics
+
+
+def test_write_queue_failure_only_fails_that_users_save(client, app_mod, monkeypatch):
+    writer = app_mod.WriteQueue(window_ms=200)
+
+    def row(user_id, description):
+        return (user_id, "2025-11-10", "09:00", "10:00", description, 0, f"{user_id}-{description}")
+
+    assert writer.submit(911, [[row(911, "kept")]]).result(timeout=5) == 1
+
+    # Both users share the app database; 911's rows are malformed
+    futures = []
+    for user_id, rows in ((911, [row(911, "bad")[:3]]), (912, [row(912, "saved")])):
+        futures.append(Future())
+        writer._queue.put((user_id, [rows], futures[-1]))
+    writer._ensure_thread()
+    with pytest.raises(Exception):
+        futures[0].result(timeout=5)
+    assert futures[1].result(timeout=5) == 1
+    assert [r[0] for r in app_mod._iter_user_entries(911, "2025-11-01", "2025-11-30", "description")] == ["kept"]
+    assert [r[0] for r in app_mod._iter_user_entries(912, "2025-11-01", "2025-11-30", "description")] == ["saved"]
+
+    # An error before any database is opened fails the waiters and keeps the writer alive
+    def broken_path(user_id):
+        raise ValueError("bad shard configuration")
+
+    entries_db_path = app_mod.entries_db_path
+    monkeypatch.setattr(app_mod, "entries_db_path", broken_path)
+    with pytest.raises(ValueError):
+        writer.submit(912, [[row(912, "lost")]]).result(timeout=5)
+    monkeypatch.setattr(app_mod, "entries_db_path", entries_db_path)
+    assert writer.submit(912, [[row(912, "again")]]).result(timeout=5) == 2
+
+
+def test_write_queue_commits_a_lone_save_without_waiting(client, app_mod):
+    writer = app_mod.WriteQueue(window_ms=5000)
+    started = time.monotonic()
+    future = writer.submit(903, [[(903, "2025-11-10", "09:00", "10:00", "Solo", 0, "solo")]])
+    assert future.result(timeout=5) == 1
+    assert time.monotonic() - started < 2
+
+
+def test_maintenance_archives_old_entries(client, app_mod, monkeypatch):
+    from datetime import date
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    today = date.today().isoformat()
+    entries = [
+        {"id": "old", "date": "2001-03-05", "start": "09:00", "end": "10:00", "description": "Old", "is_absence": False},
+        {"id": "new", "date": today, "start": "09:00", "end": "10:00", "description": "New", "is_absence": False},
+    ]
+    version = client.post("/api/save_entries", json={"entries": entries}).get_json()["version"]
+
+    result = app_mod.run_maintenance(archive_after_days=365)
+    assert result["archived"] == 1
+    loaded = client.get("/api/load_entries").get_json()
+    assert [e["id"] for e in loaded["entries"]] == ["new"]
+    assert loaded["version"] > version
+
+    # Archived entries are still there when asked for
+    everything = client.get("/api/load_entries?include_archived=1").get_json()["entries"]
+    assert sorted(e["id"] for e in everything) == ["new", "old"]
+    csv_text = client.get("/api/export?include_archived=1&end=2001-12-31").get_data(as_text=True)
+    assert "2001-03-05" in csv_text
+
+    # Saving an archived entry again brings it back without leaving a duplicate
+    client.post("/api/save_entries", json={"entries": entries})
+    everything = client.get("/api/load_entries?include_archived=1").get_json()["entries"]
+    assert sorted(e["id"] for e in everything) == ["new", "old"]
+
+    # So does importing it
+    assert app_mod.run_maintenance(archive_after_days=365)["archived"] == 1
+    jsonl = '{"id": "old", "date": "2001-03-05", "start": "09:00", "end": "11:00", "description": "Old"}\n'
+    assert client.post("/api/import", data=jsonl, content_type="application/x-ndjson").get_json()["imported"] == 1
+    everything = client.get("/api/load_entries?include_archived=1").get_json()["entries"]
+    assert sorted((e["id"], e["end"]) for e in everything) == [("new", "10:00"), ("old", "11:00")]
+
+    assert app_mod.run_maintenance(archive_after_days=0)["archived"] == 0
+    assert app_mod.last_maintenance_time() > 0
+
+
+def test_team_report_totals_across_users(client, app_mod, monkeypatch, tmp_path):
+    import csv
+    import io
+    monkeypatch.setenv("USE_SERVER_DB", "1")
+    client.post("/api/save_entries", json={"entries": [
+        {"date": "2025-11-10", "start": "09:00", "end": "12:00", "description": "Dev", "is_absence": False},
+        {"date": "2025-11-10", "start": "11:00", "end": "13:00", "description": "Doctor", "is_absence": True},
+        {"date": "2025-11-11", "start": "09:00", "end": "10:30", "description": "Dev ", "is_absence": False},
+        {"date": "2025-12-01", "start": "09:00", "end": "10:00", "description": "Dev", "is_absence": False},
+    ]})
+    other = app_mod.app.test_client()
+    other.post("/api/auth/register", json={"username": f"teammate_{tmp_path.name}", "pin": "1234"})
+    other.post("/api/save_entries", json={"entries": [
+        {"date": "2025-11-12", "start": "9:30", "end": "11:00", "description": "Ops", "is_absence": False},
+    ]})
+
+    # Only admins may see everyone's totals; listing a user by name grants nothing
+    monkeypatch.setenv("ADMIN_USERS", f"teammate_{tmp_path.name}")
+    assert other.get("/api/admin/team_report").status_code == 403
+    with other.session_transaction() as session:
+        monkeypatch.setenv("ADMIN_USER_IDS", f"999,{session['user_id']}")
+    assert other.get("/api/admin/team_report").status_code == 200
+    monkeypatch.delenv("ADMIN_USER_IDS")
+    monkeypatch.setenv("ADMIN_TOKEN", "secret")
+    r = other.get("/api/admin/team_report?start=2025-11-01&end=2025-11-30", headers={"Authorization": "Bearer secret"})
+    assert r.status_code == 200
+    rows = list(csv.reader(io.StringIO(r.get_data(as_text=True))))
+    assert rows[0] == ["User", "Period", "Description", "Hours"]
+    by_label = {(row[1], row[2]): float(row[3]) for row in rows[1:] if not row[0].startswith("teammate_")}
+    # Descriptions are trimmed before grouping; the absence overlaps an hour of work
+    assert by_label == {("2025-11", "Dev"): 4.5, ("2025-11", "🏖 Absence: Doctor"): -2.0, ("2025-11", "Total worked"): 3.5}
+    assert [row[1:] for row in rows if row[0].startswith("teammate_")] == [["2025-11", "Ops", "1.5"], ["2025-11", "Total worked", "1.5"]]
+
+    weekly = list(app_mod.iter_team_report_rows("2025-11-01", "2025-12-31", "week"))
+    assert {row[1] for row in weekly[1:]} == {"2025-11-10", "2025-12-01"}
+    assert other.get("/api/admin/team_report?period=fortnight", headers={"Authorization": "Bearer secret"}).status_code == 400